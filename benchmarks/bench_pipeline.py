@@ -0,0 +1,301 @@
+"""
+End-to-end benchmark of the scraping pipeline against a synthetic corpus.
+
+A corpus of RSS / Atom feeds (see benchmarks/corpus.py) is served from a
+local HTTP server standing in for Config.FEEDS, then the pipeline runs
+twice: a cold run that downloads and processes everything, and a warm run
+where every feed answers 304 Not Modified. Each stage is timed with its
+throughput and the peak RSS reached, and each profile runs in a fresh
+subprocess:
+
+    python -m benchmarks.bench_pipeline --profiles small medium --output results.json
+    python -m benchmarks.bench_pipeline --profiles small --compare results.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+
+from benchmarks.bench_render import peak_rss_mb
+from benchmarks.corpus import PROFILES, generate_corpus
+from benchmarks.server import FeedServer
+
+STAGES = [
+    'fetch_parse', 'process', 'dedup', 'feed_write', 'update_archive',
+    'archive_html', 'search_index', 'index_html', 'precompress', 'total',
+]
+
+
+def _stage(seconds, items=None, nbytes=None):
+    result = {'seconds': round(seconds, 4)}
+    if items is not None:
+        result['items'] = items
+        result['items_per_second'] = round(items / seconds, 1) if seconds else None
+    if nbytes is not None:
+        result['bytes'] = nbytes
+        result['mb_per_second'] = round(nbytes / seconds / 1e6, 2) if seconds else None
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return result
+
+
+def run_pipeline(feed_urls, output_dir, cache_dir, workers, parse_workers, precompress):
+    """Run scrape -> archive -> render once and time every stage"""
+    from src.config import Config
+    from src.archive import ArchiveStore
+    from src.output import OutputWriter
+    from src.scrapers.http_client import HttpClient
+    from src.scrapers.rss_scraper import RSSFeedScraper
+    from src.main import (
+        flatten_articles, update_archive, generate_archive_html, generate_search_index, generate_index_html,
+    )
+
+    stages = {}
+    timings = {'fetch_parse': 0.0, 'dedup': 0.0, 'feed_write': 0.0}
+    counts = {'entries': 0, 'written': 0}
+
+    # The local server needs no politeness limits
+    http_client = HttpClient(
+        max_connections=workers * 2,
+        per_host_connections=workers,
+        default_rate_limit=None,
+        host_rate_limits={},
+    )
+    output = OutputWriter(output_dir)
+    archive = ArchiveStore(output_dir, Config.NEAR_DUPLICATE_MAX_DISTANCE, Config.NEAR_DUPLICATE_WINDOW_DAYS)
+    scraper = RSSFeedScraper(
+        feed_urls=feed_urls,
+        output_dir=output_dir,
+        ai_keywords=Config.AI_KEYWORDS,
+        max_workers=workers,
+        parse_workers=parse_workers,
+        inline_max_bytes=Config.PARSE_INLINE_MAX_BYTES,
+        http_client=http_client,
+        keyword_word_boundary=Config.KEYWORD_WORD_BOUNDARY,
+        cache_dir=cache_dir,
+        output=output,
+        duplicates=archive.duplicates,
+    )
+
+    fetch_feeds = scraper.fetch_feeds
+    process_feeds = scraper.process_feeds
+    mark_duplicates = scraper.mark_duplicates
+    write_feed = scraper.feed_writer.write
+
+    def timed_fetch_feeds():
+        start = time.perf_counter()
+        feeds = fetch_feeds()
+        timings['fetch_parse'] += time.perf_counter() - start
+        return feeds
+
+    def timed_process_feeds(feeds, current_time):
+        # Parsing moved out of fetching into its own stage; both count as fetch+parse
+        start = time.perf_counter()
+        results = process_feeds(feeds, current_time)
+        timings['fetch_parse'] += time.perf_counter() - start
+        return results
+
+    def timed_mark_duplicates(all_articles):
+        start = time.perf_counter()
+        mark_duplicates(all_articles)
+        timings['dedup'] += time.perf_counter() - start
+
+    def timed_write(category, articles):
+        start = time.perf_counter()
+        write_feed(category, articles)
+        timings['feed_write'] += time.perf_counter() - start
+        counts['written'] += len(articles)
+
+    scraper.fetch_feeds = timed_fetch_feeds
+    scraper.process_feeds = timed_process_feeds
+    scraper.mark_duplicates = timed_mark_duplicates
+    scraper.feed_writer.write = timed_write
+
+    pipeline_start = time.perf_counter()
+    try:
+        start = time.perf_counter()
+        all_articles = scraper.scrape()
+        scrape_seconds = time.perf_counter() - start
+    finally:
+        http_client.close()
+
+    counts['entries'] = scraper.metrics.summary()['counters'].get('entries', 0)
+    stats = scraper.http_cache.stats
+    stages['fetch_parse'] = _stage(timings['fetch_parse'], counts['entries'])
+    stages['fetch_parse']['downloaded'] = stats['misses']
+    stages['fetch_parse']['not_modified'] = stats['hits']
+    stages['process'] = _stage(
+        scrape_seconds - timings['fetch_parse'] - timings['dedup'] - timings['feed_write'], counts['entries']
+    )
+    stages['dedup'] = _stage(timings['dedup'], sum(len(articles) for articles in all_articles.values()))
+    stages['feed_write'] = _stage(timings['feed_write'], counts['written'])
+
+    flattened = flatten_articles(all_articles)
+    try:
+        start = time.perf_counter()
+        update_archive(archive, flattened, output)
+        stages['update_archive'] = _stage(time.perf_counter() - start, len(flattened))
+
+        start = time.perf_counter()
+        generate_archive_html(output_dir, archive, output)
+        stages['archive_html'] = _stage(time.perf_counter() - start, len(archive))
+
+        start = time.perf_counter()
+        republished = generate_search_index(output_dir, archive, output)
+        stages['search_index'] = _stage(time.perf_counter() - start, len(archive.added_ids))
+        stages['search_index']['files_written'] = republished
+    finally:
+        archive.close()
+
+    start = time.perf_counter()
+    generate_index_html(output_dir, flattened, output=output)
+    stages['index_html'] = _stage(time.perf_counter() - start, len(flattened))
+
+    if precompress:
+        start = time.perf_counter()
+        compressed = output.precompress(max_workers=Config.PRECOMPRESS_WORKERS)
+        stages['precompress'] = _stage(time.perf_counter() - start, len(compressed))
+
+    output.save_manifest()
+    stages['total'] = _stage(time.perf_counter() - pipeline_start, counts['entries'])
+    stages['total']['outputs_changed'] = len(output.changed)
+    return stages
+
+
+def run_one(profile, seed, latency, workers, parse_workers, precompress):
+    """Generate and serve a corpus, then run the pipeline cold and warm"""
+    # Keep the per-feed progress logging out of the timings
+    import src.main  # noqa: F401 (configures logging)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    params = PROFILES[profile]
+    start = time.perf_counter()
+    documents, feeds = generate_corpus(seed=seed, **params)
+    generate_seconds = time.perf_counter() - start
+    corpus_bytes = sum(len(body) for body in documents.values())
+
+    runs = {}
+    with FeedServer(documents, latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        feed_urls = {
+            name: {**info, 'url': server.base_url + info['url']}
+            for name, info in feeds.items()
+        }
+        output_dir = os.path.join(tmp, 'feeds')
+        cache_dir = os.path.join(tmp, 'cache')
+        for run in ('cold', 'warm'):
+            server.reset_stats()
+            runs[run] = run_pipeline(feed_urls, output_dir, cache_dir, workers, parse_workers, precompress)
+            fetch = runs[run]['fetch_parse']
+            fetch['bytes'] = server.stats['bytes_sent']
+            fetch['mb_per_second'] = round(fetch['bytes'] / fetch['seconds'] / 1e6, 2) if fetch['seconds'] else None
+
+    return {
+        'profile': profile,
+        'corpus': {
+            **params,
+            'documents': len(documents),
+            'bytes': corpus_bytes,
+            'generate_seconds': round(generate_seconds, 3),
+        },
+        'runs': runs,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(previous, current):
+    """Print stage timings of two result files side by side"""
+    before = {result['profile']: result for result in previous.get('results', [])}
+    for result in current['results']:
+        old = before.get(result['profile'])
+        if old is None:
+            continue
+        print(f"\n{result['profile']} ({previous['meta'].get('commit')} -> {current['meta'].get('commit')})")
+        for run in ('cold', 'warm'):
+            for stage in STAGES:
+                new_stage = result['runs'][run].get(stage)
+                old_stage = old['runs'].get(run, {}).get(stage)
+                if not new_stage or not old_stage:
+                    continue
+                delta = (new_stage['seconds'] - old_stage['seconds']) / old_stage['seconds'] * 100 if old_stage['seconds'] else 0
+                print(f"  {run:<5} {stage:<15} {old_stage['seconds']:>9.3f}s -> {new_stage['seconds']:>9.3f}s  {delta:+6.1f}%")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark the scraping pipeline on a synthetic corpus')
+    arg_parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=['small', 'medium'])
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='Simulated server latency in seconds')
+    arg_parser.add_argument('--workers', type=int, default=8, help='Feeds downloaded in parallel')
+    arg_parser.add_argument('--parse-workers', type=int, default=os.cpu_count() or 1,
+                            help='Processes parsing large feeds (below 2, feeds are parsed inline)')
+    arg_parser.add_argument('--precompress', action='store_true', help='Include the precompression stage')
+    arg_parser.add_argument('--output', type=str, help='Write results to this JSON file')
+    arg_parser.add_argument('--compare', type=str, help='Previous results file to compare against')
+    arg_parser.add_argument('--run-one', type=str, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, args.seed, args.latency, args.workers, args.parse_workers, args.precompress)))
+        return 0
+
+    results = []
+    for profile in args.profiles:
+        command = [
+            sys.executable, '-m', 'benchmarks.bench_pipeline', '--run-one', profile,
+            '--seed', str(args.seed), '--latency', str(args.latency), '--workers', str(args.workers),
+            '--parse-workers', str(args.parse_workers),
+        ]
+        if args.precompress:
+            command.append('--precompress')
+        completed = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+
+        cold, warm = result['runs']['cold'], result['runs']['warm']
+        print(
+            f"{profile:>7}: {result['corpus']['documents']} feeds, "
+            f"{cold['fetch_parse']['items']} entries, {result['corpus']['bytes'] / 1e6:.1f} MB; "
+            f"cold {cold['total']['seconds']:.2f}s "
+            f"(fetch+parse {cold['fetch_parse']['seconds']:.2f}s, process {cold['process']['seconds']:.2f}s), "
+            f"warm {warm['total']['seconds']:.2f}s, peak RSS {result['peak_rss_mb']:.1f} MB"
+        )
+
+    current = {
+        'meta': {
+            'benchmark': 'pipeline',
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'latency': args.latency,
+            'workers': args.workers,
+            'parse_workers': args.parse_workers,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+            f.write('\n')
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), current)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Benchmark archive and index rendering for large archives.
+
+Each size runs in a fresh subprocess so peak RSS is measured per size:
+
+    python -m benchmarks.bench_render --sizes 10000 100000 1000000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+import pytz
+
+SOURCES = ['Hacker News', 'Reddit ML', 'VentureBeat AI', 'Hugging Face', 'DeepMind', 'Import AI']
+CATEGORIES = ['news', 'community', 'ai_tools', 'ai_companies', 'research']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+
+def synthetic_items(count, seed=0):
+    """Yield articles spread over roughly one article per hour"""
+    from src.models import Article
+
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=pytz.UTC)
+    for i in range(count):
+        published = start + timedelta(minutes=rng.randint(0, count * 60))
+        yield Article(
+            url=f'https://example.com/articles/{i}',
+            title=f'Synthetic article {i} about large language models & <agents>',
+            source=SOURCES[i % len(SOURCES)],
+            published=published,
+            category=CATEGORIES[i % len(CATEGORIES)],
+            author=f'Author {i % 97}',
+            description='A short summary of a synthetic article used for benchmarking. ' * 2,
+        )
+
+
+def run_one(size):
+    """Populate an archive of the given size and time a full render"""
+    from src.archive import ArchiveStore
+    from src.main import generate_archive_html, generate_index_html
+
+    with tempfile.TemporaryDirectory() as feeds_dir:
+        archive = ArchiveStore(feeds_dir)
+        start = time.perf_counter()
+        archive.add(synthetic_items(size))
+        populate_seconds = time.perf_counter() - start
+        rss_before = peak_rss_mb()
+
+        start = time.perf_counter()
+        generate_archive_html(feeds_dir, archive)
+        archive_seconds = time.perf_counter() - start
+
+        latest = list(synthetic_items(min(size, 1000), seed=1))
+        start = time.perf_counter()
+        generate_index_html(feeds_dir, latest)
+        index_seconds = time.perf_counter() - start
+
+        output_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(feeds_dir)
+            for name in names if name.endswith('.html')
+        )
+        archive.close()
+
+    return {
+        'size': size,
+        'populate_seconds': round(populate_seconds, 3),
+        'archive_render_seconds': round(archive_seconds, 3),
+        'index_render_seconds': round(index_seconds, 3),
+        'html_bytes': output_bytes,
+        'rss_before_render_mb': round(rss_before, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark archive and index rendering')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    arg_parser.add_argument('--output', type=str, help='Write results to this JSON file')
+    arg_parser.add_argument('--run-one', type=int, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one)))
+        return 0
+
+    results = []
+    for size in args.sizes:
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_render', '--run-one', str(size)],
+            capture_output=True, text=True, check=True,
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{size:>9} entries: archive {result['archive_render_seconds']:.2f}s, "
+            f"index {result['index_render_seconds']:.2f}s, "
+            f"peak RSS {result['peak_rss_mb']:.1f} MB "
+            f"({result['rss_before_render_mb']:.1f} MB before rendering)"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
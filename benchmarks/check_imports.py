@@ -0,0 +1,74 @@
+"""
+Check that the CLI starts without loading the scraping stack.
+
+Commands that don't fetch anything (render, archive, search, --help) should
+not pay for feedparser, BeautifulSoup or httpx. Each check imports the entry
+point in a fresh interpreter with -X importtime, fails if a heavy module was
+loaded, and reports the import time:
+
+    python -m benchmarks.check_imports --max-ms 300
+"""
+import sys
+import argparse
+import subprocess
+
+# Modules only the scrape and serve commands need
+HEAVY_MODULES = [
+    'feedparser', 'bs4', 'httpx', 'lxml', 'html5lib', 'brotli',
+    'src.scrapers.rss_scraper', 'src.scrapers.http_client', 'src.daemon',
+]
+
+CHECKS = {
+    'import src.main': ['-c', 'import src.main'],
+    'src.main --help': ['-m', 'src.main', '--help'],
+    'src.main search --help': ['-m', 'src.main', 'search', '--help'],
+}
+
+
+def import_times(args):
+    """
+    Run the interpreter with -X importtime. Returns the names of every
+    imported module and the total time of the top-level imports in ms.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        capture_output=True, text=True, check=True,
+    )
+    modules = set()
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Nested imports are indented and already counted in their parent's cumulative time
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return modules, total_us / 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Check CLI import time and lazily imported modules')
+    arg_parser.add_argument('--max-ms', type=float, help='Fail if importing the CLI takes longer than this')
+    args = arg_parser.parse_args()
+
+    # Interpreter startup (site, encodings, ...) is subtracted from every check
+    _, startup_ms = import_times(['-c', 'pass'])
+    failures = []
+    for label, command in CHECKS.items():
+        modules, total_ms = import_times(command)
+        elapsed = total_ms - startup_ms
+        heavy = [name for name in modules if name in HEAVY_MODULES or name.split('.')[0] in HEAVY_MODULES]
+        print(f"{label:<24} {elapsed:7.1f} ms  {len(modules)} modules")
+        if heavy:
+            failures.append(f"{label} imported {', '.join(sorted(heavy))}")
+        if args.max_ms is not None and elapsed > args.max_ms:
+            failures.append(f"{label} took {elapsed:.1f} ms (budget {args.max_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Synthetic RSS / Atom corpus for the pipeline benchmarks.
+
+Feeds come in a few shapes that exercise different code paths:
+
+- rss / atom: plain news feeds
+- reddit: Atom feeds whose entries carry Reddit-style HTML bodies
+  (served under a reddit.com path so the Reddit extractor is used)
+- huggingface / google: Atom feeds routed to their dedicated extractors
+- podcast: very large RSS feeds with long show notes and enclosures
+
+About one entry in twenty re-reports a story from another feed under
+its own URL (sometimes with a "[D]" or "Show HN:" prefix), the way
+aggregators cross-post, so near-duplicate detection has work to do.
+
+Publication dates rotate through the formats seen in the wild (RFC 822
+with names or offsets, ISO 8601 with and without a zone, two-digit
+years, missing dates) so date parsing is measured too.
+"""
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+import pytz
+
+AI_WORDS = [
+    'AI', 'LLM', 'machine learning', 'neural network', 'GPT', 'transformer',
+    'embedding', 'fine-tuning', 'diffusion model', 'OpenAI', 'Anthropic', 'Gemini',
+]
+PLAIN_WORDS = [
+    'market', 'update', 'release', 'team', 'service', 'design', 'report', 'policy',
+    'network', 'cloud', 'data', 'startup', 'hardware', 'browser', 'security', 'energy',
+    'said', 'maintain', 'again', 'details', 'community', 'launch', 'pricing', 'review',
+]
+TZ_NAMES = ['GMT', 'EST', 'PDT', 'CST', 'UTC']
+
+# (name, feed shape, url path) - the path picks the extractor the scraper uses
+FEED_SHAPES = [
+    ('rss', '/news/{index}.xml'),
+    ('atom', '/blog/{index}.atom'),
+    ('reddit', '/reddit.com/r/sub{index}/.rss'),
+    ('rss', '/tech/{index}.xml'),
+    ('huggingface', '/huggingface.co/blog/{index}.atom'),
+    ('google', '/blog.google/technology/{index}.atom'),
+]
+CATEGORIES = ['news', 'research', 'community', 'ai_tools', 'ai_companies']
+# Share of entries that repeat a story already published by another feed
+CROSS_POST_RATIO = 0.05
+
+PROFILES = {
+    'small': {'feeds': 12, 'entries': 50, 'podcasts': 1, 'podcast_entries': 500},
+    'medium': {'feeds': 40, 'entries': 100, 'podcasts': 2, 'podcast_entries': 2000},
+    'large': {'feeds': 120, 'entries': 200, 'podcasts': 4, 'podcast_entries': 5000},
+}
+
+
+def format_date(published, style):
+    """Render a datetime in one of several real-world date formats"""
+    if style == 0:
+        return published.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    if style == 1:
+        name = TZ_NAMES[published.minute % len(TZ_NAMES)]
+        return published.strftime(f'%a, %d %b %Y %H:%M:%S {name}')
+    if style == 2:
+        return published.astimezone(pytz.FixedOffset(330)).strftime('%a, %d %b %Y %H:%M:%S %z')
+    if style == 3:
+        return published.strftime('%Y-%m-%dT%H:%M:%SZ')
+    if style == 4:
+        return published.strftime('%Y-%m-%dT%H:%M:%S')
+    if style == 5:
+        return published.strftime('%Y-%m-%d %H:%M')
+    if style == 6:
+        return published.strftime('%d %b %y %H:%M:%S GMT')
+    return None
+
+
+class CorpusGenerator:
+    """Builds feed documents deterministically from a seed"""
+
+    def __init__(self, seed=0, now=None):
+        self.rng = random.Random(seed)
+        # Spread entries over the last four days; the scraper keeps roughly the newest half
+        self.now = (now or datetime.now(pytz.UTC)).replace(microsecond=0)
+        self.titles = []
+
+    def sentence(self, words=12, ai_ratio=0.15):
+        parts = [
+            self.rng.choice(AI_WORDS) if self.rng.random() < ai_ratio else self.rng.choice(PLAIN_WORDS)
+            for _ in range(words)
+        ]
+        return ' '.join(parts).capitalize() + self.rng.choice(['.', '.', '!', '?'])
+
+    def paragraph(self, sentences=4, ai_ratio=0.15):
+        return ' '.join(self.sentence(self.rng.randint(6, 18), ai_ratio) for _ in range(sentences))
+
+    def published(self, index, count):
+        return self.now - timedelta(minutes=int(index * 4 * 24 * 60 / max(count, 1)) + self.rng.randint(0, 30))
+
+    def reddit_body(self, author):
+        """Reddit's HTML layout: markdown div, a table, a code block and the footer links"""
+        paragraphs = ''.join(f'<p>{escape(self.paragraph(3))}</p>' for _ in range(self.rng.randint(2, 6)))
+        rows = ''.join(
+            f'<tr><td>{escape(self.rng.choice(PLAIN_WORDS))}</td><td>{self.rng.randint(1, 999)}</td></tr>'
+            for _ in range(self.rng.randint(0, 8))
+        )
+        table = f'<table><thead><tr><th>Name</th><th>Score</th></tr></thead><tbody>{rows}</tbody></table>' if rows else ''
+        return (
+            f'<!-- SC_OFF --><div class="md">{paragraphs}{table}'
+            '<pre><code>import torch\nmodel = load("checkpoint")\n</code></pre></div><!-- SC_ON -->'
+            f' &#32; submitted by &#32; <a href="https://www.reddit.com/user/{author}"> /u/{author} </a>'
+            ' <br/> <span><a href="https://www.reddit.com/r/x/comments/abc/">[link]</a></span>'
+        )
+
+    def title(self):
+        if self.titles and self.rng.random() < CROSS_POST_RATIO:
+            return self.rng.choice(['', '', '[D] ', 'Show HN: ']) + self.rng.choice(self.titles)
+        title = self.sentence(self.rng.randint(5, 12), ai_ratio=0.2).rstrip('.!?')
+        self.titles.append(title)
+        return title
+
+    def _entry_fields(self, base_url, index, count, shape):
+        title = self.title()
+        author = f'user{self.rng.randint(1, 5000)}'
+        if shape == 'reddit':
+            content = self.reddit_body(author)
+        elif shape == 'podcast':
+            content = ''.join(f'<p>{escape(self.paragraph(6, ai_ratio=0.05))}</p>' for _ in range(6))
+        else:
+            content = ''.join(f'<p>{escape(self.paragraph())}</p>' for _ in range(self.rng.randint(1, 5)))
+        return {
+            'title': title,
+            'link': f'{base_url}/item/{index}',
+            'author': author,
+            'summary': self.paragraph(2),
+            'content': content,
+            'date': format_date(self.published(index, count), index % 8),
+        }
+
+    def rss(self, name, base_url, count, podcast=False):
+        shape = 'podcast' if podcast else 'rss'
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+            ' xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>'
+            f'<title>{escape(name)}</title><link>{escape(base_url)}</link>'
+            f'<description>{escape(self.sentence())}</description>'
+        ]
+        for index in range(count):
+            entry = self._entry_fields(base_url, index, count, shape)
+            date = f'<pubDate>{entry["date"]}</pubDate>' if entry['date'] else ''
+            extra = ''
+            if podcast:
+                extra = (
+                    f'<enclosure url={quoteattr(entry["link"] + ".mp3")} length="{self.rng.randint(10**7, 10**8)}"'
+                    ' type="audio/mpeg"/>'
+                    f'<itunes:duration>{self.rng.randint(10, 180)}:00</itunes:duration>'
+                    f'<itunes:summary>{escape(entry["summary"])}</itunes:summary>'
+                )
+            parts.append(
+                f'<item><title>{escape(entry["title"])}</title><link>{escape(entry["link"])}</link>'
+                f'<guid>{escape(entry["link"])}</guid>{date}'
+                f'<author>{escape(entry["author"])}</author>'
+                f'<description>{escape(entry["summary"])}</description>'
+                f'<content:encoded>{escape(entry["content"])}</content:encoded>{extra}</item>'
+            )
+        parts.append('</channel></rss>\n')
+        return ''.join(parts).encode('utf-8')
+
+    def atom(self, name, base_url, count, shape='atom'):
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom">'
+            f'<title>{escape(name)}</title><id>{escape(base_url)}</id>'
+            f'<link href={quoteattr(base_url)}/><updated>{self.now.isoformat()}</updated>'
+        ]
+        for index in range(count):
+            entry = self._entry_fields(base_url, index, count, shape)
+            date = f'<updated>{entry["date"]}</updated><published>{entry["date"]}</published>' if entry['date'] else ''
+            parts.append(
+                f'<entry><title>{escape(entry["title"])}</title><id>{escape(entry["link"])}</id>'
+                f'<link href={quoteattr(entry["link"])}/>{date}'
+                f'<author><name>{escape(entry["author"])}</name></author>'
+                f'<content type="html">{escape(entry["content"])}</content></entry>'
+            )
+        parts.append('</feed>\n')
+        return ''.join(parts).encode('utf-8')
+
+
+def generate_corpus(feeds=12, entries=50, podcasts=1, podcast_entries=500, seed=0, now=None):
+    """
+    Build a corpus of feed documents.
+    Returns (documents, feed_config): documents maps URL paths to bytes and
+    feed_config is a Config.FEEDS-style dict of source name -> {url path, category}.
+    """
+    generator = CorpusGenerator(seed, now)
+    documents = {}
+    feed_config = {}
+
+    for index in range(feeds):
+        shape, path_template = FEED_SHAPES[index % len(FEED_SHAPES)]
+        path = path_template.format(index=index)
+        name = f'{shape.title()} Feed {index}'
+        base_url = f'https://{shape}.example.com/{index}'
+        if shape == 'rss':
+            documents[path] = generator.rss(name, base_url, entries)
+        else:
+            documents[path] = generator.atom(name, base_url, entries, shape)
+        feed_config[name] = {'url': path, 'category': CATEGORIES[index % len(CATEGORIES)]}
+
+    for index in range(podcasts):
+        path = f'/podcasts/{index}.xml'
+        name = f'Podcast {index}'
+        documents[path] = generator.rss(name, f'https://podcast.example.com/{index}', podcast_entries, podcast=True)
+        feed_config[name] = {'url': path, 'category': 'news'}
+
+    return documents, feed_config
@@ -0,0 +1,88 @@
+"""
+Local HTTP server standing in for the real feed hosts during benchmarks.
+
+Documents are served from memory with an ETag, so conditional requests
+get a 304 just like from well-behaved feed hosts. An optional fixed
+latency simulates network round trips.
+"""
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = self.path.split('?', 1)[0]
+        document = server.documents.get(path)
+        if document is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            server.count(404, 0)
+            return
+
+        body, etag = document
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            server.count(304, 0)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+        server.count(200, len(body))
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Serves {path: bytes} documents on 127.0.0.1 from a background thread"""
+    daemon_threads = True
+
+    def __init__(self, documents, latency=0.0):
+        super().__init__(('127.0.0.1', 0), _FeedHandler)
+        self.latency = latency
+        self.documents = {
+            path: (body, '"%s"' % hashlib.sha1(body).hexdigest())
+            for path, body in documents.items()
+        }
+        self.stats = {'requests': 0, 'not_modified': 0, 'bytes_sent': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, status, size):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['not_modified'] += status == 304
+            self.stats['bytes_sent'] += size
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {'requests': 0, 'not_modified': 0, 'bytes_sent': 0}
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='feed-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
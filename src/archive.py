@@ -0,0 +1,302 @@
+import os
+import json
+import hashlib
+import sqlite3
+import logging
+from datetime import datetime
+import pytz
+from src.scrapers.dates import item_datetime
+from src.models import Article
+from src.output import OutputWriter
+from src.dedup import NearDuplicateIndex, fingerprint_text
+from src.search import SearchIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    published REAL NOT NULL,
+    month TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_published ON items (published);
+CREATE INDEX IF NOT EXISTS items_month ON items (month, published);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ArchiveStore:
+    """
+    Article archive kept in a SQLite database next to the feeds.
+    Items are indexed by id and publication date, so adding a run's
+    articles costs O(new) instead of rewriting the whole history.
+    archive.json is still exported in its original format for
+    GitHub Pages consumers. Articles are added and read back as Article
+    objects; the database stores their JSON items.
+
+    Near-duplicates (the same story under another URL) are detected with a
+    SimHash index kept in the same database; instead of being archived
+    again they are listed under the original item's "related" links.
+    Titles, summaries and sources are also added to a full-text search
+    index in the same database as items are archived.
+    """
+    DB_FILENAME = 'archive.db'
+    JSON_FILENAME = 'archive.json'
+    VERSION = '1.0'
+
+    def __init__(self, feeds_dir, duplicate_distance=3, duplicate_window_days=7):
+        self.feeds_dir = feeds_dir
+        self.db_path = os.path.join(feeds_dir, self.DB_FILENAME)
+        self.json_path = os.path.join(feeds_dir, self.JSON_FILENAME)
+        self.added_ids = []
+        self.added_months = set()
+        self.linked_ids = []
+
+        os.makedirs(feeds_dir, exist_ok=True)
+        is_new = not os.path.exists(self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(SCHEMA)
+        self.search_index = SearchIndex(self.conn)
+
+        # Seed a fresh database from an existing archive.json, and restore the
+        # published articles an older database (e.g. a stale CI cache) lacks
+        restored = []
+        if os.path.exists(self.json_path):
+            restored = self._import_json(seed=is_new)
+
+        self.duplicates = None
+        if duplicate_distance is not None:
+            self.duplicates = NearDuplicateIndex(self.conn, duplicate_distance, duplicate_window_days)
+            if not len(self.duplicates) and len(self):
+                self._index_duplicates()
+            elif restored:
+                self._index_duplicates(restored)
+        if self.search_index.empty() and len(self):
+            self._index_search()
+
+    def _import_json(self, seed=True):
+        """
+        Insert the items of archive.json that the database doesn't have,
+        returning their ids. seed: the database was just created.
+        """
+        try:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                archive = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading archive: {e}")
+            return []
+
+        added = self._insert(archive.get("items", {}).values())
+        # Timestamps are all ISO strings in UTC, so they compare as strings
+        if archive.get("updated") and archive["updated"] > self.updated:
+            self._set_meta('updated', archive["updated"])
+        self.conn.commit()
+        if seed:
+            logger.info(f"Imported {len(self)} articles from {self.JSON_FILENAME}")
+        elif added:
+            logger.warning(
+                f"{self.DB_FILENAME} was missing {len(added)} articles of {self.JSON_FILENAME} "
+                f"(an older copy of the database?); restored them"
+            )
+        return added
+
+    def _index_duplicates(self, ids=None):
+        """
+        Fingerprint archived items, oldest first, into the near-duplicate
+        index: every item of a new index, or only the given ids
+        """
+        articles = self.iter_items(newest_first=False)
+        if ids is not None:
+            ids = set(ids)
+            articles = (article for article in articles if article.id in ids)
+        count = 0
+        for article in articles:
+            self.duplicates.add(article.id, article.title, fingerprint_text(article), article.timestamp)
+            count += 1
+        self.conn.commit()
+        logger.info(f"Indexed {count} archived articles for near-duplicate detection")
+
+    def _index_search(self):
+        """Add every archived item to a new search index"""
+        for seq, data in self.conn.execute("SELECT seq, data FROM items ORDER BY seq"):
+            self.search_index.add(seq, json.loads(data))
+        self.conn.commit()
+        logger.info(f"Indexed {len(self)} archived articles for search")
+
+    def _link_duplicate(self, canonical_id, article):
+        """
+        Record a near-duplicate under its canonical item's "related" links.
+        Returns False if the canonical item isn't archived.
+        """
+        row = self.conn.execute("SELECT data, month FROM items WHERE id = ?", (canonical_id,)).fetchone()
+        if row is None:
+            return False
+        item = json.loads(row[0])
+        related = item.setdefault('related', [])
+        if all(link['url'] != article.url for link in related):
+            related.append({'url': article.url, 'title': article.title, 'source': article.source})
+            self.conn.execute("UPDATE items SET data = ? WHERE id = ?", (json.dumps(item), canonical_id))
+            self.added_months.add(row[1])
+            self.linked_ids.append(article.id)
+        return True
+
+    def _insert(self, items):
+        """Insert items that aren't archived yet, returning the ids that were added"""
+        added = []
+        for item in items:
+            published = item_datetime(item)
+            month = published.strftime('%Y-%m')
+            item.setdefault('timestamp', published.timestamp())
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO items (id, published, month, data) VALUES (?, ?, ?, ?)",
+                (item['id'], published.timestamp(), month, json.dumps(item))
+            )
+            if cursor.rowcount:
+                self.search_index.add(cursor.lastrowid, item)
+                added.append(item['id'])
+                self.added_months.add(month)
+        return added
+
+    def _get_meta(self, key, default=''):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def updated(self):
+        """ISO timestamp of the last time articles were added"""
+        return self._get_meta('updated')
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def __contains__(self, article_id):
+        return self.conn.execute("SELECT 1 FROM items WHERE id = ?", (article_id,)).fetchone() is not None
+
+    def get(self, article_id):
+        """The archived article with this id, or None"""
+        row = self.conn.execute("SELECT data FROM items WHERE id = ?", (article_id,)).fetchone()
+        return Article.from_item(json.loads(row[0])) if row else None
+
+    def add(self, articles):
+        """
+        Add new articles to the archive, skipping ids that are already present.
+        Near-duplicates of archived articles are linked to them instead.
+        """
+        originals = []
+        duplicates = []
+        for article in articles:
+            canonical_id = article.id
+            if self.duplicates is not None and article.id not in self:
+                canonical_id = self.duplicates.add(article.id, article.title, fingerprint_text(article), article.timestamp)
+            if canonical_id == article.id:
+                originals.append(article)
+            else:
+                duplicates.append((canonical_id, article))
+
+        linked_before = len(self.linked_ids)
+        added = self._insert(article.to_item() for article in originals)
+        # Link after inserting, as a duplicate may point at an article from the same batch
+        for canonical_id, article in duplicates:
+            if not self._link_duplicate(canonical_id, article):
+                added.extend(self._insert([article.to_item()]))
+        if added or len(self.linked_ids) > linked_before:
+            self._set_meta('updated', datetime.now(pytz.UTC).isoformat())
+        self.conn.commit()
+        self.added_ids.extend(added)
+        return len(added)
+
+    def reset_changes(self):
+        """Forget what earlier add() calls changed (for long-lived processes)"""
+        self.added_ids = []
+        self.added_months = set()
+        self.linked_ids = []
+
+    def iter_items(self, newest_first=True):
+        """Yield archived articles ordered by publication date"""
+        order = 'DESC' if newest_first else 'ASC'
+        cursor = self.conn.execute(f"SELECT data FROM items ORDER BY published {order}, seq {order}")
+        for (data,) in cursor:
+            yield Article.from_item(json.loads(data))
+
+    def iter_seq_range(self, start, stop):
+        """Yield (seq, article) for the articles with start <= seq < stop"""
+        cursor = self.conn.execute(
+            "SELECT seq, data FROM items WHERE seq >= ? AND seq < ? ORDER BY seq", (start, stop)
+        )
+        for seq, data in cursor:
+            yield seq, Article.from_item(json.loads(data))
+
+    def search(self, query, limit=20):
+        """Archived articles matching every word of the query, newest first"""
+        seqs = sorted(self.search_index.match(query))
+        results = []
+        # Bounded batches keep the IN (...) list under SQLite's parameter limit
+        for start in range(0, len(seqs), 500):
+            batch = seqs[start:start + 500]
+            results.extend(self.conn.execute(
+                f"SELECT published, seq, data FROM items WHERE seq IN ({','.join('?' * len(batch))})", batch
+            ))
+        results.sort(reverse=True)
+        return [Article.from_item(json.loads(data)) for _, _, data in results[:limit]]
+
+    def months(self):
+        """Return (YYYY-MM, article count) pairs, newest month first"""
+        return self.conn.execute(
+            "SELECT month, COUNT(*) FROM items GROUP BY month ORDER BY month DESC"
+        ).fetchall()
+
+    def month_count(self, month):
+        return self.conn.execute("SELECT COUNT(*) FROM items WHERE month = ?", (month,)).fetchone()[0]
+
+    def iter_month(self, month):
+        """Yield the articles published in a month, newest first"""
+        cursor = self.conn.execute(
+            "SELECT data FROM items WHERE month = ? ORDER BY published DESC, seq DESC", (month,)
+        )
+        for (data,) in cursor:
+            yield Article.from_item(json.loads(data))
+
+    def month_digest(self, month, salt=''):
+        """Content hash of every item stored for a month"""
+        digest = hashlib.sha256(salt.encode('utf-8'))
+        cursor = self.conn.execute("SELECT data FROM items WHERE month = ? ORDER BY seq", (month,))
+        for (data,) in cursor:
+            digest.update(data.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def export_json(self, output=None):
+        """
+        Write archive.json in its original layout, streaming items from the
+        database instead of building the whole document in memory.
+        """
+        writer = output or OutputWriter(self.feeds_dir)
+        writer.write_chunks(self.JSON_FILENAME, self._iter_json())
+        if output is None:
+            writer.save_manifest()
+
+    def _iter_json(self):
+        total = len(self)
+        yield '{\n'
+        yield f'  "version": {json.dumps(self.VERSION)},\n'
+        yield f'  "updated": {json.dumps(self.updated)},\n'
+        yield '  "items": {'
+        cursor = self.conn.execute("SELECT id, data FROM items ORDER BY seq")
+        for index, (article_id, data) in enumerate(cursor):
+            item = json.dumps(json.loads(data), indent=2).replace('\n', '\n    ')
+            yield f'{"," if index else ""}\n    {json.dumps(article_id)}: {item}'
+        yield '\n  },\n' if total else '},\n'
+        yield f'  "total_articles": {total}\n'
+        yield '}'
+
+    def close(self):
+        self.conn.close()
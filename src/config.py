@@ -135,10 +135,77 @@ class Config:
         'midjourney', 'dall-e', 'embedding', 'fine-tuning', 'prompt engineering'
     ]
     
+    # Only count keywords that appear as whole words (so 'ai' doesn't match "said")
+    KEYWORD_WORD_BOUNDARY = True
+    
+    # Articles whose SimHash fingerprints differ in at most this many bits (of 64)
+    # are treated as the same story; None disables near-duplicate detection
+    NEAR_DUPLICATE_MAX_DISTANCE = 3
+    # Only articles published this many days apart can be near-duplicates
+    NEAR_DUPLICATE_WINDOW_DAYS = 7
+    
+    # Adaptive polling: each feed is fetched again after POLL_INTERVAL_FACTOR times
+    # its average gap between posts, within these bounds (seconds)
+    ADAPTIVE_POLLING = os.getenv('ADAPTIVE_POLLING', '1').lower() in ('1', 'true', 'yes')
+    POLL_MIN_INTERVAL = 60 * 60
+    POLL_MAX_INTERVAL = 7 * 24 * 60 * 60
+    POLL_INTERVAL_FACTOR = 0.5
+    # Interval multiplier after a poll that found nothing new
+    POLL_BACKOFF = 1.5
+    # Longest wait before retrying a feed that keeps failing
+    POLL_ERROR_BACKOFF_MAX = 24 * 60 * 60
+    
+    # Daemon mode (python -m src.daemon): shortest poll interval of the busiest
+    # feeds, and bounds on how long the daemon sleeps between polls (seconds).
+    # Without adaptive polling every feed is polled every DAEMON_MAX_SLEEP.
+    DAEMON_POLL_MIN_INTERVAL = 5 * 60
+    DAEMON_MIN_SLEEP = 30
+    DAEMON_MAX_SLEEP = 15 * 60
+    # How long articles stay in the category feeds and on index.html in daemon mode
+    DAEMON_FEED_WINDOW_HOURS = 48
+    
+    # Number of feeds downloaded in parallel
+    FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', '8'))
+    # Number of processes that parse, extract and filter large feeds (below 2,
+    # everything is processed in the main process), and the size in bytes
+    # above which a feed is worth sending to one of them
+    PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+    PARSE_INLINE_MAX_BYTES = int(os.getenv('PARSE_INLINE_MAX_BYTES', str(32 * 1024)))
+    
+    # Shared HTTP client settings
+    HTTP_TIMEOUT = 30
+    HTTP_CONNECT_TIMEOUT = 10
+    HTTP_MAX_CONNECTIONS = 20
+    HTTP_PER_HOST_CONNECTIONS = 2
+    HTTP2 = os.getenv('HTTP2', '').lower() in ('1', 'true', 'yes')
+    HTTP_USER_AGENT = 'AI-Daily-Digest/0.1 (+https://github.com/YiranH/daily_digest)'
+    # Article pages fetched for entries without content (OpenAI) are cached
+    # by URL: reused without a request for PAGE_CACHE_MAX_AGE, revalidated
+    # after that, and dropped once unused for PAGE_CACHE_TTL
+    PAGE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+    PAGE_CACHE_TTL = 90 * 24 * 60 * 60
+    # Maximum requests per second for each host (None means unlimited)
+    HTTP_DEFAULT_RATE_LIMIT = 5
+    HTTP_HOST_RATE_LIMITS = {
+        'www.reddit.com': 0.5,
+    }
+    
     # Output directory for feed files
     OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'feeds')
     
+    # Write .gz (and .br, if brotli is installed) siblings of every published file
+    PRECOMPRESS = os.getenv('PRECOMPRESS', '').lower() in ('1', 'true', 'yes')
+    # Number of files compressed in parallel
+    PRECOMPRESS_WORKERS = int(os.getenv('PRECOMPRESS_WORKERS', '4'))
+    
+    # Number of runs kept in metrics_history.jsonl
+    METRICS_HISTORY_SIZE = 500
+    
+    # Directory for caches that shouldn't be published with the feeds
+    CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+    
     @classmethod
     def create_directories(cls):
         """Create necessary directories for the application"""
-        os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
\ No newline at end of file
+        os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
+        os.makedirs(cls.CACHE_DIR, exist_ok=True)
\ No newline at end of file
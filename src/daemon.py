@@ -0,0 +1,251 @@
+import os
+import sys
+import json
+import signal
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytz
+from src.config import Config
+from src.archive import ArchiveStore
+from src.metrics import Metrics
+from src.models import Article
+from src.output import OutputWriter
+from src.scrapers.rss_scraper import RSSFeedScraper
+from src.main import create_http_client, create_page_cache, create_poll_scheduler, flatten_articles, publish_archive, finish_run
+from src.main import main as cli_main
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# The articles of the feed window, so a restart publishes the same feeds
+WINDOW_FILENAME = 'daemon_window.json'
+
+
+class Daemon:
+    """
+    Long-running scraper that keeps its state in memory between polls.
+
+    The HTTP connection pool, last scrape times, conditional-GET validators,
+    poll schedule, feed fragment cache and the archive database (with its
+    near-duplicate and search indexes) are loaded once. An asyncio loop then
+    sleeps until the next feed is due, polls the due feeds in a worker
+    thread, and republishes outputs only when new articles arrived. All
+    blocking work runs on that one thread, since the SQLite connection
+    may only be used by the thread that opened it.
+
+    Category feeds and index.html list the articles that arrived within the
+    last feed_window_hours (by when the daemon first saw them, so a late
+    entry with an old date still gets listed) instead of only the latest
+    poll's. The window is kept in memory and saved with the other state
+    files, which are checkpointed after every poll and on shutdown;
+    SIGINT / SIGTERM let the current poll finish before exiting.
+    """
+    def __init__(self, output_dir, ai_only=False, workers=Config.FETCH_WORKERS, precompress=False,
+                 parse_workers=Config.PARSE_WORKERS, feed_window_hours=Config.DAEMON_FEED_WINDOW_HOURS, min_sleep=Config.DAEMON_MIN_SLEEP,
+                 max_sleep=Config.DAEMON_MAX_SLEEP):
+        self.output_dir = output_dir
+        self.precompress = precompress
+        self.feed_window = timedelta(hours=feed_window_hours)
+        self.min_sleep = min_sleep
+        self.max_sleep = max_sleep
+        self.ai_only = ai_only
+        self.workers = workers
+        self.parse_workers = parse_workers
+        # category -> {url: (arrival time, article)}
+        self.recent = {}
+        self.polls = 0
+        self._stop = None
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='daemon')
+
+    def open(self):
+        """Load the scraper state, the archive and the HTTP connection pool"""
+        output_dir = self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.output = OutputWriter(output_dir)
+        self.http_client = create_http_client()
+        self.archive = ArchiveStore(
+            output_dir,
+            duplicate_distance=Config.NEAR_DUPLICATE_MAX_DISTANCE,
+            duplicate_window_days=Config.NEAR_DUPLICATE_WINDOW_DAYS
+        )
+        self.scheduler = create_poll_scheduler(output_dir, self.output, min_interval=Config.DAEMON_POLL_MIN_INTERVAL)
+        self.scraper = RSSFeedScraper(
+            feed_urls=Config.FEEDS,
+            output_dir=output_dir,
+            ai_keywords=Config.AI_KEYWORDS if self.ai_only else [],
+            max_workers=self.workers,
+            parse_workers=self.parse_workers,
+            inline_max_bytes=Config.PARSE_INLINE_MAX_BYTES,
+            http_client=self.http_client,
+            keyword_word_boundary=Config.KEYWORD_WORD_BOUNDARY,
+            cache_dir=Config.CACHE_DIR,
+            output=self.output,
+            duplicates=self.archive.duplicates,
+            scheduler=self.scheduler,
+            page_cache=create_page_cache(output_dir, self.output)
+        )
+        self._load_window()
+
+    def _load_window(self):
+        """Restore the feed window saved by a previous run, dropping the articles that expired since"""
+        path = self.output.path(WINDOW_FILENAME)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                for entry in entries:
+                    article = Article.from_record(entry['article'])
+                    article.duplicate_of = entry.get('duplicate_of')
+                    article.related = entry.get('related')
+                    window = self.recent.setdefault(article.category or 'default', {})
+                    window[article.url] = (datetime.fromisoformat(entry['arrived']), article)
+        except Exception as e:
+            logger.error(f"Error loading the feed window: {e}")
+        self._expire(datetime.now(pytz.UTC))
+
+    def _save_window(self):
+        entries = [
+            {
+                'arrived': arrived.isoformat(),
+                'article': article.to_record(),
+                'duplicate_of': article.duplicate_of,
+                'related': article.related,
+            }
+            for window in self.recent.values()
+            for arrived, article in window.values()
+        ]
+        try:
+            self.output.write_json(WINDOW_FILENAME, entries, publish=False)
+        except Exception as e:
+            logger.error(f"Error saving the feed window: {e}")
+
+    def _remember(self, all_articles, now):
+        """Add a poll's articles to the in-memory feed window and drop expired ones"""
+        for category, articles in all_articles.items():
+            window = self.recent.setdefault(category, {})
+            for article in articles:
+                # An article keeps the time it first arrived
+                arrived = window[article.url][0] if article.url in window else now
+                window[article.url] = (arrived, article)
+        self._expire(now)
+
+    def _expire(self, now):
+        """Drop the articles that arrived before the feed window"""
+        cutoff = now - self.feed_window
+        for window in self.recent.values():
+            for url in [url for url, (arrived, _) in window.items() if arrived < cutoff]:
+                del window[url]
+
+    def recent_articles(self):
+        """Articles in the feed window, grouped by category"""
+        return {
+            category: [article for _, article in window.values()]
+            for category, window in self.recent.items()
+        }
+
+    def poll(self):
+        """
+        Poll the feeds that are due and publish what changed.
+        Blocking; the event loop runs it in a worker thread.
+        Returns the number of new articles.
+        """
+        metrics = Metrics()
+        self.scraper.metrics = metrics
+        self.scraper.http_cache.reset_stats()
+        self.scraper.page_cache.reset_stats()
+        self.scraper.feed_writer.reset()
+        self.output.reset()
+        self.archive.reset_changes()
+        self.polls += 1
+
+        with metrics.span('scrape'):
+            all_articles = self.scraper.collect()
+        new_articles = flatten_articles(all_articles)
+        polled = len(self.scraper.feed_urls) - metrics.summary()['counters'].get('not_due', 0)
+
+        if new_articles:
+            self._remember(all_articles, datetime.now(pytz.UTC))
+            self._save_window()
+            recent = self.recent_articles()
+            with metrics.span('feeds'):
+                self.scraper.write_feeds(recent)
+            publish_archive(self.output_dir, self.archive, new_articles, flatten_articles(recent), self.output, metrics)
+        if polled:
+            finish_run(self.output, metrics, self.precompress)
+        logger.info(f"Poll {self.polls}: {polled} feeds polled, {len(new_articles)} new articles")
+        return len(new_articles)
+
+    def seconds_until_due(self):
+        """How long to sleep before the next feed is due"""
+        if self.scheduler is None:
+            return self.max_sleep
+        now = datetime.now(pytz.UTC)
+        wait = min(
+            (self.scheduler.seconds_until_due(source, now) for source in self.scraper.feed_urls),
+            default=self.max_sleep
+        )
+        return max(self.min_sleep, min(self.max_sleep, wait))
+
+    def checkpoint(self):
+        """Write the in-memory state to disk"""
+        self.scraper.save_state()
+        self._save_window()
+        self.scraper.feed_writer.save()
+        self.output.save_manifest()
+
+    def stop(self, signum=None):
+        """Finish the current poll, then shut down"""
+        if signum is not None:
+            logger.info(f"Received {signal.Signals(signum).name}, shutting down after the current poll")
+        self._stop.set()
+
+    async def run(self):
+        """Poll until stopped by SIGINT / SIGTERM"""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        await loop.run_in_executor(self._worker, self.open)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stop, signum)
+        logger.info(f"Daemon started. Output directory: {self.output_dir}")
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    await loop.run_in_executor(self._worker, self.poll)
+                except Exception as e:
+                    logger.error(f"Error polling feeds: {e}", exc_info=True)
+                if self._stop.is_set():
+                    break
+
+                delay = self.seconds_until_due()
+                logger.info(f"Next poll in {delay:.0f}s")
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+            await loop.run_in_executor(self._worker, self.close)
+            self._worker.shutdown()
+
+    def close(self):
+        """Checkpoint and release the database and the connection pool"""
+        try:
+            self.checkpoint()
+        finally:
+            self.archive.close()
+            self.http_client.close()
+        logger.info("Daemon stopped")
+
+
+def main():
+    """Run the scraper as a long-lived daemon (same as `python -m src.main serve`)"""
+    return cli_main(['serve', *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    exit(main())
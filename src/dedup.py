@@ -0,0 +1,203 @@
+import re
+import hashlib
+import logging
+from functools import lru_cache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS simhash (
+    id TEXT PRIMARY KEY,
+    hash INTEGER NOT NULL,
+    canonical TEXT NOT NULL,
+    published REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS simhash_bands (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS simhash_bands_lookup ON simhash_bands (band, value);
+"""
+
+HASH_BITS = 64
+# Words too common to say anything about what a story is about,
+# plus aggregator prefixes such as "Show HN:" or Reddit's "[D]"
+STOPWORDS = frozenset(
+    'an and are as at be by for from has have in is it its of on or that the this to was were will with '
+    'new how why what you your we our they their my about after into over more than just now show ask hn'.split()
+)
+TAGS = re.compile(r'<[^>]+>')
+WORDS = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)*')
+# The same story is usually posted with (nearly) the same title while the bodies
+# differ wildly between aggregators, so the title dominates the fingerprint and
+# only the first few words of the body are mixed in
+TITLE_WEIGHT = 8
+BODY_WEIGHT = 1
+MAX_BODY_WORDS = 20
+# Texts with fewer distinct features than this are too short to compare reliably
+MIN_FEATURES = 4
+
+
+# Width of each per-bit counter packed into one big integer (see _feature_lanes)
+LANE_BITS = 24
+LANE_MASK = (1 << LANE_BITS) - 1
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+@lru_cache(maxsize=65536)
+def _feature_lanes(feature):
+    """
+    The feature's hash with each bit moved into its own LANE_BITS-wide lane,
+    so weight * lanes adds the weight to all 64 per-bit counters in one
+    big-integer operation instead of a Python loop over the bits
+    """
+    value = _feature_hash(feature)
+    return sum(1 << (bit * LANE_BITS) for bit in range(HASH_BITS) if value >> bit & 1)
+
+
+def _normalize_word(word):
+    # Fold simple plurals so "model" and "models" count as the same feature
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def _tokens(text):
+    return [
+        _normalize_word(word) for word in WORDS.findall(TAGS.sub(' ', text or '').lower())
+        if word not in STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def fingerprint_text(article):
+    """
+    The body text an article is fingerprinted by. Archived articles only
+    keep their summary, so scraped ones use it too, and the feeds and the
+    archive agree on which stories are duplicates.
+    """
+    return article.summary
+
+
+def simhash(title, text=''):
+    """
+    64-bit SimHash of an article, built from the title's words and word
+    pairs plus the first words of the body. Returns None when there is too
+    little text to fingerprint.
+    """
+    weights = {}
+    title_tokens = _tokens(title)
+    for token in title_tokens:
+        weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+    for first, second in zip(title_tokens, title_tokens[1:]):
+        pair = f'{first} {second}'
+        weights[pair] = weights.get(pair, 0) + TITLE_WEIGHT
+    for token in _tokens(text)[:MAX_BODY_WORDS]:
+        feature = f'body:{token}'
+        weights[feature] = weights.get(feature, 0) + BODY_WEIGHT
+    if len(weights) < MIN_FEATURES:
+        return None
+
+    # A bit is set when the features with that bit set outweigh the rest
+    lanes = 0
+    for feature, weight in weights.items():
+        lanes += weight * _feature_lanes(feature)
+    total = sum(weights.values())
+    fingerprint = 0
+    for bit in range(HASH_BITS):
+        if 2 * (lanes >> (bit * LANE_BITS) & LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _to_signed(value):
+    """SQLite integers are signed 64-bit"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def _to_unsigned(value):
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+class NearDuplicateIndex:
+    """
+    SimHash index for spotting the same story published under different URLs.
+
+    Each fingerprint is split into max_distance + 1 bands stored in a
+    bucket table. Two fingerprints within max_distance bits of each other
+    must agree on at least one whole band, so looking up an article's bands
+    finds every near-duplicate candidate without comparing it to the whole
+    archive; only the few candidates are checked bit by bit. Duplicates are
+    linked to the first article of their cluster (the canonical one).
+
+    Only articles published within window_days of each other are matched,
+    so recurring titles (e.g. a weekly discussion thread) aren't collapsed
+    into their first occurrence.
+    """
+    def __init__(self, conn, max_distance=3, window_days=7):
+        self.conn = conn
+        self.max_distance = max_distance
+        self.window = window_days * 86400
+        self.bands = max_distance + 1
+        self.band_bits = HASH_BITS // self.bands
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM simhash").fetchone()[0]
+
+    def _band_values(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.bands)]
+
+    def canonical(self, article_id):
+        """Canonical article of an indexed id, or None if it isn't indexed"""
+        row = self.conn.execute("SELECT canonical FROM simhash WHERE id = ?", (article_id,)).fetchone()
+        return row[0] if row else None
+
+    def find(self, fingerprint, published):
+        """
+        Canonical id of the closest article within max_distance bits that was
+        published inside the window around `published` (a Unix timestamp), if any
+        """
+        best = None
+        for band, value in self._band_values(fingerprint):
+            rows = self.conn.execute(
+                "SELECT s.id, s.hash, s.canonical FROM simhash_bands b JOIN simhash s ON s.id = b.id "
+                "WHERE b.band = ? AND b.value = ? AND s.published BETWEEN ? AND ?",
+                (band, value, published - self.window, published + self.window)
+            )
+            for candidate, value_hash, canonical in rows:
+                distance = bin(_to_unsigned(value_hash) ^ fingerprint).count('1')
+                if distance <= self.max_distance and (best is None or (distance, candidate) < best[:2]):
+                    best = (distance, candidate, canonical)
+        return best[2] if best else None
+
+    def add(self, article_id, title, text, published):
+        """
+        Index an article and return the canonical id of its cluster: its own
+        id if it is the first of its story, or the article it duplicates.
+        Articles with too little text are not indexed and are their own canonical.
+        """
+        existing = self.canonical(article_id)
+        if existing is not None:
+            return existing
+
+        fingerprint = simhash(title, text)
+        if fingerprint is None:
+            return article_id
+        canonical = self.find(fingerprint, published) or article_id
+
+        self.conn.execute(
+            "INSERT INTO simhash (id, hash, canonical, published) VALUES (?, ?, ?, ?)",
+            (article_id, _to_signed(fingerprint), canonical, published)
+        )
+        self.conn.executemany(
+            "INSERT INTO simhash_bands (band, value, id) VALUES (?, ?, ?)",
+            [(band, value, article_id) for band, value in self._band_values(fingerprint)]
+        )
+        return canonical
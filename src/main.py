@@ -1,14 +1,21 @@
 import os
+import sys
 import argparse
 import logging
 from datetime import datetime
 import pytz
 import json
-import re
-from pathlib import Path
-from dateutil import parser
+import time
+import hashlib
 from src.config import Config
-from src.scrapers.rss_scraper import RSSFeedScraper, TZINFOS
+from src.models import Article
+from src.archive import ArchiveStore
+from src.scrapers.scheduler import PollScheduler
+from src.scrapers.page_cache import PageCache
+from src.output import OutputWriter
+from src.metrics import Metrics
+from src.search import STOPWORDS, DOC_CHUNK_SIZE, SHARD_PREFIX
+from src import shards
 
 # Configure logging
 logging.basicConfig(
@@ -20,63 +27,202 @@
 )
 logger = logging.getLogger(__name__)
 
-def update_archive(feeds_dir, new_articles):
-    """
-    Update the archive with new articles.
-    The archive maintains all articles ever scraped, preserving history.
-    """
-    archive_path = os.path.join(feeds_dir, 'archive.json')
-    archive = {}
-    
-    # Load existing archive if it exists
-    if os.path.exists(archive_path):
-        try:
-            with open(archive_path, 'r', encoding='utf-8') as f:
-                archive = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading archive: {e}")
-            # Create a new archive if the existing one is corrupted
-            archive = {"version": "1.0", "updated": "", "items": {}}
-    else:
-        # Initialize new archive
-        archive = {"version": "1.0", "updated": "", "items": {}}
-    
-    # Get existing article IDs for quick lookup
-    existing_ids = set(archive.get("items", {}).keys())
-    
-    # Add new articles to archive if they don't exist already
-    added_count = 0
-    for article in new_articles:
-        article_id = article['id']
+# Archive shards live in feeds/archive/YYYY-MM-N.json, listed in feeds/archive/manifest.json
+ARCHIVE_SHARDS_DIR = 'archive'
+# Maximum number of articles per shard file
+ARCHIVE_SHARD_SIZE = 500
+# Bump when the shard or manifest layout changes so every month is rebuilt once
+ARCHIVE_SHARD_VERSION = 2
+# The search index is published as feeds/search/terms/XX.json (postings) and
+# feeds/search/docs/N.json (article rows), listed in feeds/search/manifest.json
+SEARCH_DIR = 'search'
+# Bump when the search file layout changes so every shard is republished once
+SEARCH_VERSION = 1
+INDEX_STYLES = """    <style>
+        :root {
+            --primary-color: #2563eb;
+            --primary-hover: #1d4ed8;
+            --background: #f8fafc;
+            --list-bg: #ffffff;
+            --text-primary: #1e293b;
+            --text-secondary: #64748b;
+            --border-color: #e2e8f0;
+            --hover-bg: #f1f5f9;
+        }
         
-        if article_id not in existing_ids:
-            # Add to archive with original datetime as key
-            archive["items"][article_id] = article
-            added_count += 1
-    
-    # Update archive metadata
-    archive["updated"] = datetime.now(pytz.UTC).isoformat()
-    archive["total_articles"] = len(archive["items"])
-    
-    # Save updated archive
-    with open(archive_path, 'w', encoding='utf-8') as f:
-        json.dump(archive, f, indent=2)
-    
-    logger.info(f"Archive updated with {added_count} new articles. Total: {archive['total_articles']}")
-    return archive
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+            line-height: 1.6;
+            color: var(--text-primary);
+            max-width: 1000px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: var(--background);
+        }
+        
+        h1, h2, h3 {
+            color: var(--text-primary);
+            font-weight: 600;
+        }
+        
+        h1 {
+            font-size: 2rem;
+            margin-bottom: 0.5rem;
+        }
+        
+        .header {
+            text-align: center;
+            margin-bottom: 1.5rem;
+        }
+        
+        .description {
+            color: var(--text-secondary);
+            margin-bottom: 1rem;
+        }
+        
+        .updated {
+            font-size: 0.875rem;
+            color: var(--text-secondary);
+            margin-bottom: 1.5rem;
+        }
+        
+        .nav-links {
+            display: flex;
+            justify-content: center;
+            gap: 1rem;
+            margin-bottom: 1.5rem;
+        }
+        
+        .nav-link {
+            display: inline-block;
+            padding: 0.5rem 1rem;
+            background-color: var(--list-bg);
+            border: 1px solid var(--border-color);
+            border-radius: 0.375rem;
+            color: var(--primary-color);
+            text-decoration: none;
+            font-size: 0.875rem;
+            font-weight: 500;
+            transition: all 0.2s;
+        }
+        
+        .nav-link:hover {
+            background-color: var(--primary-color);
+            color: white;
+        }
+        
+        .total-count {
+            text-align: center;
+            margin-bottom: 1.5rem;
+            font-weight: 500;
+            color: var(--text-secondary);
+        }
+        
+        .category-header {
+            margin-top: 1.5rem;
+            padding: 0.75rem 1rem;
+            background-color: var(--list-bg);
+            border-radius: 0.375rem;
+            border-left: 4px solid var(--primary-color);
+            box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
+            font-size: 1.25rem;
+        }
+        
+        .articles-list {
+            list-style: none;
+            padding: 0;
+            margin: 0.75rem 0 1.5rem 0;
+            background-color: var(--list-bg);
+            border-radius: 0.375rem;
+            overflow: hidden;
+            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06);
+        }
+        
+        .article-item {
+            padding: 0.75rem 1rem;
+            border-bottom: 1px solid var(--border-color);
+            transition: background-color 0.2s;
+            display: flex;
+            flex-direction: column;
+            max-width: 100%;
+        }
+        
+        .article-item:last-child {
+            border-bottom: none;
+        }
+        
+        .article-item:hover {
+            background-color: var(--hover-bg);
+        }
+        
+        .article-title {
+            font-weight: 600;
+            margin: 0 0 0.25rem 0;
+            line-height: 1.4;
+            font-size: 1rem;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+            max-width: 100%;
+        }
+        
+        .article-title a {
+            color: var(--text-primary);
+            text-decoration: none;
+        }
+        
+        .article-title a:hover {
+            color: var(--primary-color);
+        }
+        
+        .article-meta {
+            font-size: 0.75rem;
+            color: var(--text-secondary);
+            margin-bottom: 0.25rem;
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+        }
+        
+        .article-source {
+            font-weight: 600;
+            color: var(--primary-color);
+            white-space: nowrap;
+        }
+        
+        .article-summary {
+            font-size: 0.875rem;
+            color: var(--text-secondary);
+            margin: 0;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            display: -webkit-box;
+            -webkit-line-clamp: 2;
+            -webkit-box-orient: vertical;
+        }
+        
+        .no-articles {
+            padding: 2rem;
+            text-align: center;
+            background-color: var(--list-bg);
+            border-radius: 0.375rem;
+            color: var(--text-secondary);
+            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06);
+        }
+        
+        @media (max-width: 640px) {
+            body {
+                padding: 16px;
+            }
+            
+            .article-meta {
+                flex-wrap: wrap;
+            }
+        }
+    </style>"""
 
-def generate_archive_html(feeds_dir, archive_data):
-    """Generate an archive.html file that displays all historical articles in a compact list view"""
-    
-    # Create archive.html
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI News Archive</title>
-    <style>
-        :root {{
+ARCHIVE_STYLES = """    <style>
+        :root {
             --primary-color: #2563eb;
             --primary-hover: #1d4ed8;
             --background: #f8fafc;
@@ -86,9 +232,9 @@ def generate_archive_html(feeds_dir, archive_data):
             --border-color: #e2e8f0;
             --border-light: #f1f5f9;
             --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
             line-height: 1.5;
             color: var(--text-primary);
@@ -96,43 +242,43 @@ def generate_archive_html(feeds_dir, archive_data):
             margin: 0 auto;
             padding: 20px;
             background-color: var(--background);
-        }}
+        }
         
-        h1, h2, h3 {{
+        h1, h2, h3 {
             color: var(--text-primary);
             font-weight: 600;
-        }}
+        }
         
-        h1 {{
+        h1 {
             font-size: 1.75rem;
             margin-bottom: 0.5rem;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 1.5rem;
-        }}
+        }
         
-        .description {{
+        .description {
             color: var(--text-secondary);
             margin-bottom: 0.5rem;
             font-size: 0.875rem;
-        }}
+        }
         
-        .updated {{
+        .updated {
             font-size: 0.75rem;
             color: var(--text-secondary);
             margin-bottom: 1.5rem;
-        }}
+        }
         
-        .nav-links {{
+        .nav-links {
             display: flex;
             justify-content: center;
             gap: 1rem;
             margin-bottom: 1.5rem;
-        }}
+        }
         
-        .nav-link {{
+        .nav-link {
             display: inline-block;
             padding: 0.5rem 1rem;
             background-color: var(--card-bg);
@@ -143,22 +289,22 @@ def generate_archive_html(feeds_dir, archive_data):
             font-size: 0.75rem;
             font-weight: 500;
             transition: all 0.2s;
-        }}
+        }
         
-        .nav-link:hover {{
+        .nav-link:hover {
             background-color: var(--primary-color);
             color: white;
-        }}
+        }
         
-        .total-count {{
+        .total-count {
             text-align: center;
             margin-bottom: 1rem;
             font-weight: 500;
             color: var(--text-secondary);
             font-size: 0.875rem;
-        }}
+        }
         
-        .month-header {{
+        .month-header {
             margin-top: 1.5rem;
             padding: 0.5rem 0.75rem;
             background-color: var(--card-bg);
@@ -167,9 +313,9 @@ def generate_archive_html(feeds_dir, archive_data):
             font-weight: 600;
             border-bottom: 2px solid var(--primary-color);
             box-shadow: var(--shadow-sm);
-        }}
+        }
         
-        .archive-table {{
+        .archive-table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 0.5rem;
@@ -179,9 +325,9 @@ def generate_archive_html(feeds_dir, archive_data):
             overflow: hidden;
             box-shadow: var(--shadow-sm);
             table-layout: fixed;
-        }}
+        }
         
-        .archive-table th {{
+        .archive-table th {
             text-align: left;
             padding: 0.625rem 0.75rem;
             background-color: var(--border-light);
@@ -192,190 +338,459 @@ def generate_archive_html(feeds_dir, archive_data):
             overflow: hidden;
             text-overflow: ellipsis;
             white-space: nowrap;
-        }}
+        }
         
-        .archive-table th:hover {{
+        .archive-table th:hover {
             background-color: #e2e8f0;
-        }}
+        }
         
-        .archive-table tr {{
+        .archive-table tr {
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
         
-        .archive-table tr:last-child {{
+        .archive-table tr:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .archive-table tr:hover {{
+        .archive-table tr:hover {
             background-color: #f8fafc;
-        }}
+        }
         
-        .archive-table td {{
+        .archive-table td {
             padding: 0.5rem 0.75rem;
             vertical-align: middle;
             overflow: hidden;
             text-overflow: ellipsis;
             white-space: nowrap;
-        }}
+        }
         
-        .article-title-cell {{
+        .article-title-cell {
             width: 50%;
-        }}
+        }
         
-        .article-title-cell a {{
+        .article-title-cell a {
             color: var(--text-primary);
             text-decoration: none;
             display: block;
             white-space: nowrap;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
         
-        .article-title-cell a:hover {{
+        .article-title-cell a:hover {
             color: var(--primary-color);
             text-decoration: underline;
-        }}
+        }
         
-        .article-source {{
+        .article-source {
             font-weight: 500;
             color: var(--primary-color);
             white-space: nowrap;
-        }}
+        }
         
         /* Add source column width constraint */
-        td:nth-child(2) {{
+        td:nth-child(2) {
             width: 15%;
             max-width: 100px;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
         
-        .article-category {{
+        .article-category {
             width: 15%;
-        }}
+        }
         
-        .article-date {{
+        .article-date {
             white-space: nowrap;
             color: var(--text-secondary);
             width: 10%;
-        }}
+        }
         
-        .no-articles {{
+        .no-articles {
             padding: 2rem;
             text-align: center;
             background-color: var(--card-bg);
             border-radius: 0.25rem;
             color: var(--text-secondary);
             box-shadow: var(--shadow-sm);
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .archive-table {{
+        @media (max-width: 768px) {
+            .archive-table {
                 font-size: 0.75rem;
-            }}
+            }
             
             .archive-table th, 
-            .archive-table td {{
+            .archive-table td {
                 padding: 0.5rem;
-            }}
+            }
             
-            .article-category {{
+            .article-category {
                 display: none;
-            }}
+            }
             
-            .article-title-cell {{
+            .article-title-cell {
                 width: 65%;
-            }}
+            }
             
             /* Adjust source column on tablet */
-            td:nth-child(2) {{
+            td:nth-child(2) {
                 width: 20%;
                 max-width: 80px;
-            }}
-        }}
+            }
+        }
         
-        @media (max-width: 480px) {{
-            .article-date {{
+        @media (max-width: 480px) {
+            .article-date {
                 display: none;
-            }}
+            }
             
-            .article-title-cell {{
+            .article-title-cell {
                 width: 75%;
-            }}
+            }
             
             /* Adjust source column on mobile */
-            td:nth-child(2) {{
+            td:nth-child(2) {
                 width: 25%;
                 max-width: 70px;
-            }}
+            }
             
-            body {{
+            body {
                 padding: 10px;
-            }}
-        }}
+            }
+        }
         
         /* Sorting indicators */
-        .sort-icon::after {{
+        .sort-icon::after {
             content: '⇵';
             margin-left: 0.25rem;
             font-size: 0.75rem;
-        }}
+        }
         
-        .sort-asc::after {{
+        .sort-asc::after {
             content: '↑';
             margin-left: 0.25rem;
             font-size: 0.75rem;
-        }}
+        }
         
-        .sort-desc::after {{
+        .sort-desc::after {
             content: '↓';
             margin-left: 0.25rem;
             font-size: 0.75rem;
-        }}
-    </style>
-    <script>
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Sorting functionality
-            const getCellValue = (tr, idx) => tr.children[idx].innerText || tr.children[idx].textContent;
+        }
+        
+        .month-row td {
+            font-weight: 600;
+            background-color: var(--border-light);
+            border-bottom: 2px solid var(--primary-color);
+        }
+        
+        .search-box {
+            display: block;
+            width: 100%;
+            box-sizing: border-box;
+            margin-bottom: 1rem;
+            padding: 0.5rem 0.75rem;
+            font-size: 1rem;
+            color: var(--text-primary);
+            background-color: var(--card-bg);
+            border: 1px solid var(--border-color);
+            border-radius: 0.375rem;
+            box-shadow: var(--shadow-sm);
+        }
+        
+        .archive-status {
+            text-align: center;
+            margin: 1rem 0;
+            color: var(--text-secondary);
+            font-size: 0.875rem;
+        }
+        
+        .load-more {
+            display: block;
+            margin: 0 auto 1.5rem auto;
+            cursor: pointer;
+        }
+    </style>"""
+
+# Client-side archive browser: loads the manifest, then fetches month shards on
+# demand as the reader scrolls. Shards are already sorted newest first, so date
+# sorting just walks them in order (or in reverse); other columns sort the rows
+# loaded so far in memory rather than DOM nodes.
+ARCHIVE_SCRIPT = """    <script>
+        document.addEventListener('DOMContentLoaded', function() {
+            const PAGE_SIZE = 200;
+            const DATE = 4;
+            const table = document.getElementById('archive-table');
+            const tbody = document.getElementById('archive-rows');
+            const status = document.getElementById('archive-status');
+            const loadMoreButton = document.getElementById('load-more');
+            const sentinel = document.getElementById('sentinel');
+            const searchBox = document.getElementById('archive-search');
+            const SEARCH_LIMIT = 100;
             
-            const comparer = (idx, asc) => (a, b) => ((v1, v2) => 
-                v1 !== '' && v2 !== '' && !isNaN(v1) && !isNaN(v2) ? v1 - v2 : v1.toString().localeCompare(v2)
-            )(getCellValue(asc ? a : b, idx), getCellValue(asc ? b : a, idx));
+            let manifest = null;
+            let monthNames = {};
+            let shardQueue = [];
+            let rows = [];
+            let rendered = 0;
+            let loading = false;
+            let sortKey = DATE;
+            let ascending = false;
+            let searching = false;
+            let searchIndex = null;
+            let searchRun = 0;
+            let searchTimer = null;
+            const searchFiles = {};
             
-            document.querySelectorAll('th').forEach(th => th.addEventListener('click', (() => {{
-                const table = th.closest('table');
-                const tbody = table.querySelector('tbody');
-                
-                // Reset all headers
-                Array.from(th.parentNode.children)
-                    .forEach(el => {{
-                        el.classList.remove('sort-asc', 'sort-desc');
-                        el.classList.add('sort-icon');
-                    }});
+            const displayCategory = category => category.replace(/_/g, ' ').replace(/\\b\\w/g, c => c.toUpperCase());
+            
+            function shardUrls() {
+                const urls = [];
+                manifest.shards.forEach(shard => shard.files.forEach(file => {
+                    urls.push('archive/' + file + '?v=' + shard.hash.slice(0, 12));
+                }));
+                return ascending ? urls.reverse() : urls;
+            }
+            
+            function cell(className, child) {
+                const td = document.createElement('td');
+                if (className) td.className = className;
+                td.appendChild(child);
+                return td;
+            }
+            
+            function renderRows(limit) {
+                const fragment = document.createDocumentFragment();
+                let month = rendered ? rows[rendered - 1][DATE].slice(0, 7) : null;
+                for (; rendered < limit; rendered++) {
+                    const date = rows[rendered][DATE];
+                    if (sortKey === DATE && date.slice(0, 7) !== month) {
+                        month = date.slice(0, 7);
+                        const tr = document.createElement('tr');
+                        tr.className = 'month-row';
+                        const td = cell('', document.createTextNode(monthNames[month] || month));
+                        td.colSpan = 4;
+                        tr.appendChild(td);
+                        fragment.appendChild(tr);
+                    }
+                    fragment.appendChild(articleRow(rows[rendered]));
+                }
+                tbody.appendChild(fragment);
+            }
+            
+            function articleRow([title, url, source, category, date]) {
+                const link = document.createElement('a');
+                link.href = url;
+                link.target = '_blank';
+                link.title = title;
+                link.textContent = title;
+                const sourceLabel = document.createElement('span');
+                sourceLabel.className = 'article-source';
+                sourceLabel.textContent = source;
+                const tr = document.createElement('tr');
+                tr.appendChild(cell('article-title-cell', link));
+                tr.appendChild(cell('', sourceLabel));
+                tr.appendChild(cell('article-category', document.createTextNode(displayCategory(category))));
+                tr.appendChild(cell('article-date', document.createTextNode(date)));
+                return tr;
+            }
+            
+            function updateStatus() {
+                const more = rendered < rows.length || (sortKey === DATE && shardQueue.length > 0);
+                loadMoreButton.hidden = !more;
+                if (sortKey !== DATE && shardQueue.length > 0) {
+                    status.textContent = 'Sorted the ' + rows.length + ' articles loaded so far. Sort by date to keep browsing older months.';
+                } else {
+                    status.textContent = 'Showing ' + rendered + ' of ' + manifest.total_articles + ' articles';
+                }
+            }
+            
+            async function loadMore() {
+                if (loading || !manifest || searching) return;
+                loading = true;
+                try {
+                    while (rows.length < rendered + PAGE_SIZE && sortKey === DATE && shardQueue.length) {
+                        const response = await fetch(shardQueue.shift());
+                        const shard = await response.json();
+                        if (ascending) shard.reverse();
+                        for (const row of shard) rows.push(row);
+                    }
+                    renderRows(Math.min(rows.length, rendered + PAGE_SIZE));
+                } catch (error) {
+                    status.textContent = 'Could not load the archive: ' + error;
+                } finally {
+                    loading = false;
+                    updateStatus();
+                }
+                // Keep filling the page while the end of the table is still in view
+                if (!loadMoreButton.hidden && sentinel.getBoundingClientRect().top < window.innerHeight + 600) {
+                    loadMore();
+                }
+            }
+            
+            function reset() {
+                rows = sortKey === DATE ? [] : rows;
+                rendered = 0;
+                tbody.textContent = '';
+            }
+            
+            document.querySelectorAll('th[data-key]').forEach(th => th.addEventListener('click', () => {
+                if (searching) return;
+                const key = Number(th.dataset.key);
+                ascending = key === sortKey ? !ascending : key !== DATE;
+                sortKey = key;
                 
-                // Determine sort direction
-                const asc = !th.classList.contains('sort-asc');
-                if (asc) {{
-                    th.classList.remove('sort-icon', 'sort-desc');
-                    th.classList.add('sort-asc');
-                }} else {{
-                    th.classList.remove('sort-icon', 'sort-asc');
-                    th.classList.add('sort-desc');
-                }}
+                document.querySelectorAll('th[data-key]').forEach(el => {
+                    el.classList.remove('sort-asc', 'sort-desc');
+                    el.classList.add('sort-icon');
+                });
+                th.classList.remove('sort-icon');
+                th.classList.add(ascending ? 'sort-asc' : 'sort-desc');
                 
-                // Sort the table
-                Array.from(tbody.querySelectorAll('tr'))
-                    .sort(comparer(Array.from(th.parentNode.children).indexOf(th), asc))
-                    .forEach(tr => tbody.appendChild(tr));
-            }})));
-        }});
-    </script>
+                reset();
+                if (key === DATE) {
+                    shardQueue = shardUrls();
+                    loadMore();
+                } else {
+                    const direction = ascending ? 1 : -1;
+                    rows.sort((a, b) => direction * a[key].localeCompare(b[key]));
+                    renderRows(Math.min(rows.length, PAGE_SIZE));
+                    updateStatus();
+                }
+            }));
+            
+            // Search: the query is tokenized like src/search.py does, each term's
+            // posting shard is fetched (and cached), and the newest matches are
+            // looked up in the document chunks
+            function tokenize(text) {
+                const words = text.toLowerCase().match(/[a-z0-9]+(?:\.[a-z0-9]+)*/g) || [];
+                return words
+                    .filter(word => !searchIndex.stopwords.has(word) && (word.length > 1 || /^\d$/.test(word)))
+                    .map(word => word.length > 3 && word.endsWith('s') && !word.endsWith('ss') ? word.slice(0, -1) : word);
+            }
+            
+            function searchFile(name) {
+                const hash = searchIndex.files[name];
+                if (!hash) return Promise.resolve({});
+                if (!searchFiles[name]) {
+                    searchFiles[name] = fetch('search/' + name + '.json?v=' + hash.slice(0, 12))
+                        .then(response => response.json())
+                        .catch(error => { delete searchFiles[name]; throw error; });
+                }
+                return searchFiles[name];
+            }
+            
+            async function loadSearchIndex() {
+                if (!searchIndex) {
+                    const response = await fetch('search/manifest.json', { cache: 'no-cache' });
+                    const data = await response.json();
+                    data.stopwords = new Set(data.stopwords);
+                    searchIndex = data;
+                }
+                return searchIndex;
+            }
+            
+            async function findArticles(query) {
+                const index = await loadSearchIndex();
+                const terms = tokenize(query);
+                let matches = null;
+                for (let i = 0; i < terms.length && (matches === null || matches.size); i++) {
+                    const term = terms[i];
+                    const postings = await searchFile('terms/' + term.slice(0, index.shard_prefix).replace(/\./g, '_'));
+                    const found = new Set();
+                    if (i === terms.length - 1 && term.length >= index.shard_prefix) {
+                        for (const [key, seqs] of Object.entries(postings)) {
+                            if (key.startsWith(term)) seqs.forEach(seq => found.add(seq));
+                        }
+                    } else {
+                        (postings[term] || []).forEach(seq => found.add(seq));
+                    }
+                    matches = matches === null ? found : new Set([...matches].filter(seq => found.has(seq)));
+                }
+                // Archive seqs grow as articles are added, so the highest are the newest
+                const seqs = [...(matches || [])].sort((a, b) => b - a);
+                const results = [];
+                for (const seq of seqs.slice(0, SEARCH_LIMIT)) {
+                    const chunk = await searchFile('docs/' + Math.floor(seq / index.doc_chunk_size));
+                    if (chunk[seq]) results.push(chunk[seq]);
+                }
+                results.sort((a, b) => b[DATE].localeCompare(a[DATE]));
+                return { total: seqs.length, results };
+            }
+            
+            async function search() {
+                const query = searchBox.value.trim();
+                const run = ++searchRun;
+                if (!query) {
+                    searching = false;
+                    rendered = 0;
+                    tbody.textContent = '';
+                    renderRows(Math.min(rows.length, PAGE_SIZE));
+                    updateStatus();
+                    return;
+                }
+                searching = true;
+                loadMoreButton.hidden = true;
+                try {
+                    const { total, results } = await findArticles(query);
+                    if (run !== searchRun) return;
+                    const fragment = document.createDocumentFragment();
+                    results.forEach(row => fragment.appendChild(articleRow(row)));
+                    tbody.textContent = '';
+                    tbody.appendChild(fragment);
+                    status.textContent = total > results.length
+                        ? 'Showing the newest ' + results.length + ' of ' + total + ' matching articles'
+                        : total + (total === 1 ? ' matching article' : ' matching articles');
+                } catch (error) {
+                    if (run === searchRun) status.textContent = 'Could not search the archive: ' + error;
+                }
+            }
+            
+            searchBox.addEventListener('input', () => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(search, 150);
+            });
+            
+            loadMoreButton.addEventListener('click', loadMore);
+            new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) loadMore();
+            }, { rootMargin: '600px' }).observe(sentinel);
+            
+            fetch('archive/manifest.json', { cache: 'no-cache' })
+                .then(response => response.json())
+                .then(data => {
+                    manifest = data;
+                    manifest.shards.forEach(shard => { monthNames[shard.month] = shard.name; });
+                    document.getElementById('total-count').textContent = 'Total Articles: ' + manifest.total_articles;
+                    document.getElementById('updated').textContent = 'Last updated: ' + (manifest.updated || 'never');
+                    if (!manifest.total_articles) {
+                        document.getElementById('empty').hidden = false;
+                        return;
+                    }
+                    table.hidden = false;
+                    searchBox.hidden = false;
+                    shardQueue = shardUrls();
+                    loadMore();
+                })
+                .catch(error => { status.textContent = 'Could not load the archive: ' + error; });
+        });
+    </script>"""
+
+ARCHIVE_SHELL = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI News Archive</title>
+{ARCHIVE_STYLES}
+{ARCHIVE_SCRIPT}
 </head>
 <body>
     <div class="header">
         <h1>AI News Archive</h1>
         <p class="description">A complete archive of all AI-related news scraped since the beginning.</p>
-        <div class="updated">Last updated: {datetime.now(pytz.timezone('UTC')).strftime('%Y-%m-%d %H:%M:%S')} UTC</div>
+        <div class="updated" id="updated"></div>
     </div>
     
     <div class="nav-links">
@@ -383,306 +798,280 @@ def generate_archive_html(feeds_dir, archive_data):
         <a href="archive.json" class="nav-link">Download Archive (JSON)</a>
     </div>
     
-    <div class="total-count">
-        Total Articles: {len(archive_data.get("items", {}))}
-    </div>
-"""
+    <div class="total-count" id="total-count"></div>
     
-    if not archive_data or not archive_data.get("items"):
-        html_content += """
-    <div class="no-articles">
+    <input type="search" class="search-box" id="archive-search" placeholder="Search titles, summaries and sources" aria-label="Search the archive" hidden>
+    
+    <noscript>
+        <div class="no-articles">
+            <p>Browsing the archive requires JavaScript. You can <a href="archive.json">download the full archive as JSON</a> instead.</p>
+        </div>
+    </noscript>
+    
+    <div class="no-articles" id="empty" hidden>
         <h3>No articles found</h3>
         <p>The archive is empty. Articles will appear here once they've been scraped.</p>
     </div>
-"""
-    else:
-        # Get all articles and convert to list
-        all_articles = []
-        for article_id, article in archive_data.get("items", {}).items():
-            all_articles.append(article)
-            
-        # Sort articles by date (newest first)
-        all_articles = sorted(
-            all_articles, 
-            key=lambda x: parser.parse(x.get('date_published', '1970-01-01T00:00:00Z'), tzinfos=TZINFOS), 
-            reverse=True
-        )
-        
-        # Group articles by month for better organization
-        articles_by_month = {}
-        current_month = None
-        
-        for article in all_articles:
-            published_date = parser.parse(article.get('date_published', ''), tzinfos=TZINFOS)
-            month_key = published_date.strftime('%Y-%m')
-            month_name = published_date.strftime('%B %Y')
-            
-            if month_key not in articles_by_month:
-                articles_by_month[month_key] = {
-                    'name': month_name,
-                    'articles': []
-                }
-            
-            articles_by_month[month_key]['articles'].append(article)
-        
-        # Display articles grouped by month
-        for month_key in sorted(articles_by_month.keys(), reverse=True):
-            month_data = articles_by_month[month_key]
-            html_content += f"""
-    <h3 class="month-header">{month_data['name']}</h3>
-    <table class="archive-table">
+    
+    <table class="archive-table" id="archive-table" hidden>
         <thead>
             <tr>
-                <th class="sort-icon">Title</th>
-                <th class="sort-icon">Source</th>
-                <th class="sort-icon article-category">Category</th>
-                <th class="sort-icon article-date">Date</th>
+                <th class="sort-icon" data-key="0">Title</th>
+                <th class="sort-icon" data-key="2">Source</th>
+                <th class="sort-icon article-category" data-key="3">Category</th>
+                <th class="sort-desc article-date" data-key="4">Date</th>
             </tr>
         </thead>
-        <tbody>
-"""
-            # Display each article in this month
-            for article in month_data['articles']:
-                published_date = parser.parse(article.get('date_published', ''), tzinfos=TZINFOS)
-                formatted_date = published_date.strftime('%Y-%m-%d')
-                
-                category = article.get('category', 'Uncategorized')
-                # Format category name for display
-                display_category = category.replace('_', ' ').title()
-                
-                html_content += f"""
-            <tr>
-                <td class="article-title-cell"><a href="{article.get('url', '#')}" target="_blank" title="{article.get('title', 'Untitled')}">{article.get('title', 'Untitled')}</a></td>
-                <td><span class="article-source">{article.get('source', '')}</span></td>
-                <td class="article-category">{display_category}</td>
-                <td class="article-date">{formatted_date}</td>
-            </tr>"""
-            
-            html_content += """
-        </tbody>
-    </table>"""
-    
-    html_content += """
+        <tbody id="archive-rows"></tbody>
+    </table>
+    <div id="sentinel"></div>
+    <div class="archive-status" id="archive-status"></div>
+    <button class="nav-link load-more" id="load-more" hidden>Load more</button>
 </body>
 </html>
 """
+
+def flatten_articles(all_articles):
+    """List the scraped articles of every category (Article objects, shared, not copied)"""
+    return [article for articles in all_articles.values() for article in articles]
+
+def update_archive(archive, new_articles, output=None):
+    """
+    Update the archive with new articles.
+    The archive maintains all articles ever scraped, preserving history.
+    Only the new articles are written to the archive database; archive.json
+    is re-exported when something was added or linked (or doesn't exist yet).
+    """
+    added_count = archive.add(new_articles)
     
-    # Write to file
-    archive_html_path = os.path.join(feeds_dir, 'archive.html')
-    with open(archive_html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if added_count or archive.linked_ids or not os.path.exists(archive.json_path):
+        archive.export_json(output)
+    
+    logger.info(f"Archive updated with {added_count} new articles. Total: {len(archive)}")
+    if archive.linked_ids:
+        logger.info(f"Linked {len(archive.linked_ids)} near-duplicate articles to stories already archived")
+    return archive
+
+def _archive_shard_row(article):
+    """Compact row stored in the archive shards: title, url, source, category, date"""
+    return [
+        article.title or 'Untitled',
+        article.url or '#',
+        article.source,
+        article.category or 'Uncategorized',
+        article.published.strftime('%Y-%m-%d'),
+    ]
+
+def _write_archive_shards(output, archive, month):
+    """
+    Write a month's articles as JSON shards of at most ARCHIVE_SHARD_SIZE rows,
+    newest first. Returns the shard file names.
+    """
+    files = []
+    batch = []
+    
+    def flush():
+        name = f'{month}-{len(files)}.json'
+        output.write_json(f'{ARCHIVE_SHARDS_DIR}/{name}', batch, ensure_ascii=False, separators=(',', ':'))
+        files.append(name)
+        batch.clear()
+    
+    for article in archive.iter_month(month):
+        batch.append(_archive_shard_row(article))
+        if len(batch) >= ARCHIVE_SHARD_SIZE:
+            flush()
+    if batch or not files:
+        flush()
+    return files
+
+def _load_archive_manifest(feeds_dir, output):
+    """
+    Load the shard manifest written by the previous run, keyed by month.
+    Output from an older layout is cleared so every month is rebuilt once.
+    """
+    shard_dir = os.path.join(feeds_dir, ARCHIVE_SHARDS_DIR)
+    manifest_path = os.path.join(shard_dir, 'manifest.json')
+    manifest = {}
+    try:
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading archive manifest: {e}")
+    
+    if manifest.get('version') == ARCHIVE_SHARD_VERSION:
+        return {shard['month']: shard for shard in manifest.get('shards', [])}
+    
+    if os.path.isdir(shard_dir):
+        for name in os.listdir(shard_dir):
+            if name.endswith(('.html', '.json')):
+                output.remove(f'{ARCHIVE_SHARDS_DIR}/{name}')
+    return {}
+
+def generate_archive_html(feeds_dir, archive, output=None):
+    """
+    Publish the archive as month-sharded JSON plus a manifest, and write
+    archive.html as a static shell that loads the shards on demand.
+    A month's shards are only rewritten when the month received new
+    articles (or its shards are missing or outdated), so the work per run
+    stays flat as the archive grows, and the first page load only needs
+    the shell, the manifest and the newest shard.
+    """
+    writer = output or OutputWriter(feeds_dir)
+    total_articles = len(archive)
+    shard_dir = os.path.join(feeds_dir, ARCHIVE_SHARDS_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    previous = _load_archive_manifest(feeds_dir, writer)
+    
+    shards = []
+    rendered = 0
+    for month, count in archive.months():
+        entry = previous.get(month)
+        files_exist = entry is not None and all(
+            os.path.exists(os.path.join(shard_dir, name)) for name in entry['files']
+        )
+        if files_exist and month not in archive.added_months:
+            shards.append(entry)
+            continue
+        
+        content_hash = archive.month_digest(month, salt=str(ARCHIVE_SHARD_VERSION))
+        if files_exist and entry['hash'] == content_hash:
+            shards.append(entry)
+            continue
+        
+        files = _write_archive_shards(writer, archive, month)
+        for name in set(entry['files'] if entry else []) - set(files):
+            writer.remove(f'{ARCHIVE_SHARDS_DIR}/{name}')
+        
+        shards.append({
+            'month': month,
+            'name': datetime.strptime(month, '%Y-%m').strftime('%B %Y'),
+            'count': count,
+            'hash': content_hash,
+            'files': files,
+        })
+        rendered += 1
+    
+    manifest = {
+        'version': ARCHIVE_SHARD_VERSION,
+        'updated': archive.updated[:19].replace('T', ' ') + ' UTC' if archive.updated else '',
+        'total_articles': total_articles,
+        'fields': ['title', 'url', 'source', 'category', 'date'],
+        'shards': shards,
+    }
+    writer.write_json(f'{ARCHIVE_SHARDS_DIR}/manifest.json', manifest, ensure_ascii=False, indent=1)
+    
+    # The shell is static; all archive data comes from the manifest and shards
+    archive_html_path = writer.write_text('archive.html', ARCHIVE_SHELL)
+    if output is None:
+        writer.save_manifest()
     
-    logger.info(f"Generated archive.html with {len(archive_data.get('items', {}))} total articles")
+    logger.info(f"Generated archive with {total_articles} total articles ({rendered} of {len(shards)} months re-sharded)")
     return archive_html_path
 
-def generate_index_html(feeds_dir, articles_data=None):
-    """Generate an index.html file that displays the actual articles in a concise list view"""
+def _load_search_manifest(feeds_dir, output):
+    """
+    Load the search manifest written by the previous run. Returns None when
+    it is missing or from an older layout (whose files are then removed).
+    """
+    manifest_path = os.path.join(feeds_dir, SEARCH_DIR, 'manifest.json')
+    manifest = {}
+    try:
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading search manifest: {e}")
     
-    # Load articles from JSON if no data is provided directly
-    if articles_data is None:
-        all_json_path = os.path.join(feeds_dir, 'all.json')
-        if os.path.exists(all_json_path):
-            with open(all_json_path, 'r', encoding='utf-8') as f:
-                feed_data = json.load(f)
-                articles_data = feed_data.get('items', [])
+    if manifest.get('version') == SEARCH_VERSION:
+        return manifest
+    for name in manifest.get('files', {}):
+        output.remove(f'{SEARCH_DIR}/{name}.json')
+    return None
+
+def generate_search_index(feeds_dir, archive, output=None):
+    """
+    Publish the archive's search index as static JSON for archive.html:
+    posting shards (term -> archive seqs) grouped by the first letters of
+    each term, and chunks of article rows keyed by seq. Only the shards and
+    chunks touched by newly archived articles are rewritten; everything is
+    republished if the manifest or any of its files is missing.
+    """
+    writer = output or OutputWriter(feeds_dir)
+    index = archive.search_index
+    search_dir = os.path.join(feeds_dir, SEARCH_DIR)
+    previous = _load_search_manifest(feeds_dir, writer)
+    if previous is None or not all(
+        os.path.exists(os.path.join(search_dir, f'{name}.json')) for name in previous.get('files', {})
+    ):
+        index.mark_all_dirty()
+    
+    dirty = index.dirty()
+    for name in dirty:
+        kind, key = name.split('/', 1)
+        if kind == 'terms':
+            data = index.postings(name)
         else:
-            articles_data = []
+            start = int(key) * DOC_CHUNK_SIZE
+            data = {
+                str(seq): _archive_shard_row(article)
+                for seq, article in archive.iter_seq_range(start, start + DOC_CHUNK_SIZE)
+            }
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        os.makedirs(os.path.join(search_dir, kind), exist_ok=True)
+        writer.write_text(f'{SEARCH_DIR}/{name}.json', text)
+        index.published(name, hashlib.sha256(text.encode('utf-8')).hexdigest())
+    index.commit()
+    
+    manifest = {
+        'version': SEARCH_VERSION,
+        'total_articles': len(archive),
+        'doc_chunk_size': DOC_CHUNK_SIZE,
+        'shard_prefix': SHARD_PREFIX,
+        'stopwords': sorted(STOPWORDS),
+        'files': {name: content_hash[:12] for name, content_hash in index.files().items()},
+    }
+    writer.write_json(f'{SEARCH_DIR}/manifest.json', manifest, ensure_ascii=False, separators=(',', ':'))
+    if output is None:
+        writer.save_manifest()
     
-    # Create index.html with a concise list view
-    html_content = f"""<!DOCTYPE html>
+    logger.info(f"Search index: {len(dirty)} of {len(manifest['files'])} files republished")
+    return len(dirty)
+
+def search_archive(feeds_dir, query, limit=20):
+    """Print the archived articles matching a query, newest first"""
+    if not os.path.exists(os.path.join(feeds_dir, ArchiveStore.DB_FILENAME)):
+        print(f"No archive found in {feeds_dir}")
+        return 1
+    archive = ArchiveStore(feeds_dir, duplicate_distance=None)
+    try:
+        start = time.perf_counter()
+        results = archive.search(query, limit)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        archive.close()
+    
+    for article in results:
+        print(f"{article.published.strftime('%Y-%m-%d')}  {article.source}: {article.title or 'Untitled'}")
+        print(f"    {article.url}")
+    print(f"{len(results)} results ({elapsed:.1f} ms)")
+    return 0
+
+def _render_index(articles_data, updated):
+    """Yield the markup of index.html, one list item at a time"""
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>AI News Daily Digest</title>
-    <style>
-        :root {{
-            --primary-color: #2563eb;
-            --primary-hover: #1d4ed8;
-            --background: #f8fafc;
-            --list-bg: #ffffff;
-            --text-primary: #1e293b;
-            --text-secondary: #64748b;
-            --border-color: #e2e8f0;
-            --hover-bg: #f1f5f9;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-            line-height: 1.6;
-            color: var(--text-primary);
-            max-width: 1000px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: var(--background);
-        }}
-        
-        h1, h2, h3 {{
-            color: var(--text-primary);
-            font-weight: 600;
-        }}
-        
-        h1 {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .header {{
-            text-align: center;
-            margin-bottom: 1.5rem;
-        }}
-        
-        .description {{
-            color: var(--text-secondary);
-            margin-bottom: 1rem;
-        }}
-        
-        .updated {{
-            font-size: 0.875rem;
-            color: var(--text-secondary);
-            margin-bottom: 1.5rem;
-        }}
-        
-        .nav-links {{
-            display: flex;
-            justify-content: center;
-            gap: 1rem;
-            margin-bottom: 1.5rem;
-        }}
-        
-        .nav-link {{
-            display: inline-block;
-            padding: 0.5rem 1rem;
-            background-color: var(--list-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 0.375rem;
-            color: var(--primary-color);
-            text-decoration: none;
-            font-size: 0.875rem;
-            font-weight: 500;
-            transition: all 0.2s;
-        }}
-        
-        .nav-link:hover {{
-            background-color: var(--primary-color);
-            color: white;
-        }}
-        
-        .total-count {{
-            text-align: center;
-            margin-bottom: 1.5rem;
-            font-weight: 500;
-            color: var(--text-secondary);
-        }}
-        
-        .category-header {{
-            margin-top: 1.5rem;
-            padding: 0.75rem 1rem;
-            background-color: var(--list-bg);
-            border-radius: 0.375rem;
-            border-left: 4px solid var(--primary-color);
-            box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-            font-size: 1.25rem;
-        }}
-        
-        .articles-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0.75rem 0 1.5rem 0;
-            background-color: var(--list-bg);
-            border-radius: 0.375rem;
-            overflow: hidden;
-            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06);
-        }}
-        
-        .article-item {{
-            padding: 0.75rem 1rem;
-            border-bottom: 1px solid var(--border-color);
-            transition: background-color 0.2s;
-            display: flex;
-            flex-direction: column;
-            max-width: 100%;
-        }}
-        
-        .article-item:last-child {{
-            border-bottom: none;
-        }}
-        
-        .article-item:hover {{
-            background-color: var(--hover-bg);
-        }}
-        
-        .article-title {{
-            font-weight: 600;
-            margin: 0 0 0.25rem 0;
-            line-height: 1.4;
-            font-size: 1rem;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-            max-width: 100%;
-        }}
-        
-        .article-title a {{
-            color: var(--text-primary);
-            text-decoration: none;
-        }}
-        
-        .article-title a:hover {{
-            color: var(--primary-color);
-        }}
-        
-        .article-meta {{
-            font-size: 0.75rem;
-            color: var(--text-secondary);
-            margin-bottom: 0.25rem;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }}
-        
-        .article-source {{
-            font-weight: 600;
-            color: var(--primary-color);
-            white-space: nowrap;
-        }}
-        
-        .article-summary {{
-            font-size: 0.875rem;
-            color: var(--text-secondary);
-            margin: 0;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            display: -webkit-box;
-            -webkit-line-clamp: 2;
-            -webkit-box-orient: vertical;
-        }}
-        
-        .no-articles {{
-            padding: 2rem;
-            text-align: center;
-            background-color: var(--list-bg);
-            border-radius: 0.375rem;
-            color: var(--text-secondary);
-            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06);
-        }}
-        
-        @media (max-width: 640px) {{
-            body {{
-                padding: 16px;
-            }}
-            
-            .article-meta {{
-                flex-wrap: wrap;
-            }}
-        }}
-    </style>
+{INDEX_STYLES}
 </head>
 <body>
     <div class="header">
         <h1>AI News Daily Digest</h1>
         <p class="description">Latest AI news and updates from across the web.</p>
-        <div class="updated">Last updated: {datetime.now(pytz.timezone('UTC')).strftime('%Y-%m-%d %H:%M:%S')} UTC</div>
+        <div class="updated">Last updated: {updated.strftime('%Y-%m-%d %H:%M:%S')} UTC</div>
     </div>
     
     <div class="nav-links">
@@ -694,7 +1083,7 @@ def generate_index_html(feeds_dir, articles_data=None):
 """
 
     if not articles_data:
-        html_content += """
+        yield """
     <div class="no-articles">
         <h3>No articles found</h3>
         <p>The feed is empty. Articles will appear once they've been scraped from sources.</p>
@@ -705,7 +1094,7 @@ def generate_index_html(feeds_dir, articles_data=None):
         articles_by_category = {}
         
         for article in articles_data:
-            category = article.get('category', 'Uncategorized')
+            category = article.category or 'Uncategorized'
             if category not in articles_by_category:
                 articles_by_category[category] = []
             articles_by_category[category].append(article)
@@ -715,7 +1104,7 @@ def generate_index_html(feeds_dir, articles_data=None):
         
         # Display article count
         total_articles = len(articles_data)
-        html_content += f"""
+        yield f"""
     <div class="total-count">
         Showing {total_articles} Latest Articles
     </div>
@@ -726,59 +1115,163 @@ def generate_index_html(feeds_dir, articles_data=None):
             # Format category name for display
             display_category = category.replace('_', ' ').title()
             
-            html_content += f"""
+            yield f"""
     <h3 class="category-header">{display_category}</h3>
     <ul class="articles-list">
 """
             
             # Display articles for this category
             for article in articles_by_category[category]:
-                published_date = parser.parse(article.get('date_published', ''), tzinfos=TZINFOS)
-                formatted_date = published_date.strftime('%Y-%m-%d')
-                
-                author = article.get('author', {})
-                author_name = author.get('name', '') if author else ''
+                formatted_date = article.published.strftime('%Y-%m-%d')
                 
-                # Get a truncated summary (if available)
-                summary = article.get('summary', '')
-                
-                html_content += f"""
+                yield f"""
         <li class="article-item">
-            <h4 class="article-title"><a href="{article.get('url', '#')}" target="_blank">{article.get('title', 'Untitled')}</a></h4>
+            <h4 class="article-title"><a href="{article.url or '#'}" target="_blank">{article.title or 'Untitled'}</a></h4>
             <div class="article-meta">
-                <span class="article-source">{article.get('source', '')}</span>
-                {f'· {author_name}' if author_name else ''}
+                <span class="article-source">{article.source}</span>
+                {f'· {article.author}' if article.author else ''}
                 · {formatted_date}
             </div>
             <p class="article-summary">
-                {summary}
+                {article.summary}
             </p>
         </li>"""
                 
-            html_content += """
+            yield """
     </ul>"""
     
-    html_content += """
+    yield """
 </body>
 </html>
 """
+
+def generate_index_html(feeds_dir, articles_data=None, updated=None, output=None):
+    """
+    Generate an index.html file that displays the actual articles in a concise list view.
+    updated is the time shown as "Last updated" (defaults to now); pass the time the
+    content last changed so the page is byte-identical between runs with no news.
+    """
+    
+    # Load articles from JSON if no data is provided directly
+    if articles_data is None:
+        all_json_path = os.path.join(feeds_dir, 'all.json')
+        if os.path.exists(all_json_path):
+            with open(all_json_path, 'r', encoding='utf-8') as f:
+                feed_data = json.load(f)
+                articles_data = [Article.from_item(item) for item in feed_data.get('items', [])]
+        else:
+            articles_data = []
     
     # Write to file
-    index_html_path = os.path.join(feeds_dir, 'index.html')
-    with open(index_html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    writer = output or OutputWriter(feeds_dir)
+    index_html_path = writer.write_chunks('index.html', _render_index(articles_data, updated or datetime.now(pytz.UTC)))
+    if output is None:
+        writer.save_manifest()
     
     logger.info(f"Generated index.html with {len(articles_data)} articles")
     return index_html_path
 
-def main():
-    """Main function to run the RSS Feed Scraper"""
-    parser = argparse.ArgumentParser(description='RSS Feed Scraper for AI topics')
-    parser.add_argument('--output-dir', type=str, help='Output directory for feed files')
-    parser.add_argument('--ai-only', action='store_true', help='Only include AI-related articles')
-    parser.add_argument('--force-refresh', action='store_true', help='Ignore last scrape times and fetch all feeds again')
+def load_feed_articles(feeds_dir, archive):
+    """
+    The articles of the last run, as listed in all.json, in their archived
+    form and newest first, so index.html can be rebuilt without scraping.
+    Near-duplicates, which are not archived, are left out as on index.html.
+    """
+    path = os.path.join(feeds_dir, 'all.json')
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f).get('items', [])
+    except Exception as e:
+        logger.error(f"Error loading {path}: {e}")
+        return []
+    return [article for article in (archive.get(item['id']) for item in items) if article is not None]
+
+def create_http_client():
+    """The pooled HTTP client shared by every scraper request"""
+    # Imported here so commands that don't fetch anything skip loading httpx
+    from src.scrapers.http_client import HttpClient
+    return HttpClient(
+        timeout=Config.HTTP_TIMEOUT,
+        connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        per_host_connections=Config.HTTP_PER_HOST_CONNECTIONS,
+        default_rate_limit=Config.HTTP_DEFAULT_RATE_LIMIT,
+        host_rate_limits=Config.HTTP_HOST_RATE_LIMITS,
+        http2=Config.HTTP2,
+        user_agent=Config.HTTP_USER_AGENT,
+    )
+
+def create_page_cache(output_dir, output):
+    """The cache of article pages fetched for entries without content"""
+    return PageCache(output_dir, output, max_age=Config.PAGE_CACHE_MAX_AGE, ttl=Config.PAGE_CACHE_TTL)
+
+def create_poll_scheduler(output_dir, output, min_interval=None):
+    """The adaptive poll scheduler, or None if adaptive polling is disabled"""
+    if not Config.ADAPTIVE_POLLING:
+        return None
+    return PollScheduler(
+        output_dir,
+        output=output,
+        min_interval=min_interval or Config.POLL_MIN_INTERVAL,
+        max_interval=Config.POLL_MAX_INTERVAL,
+        interval_factor=Config.POLL_INTERVAL_FACTOR,
+        backoff=Config.POLL_BACKOFF,
+        error_backoff_max=Config.POLL_ERROR_BACKOFF_MAX
+    )
+
+def publish_archive(output_dir, archive, new_articles, latest_articles, output, metrics):
+    """
+    Archive new articles and regenerate the pages built from the archive:
+    archive.html with its shards, the search index, and index.html listing
+    latest_articles (each story once)
+    """
+    # List each story once
+    latest_articles = [article for article in latest_articles if article.duplicate_of is None]
+    
+    # Update the archive with new articles
+    with metrics.span('archive'):
+        update_archive(archive, new_articles, output)
+    
+    # Generate archive.html with all historical articles
+    with metrics.span('archive_html'):
+        generate_archive_html(output_dir, archive, output)
     
-    args = parser.parse_args()
+    # Republish the search shards touched by new articles
+    with metrics.span('search_index'):
+        generate_search_index(output_dir, archive, output)
+    updated = datetime.fromisoformat(archive.updated) if archive.updated else None
+    
+    # Generate index.html with the latest articles
+    with metrics.span('index_html'):
+        generate_index_html(output_dir, latest_articles, updated, output)
+
+def finish_run(output, metrics, precompress=False):
+    """Precompress changed outputs, write the run metrics and the output manifest, and log what changed"""
+    if precompress:
+        with metrics.span('precompress'):
+            compressed = output.precompress(max_workers=Config.PRECOMPRESS_WORKERS)
+        logger.info(f"Precompressed {len(compressed)} files")
+    
+    summary = output.summary()
+    metrics.add('outputs_changed', len(summary['changed']))
+    metrics.add('outputs_unchanged', summary['unchanged'])
+    metrics.log_summary(metrics.write(output, history_size=Config.METRICS_HISTORY_SIZE))
+    
+    output.save_manifest()
+    logger.info(
+        f"Outputs: {len(summary['changed'])} changed, {summary['unchanged']} unchanged, "
+        f"{len(summary['removed'])} removed"
+    )
+    for name in summary['changed']:
+        logger.info(f"Changed: {name}")
+    return summary
+
+def scrape(args):
+    """Fetch the feeds and regenerate every output"""
+    # The scraper pulls in feedparser, BeautifulSoup and httpx, so it is only imported when scraping
+    from src.scrapers.rss_scraper import RSSFeedScraper
     
     # Use command line arguments if provided, otherwise use config
     output_dir = args.output_dir if args.output_dir else Config.OUTPUT_DIR
@@ -786,53 +1279,322 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
+    if args.shard:
+        return scrape_shard(args, output_dir)
+    
     logger.info(f"Starting RSS Feed Scraper. Output directory: {output_dir}")
     
+    # All scraper requests share one pooled HTTP client
+    http_client = create_http_client()
+    
+    # Every file published to the output directory goes through one content-addressed writer
+    output = OutputWriter(output_dir)
+    metrics = Metrics()
+    
+    # The archive is opened first so the scraper can use its near-duplicate index
+    archive = ArchiveStore(
+        output_dir,
+        duplicate_distance=Config.NEAR_DUPLICATE_MAX_DISTANCE,
+        duplicate_window_days=Config.NEAR_DUPLICATE_WINDOW_DAYS
+    )
+    
+    # Only feeds that are due (by their learned publication rate) are fetched
+    scheduler = create_poll_scheduler(output_dir, output)
+    
     # Initialize and run the scraper
     scraper = RSSFeedScraper(
         feed_urls=Config.FEEDS,
         output_dir=output_dir,
-        ai_keywords=Config.AI_KEYWORDS if args.ai_only else []
+        ai_keywords=Config.AI_KEYWORDS if args.ai_only else [],
+        max_workers=args.workers,
+        parse_workers=args.parse_workers,
+        inline_max_bytes=Config.PARSE_INLINE_MAX_BYTES,
+        http_client=http_client,
+        keyword_word_boundary=Config.KEYWORD_WORD_BOUNDARY,
+        cache_dir=Config.CACHE_DIR,
+        output=output,
+        metrics=metrics,
+        duplicates=archive.duplicates,
+        scheduler=scheduler,
+        page_cache=create_page_cache(output_dir, output),
+        force_refresh=args.force_refresh
     )
     
     # If force refresh is enabled, clear the last scrape times
     if args.force_refresh:
         logger.info("Force refresh enabled. Ignoring last scrape times.")
         scraper.last_scrape_times = {}
+        scraper.http_cache.clear()
+        if scheduler is not None:
+            scheduler.reset_due()
     
     try:
         # Fetch and process all feeds
-        all_articles = scraper.scrape()
-        
-        # Prepare articles for the index
-        flattened_articles = []
-        for category, articles in all_articles.items():
-            for article in articles:
-                flattened_articles.append({
-                    'id': article['url'],
-                    'url': article['url'],
-                    'title': article['title'],
-                    'summary': article['description'] or article['content'][:150] + '...',
-                    'date_published': article['published_at'],
-                    'author': {'name': article['author']} if article['author'] else None,
-                    'source': article['source']
-                })
+        with metrics.span('scrape'):
+            all_articles = scraper.scrape()
         
-        # Update the archive with new articles
-        archive = update_archive(output_dir, flattened_articles)
+        # The same Article objects go to the archive and the index
+        articles = flatten_articles(all_articles)
         
-        # Generate archive.html with all historical articles
-        generate_archive_html(output_dir, archive)
-        
-        # Generate index.html with the latest articles
-        generate_index_html(output_dir, flattened_articles)
+        publish_archive(output_dir, archive, articles, articles, output, metrics)
+        finish_run(output, metrics, args.precompress)
         
         logger.info("RSS Feed Scraper completed successfully")
     except Exception as e:
         logger.error(f"Error running RSS Feed Scraper: {e}", exc_info=True)
         return 1
+    finally:
+        archive.close()
+        http_client.close()
+    
+    return 0
+
+def scrape_shard(args, output_dir):
+    """
+    Fetch one shard's feeds into feeds/shards/I-of-N: the shard's scrape
+    state and a batch of its articles, which the merge command publishes
+    """
+    from src.scrapers.rss_scraper import RSSFeedScraper
+    
+    index, count = args.shard
+    feeds = shards.shard_feeds(Config.FEEDS, index, count)
+    directory = shards.shard_dir(output_dir, index, count)
+    logger.info(f"Starting shard {index}/{count} ({len(feeds)} of {len(Config.FEEDS)} feeds). Output directory: {directory}")
+    
+    # The shard starts from the published scrape state and only writes its own directory
+    shards.seed_state(output_dir, directory)
+    http_client = create_http_client()
+    output = OutputWriter(directory)
+    metrics = Metrics()
+    scheduler = create_poll_scheduler(directory, output)
+    
+    # Near-duplicates are found by the merge, which sees every shard's articles
+    scraper = RSSFeedScraper(
+        feed_urls=feeds,
+        output_dir=directory,
+        ai_keywords=Config.AI_KEYWORDS if args.ai_only else [],
+        max_workers=args.workers,
+        parse_workers=args.parse_workers,
+        inline_max_bytes=Config.PARSE_INLINE_MAX_BYTES,
+        http_client=http_client,
+        keyword_word_boundary=Config.KEYWORD_WORD_BOUNDARY,
+        output=output,
+        metrics=metrics,
+        scheduler=scheduler,
+        page_cache=create_page_cache(directory, output),
+        force_refresh=args.force_refresh
+    )
+    
+    if args.force_refresh:
+        logger.info("Force refresh enabled. Ignoring last scrape times.")
+        scraper.last_scrape_times = {}
+        scraper.http_cache.clear()
+        if scheduler is not None:
+            scheduler.reset_due()
+    
+    try:
+        with metrics.span('scrape'):
+            all_articles = scraper.collect()
+        shards.write_batch(output, index, count, feeds, all_articles, metrics)
+        output.save_manifest()
+        metrics.log_summary()
+        logger.info(f"Shard {index}/{count} collected {len(flatten_articles(all_articles))} articles")
+    except Exception as e:
+        logger.error(f"Error running shard {index}/{count}: {e}", exc_info=True)
+        return 1
+    finally:
+        http_client.close()
     
     return 0
 
+def merge(args):
+    """
+    Publish the articles of every scraped shard: the category feeds, the
+    archive and the HTML pages, with near-duplicates found across shards.
+    Nothing is fetched.
+    """
+    from src.scrapers.rss_scraper import RSSFeedScraper
+    
+    output_dir = args.output_dir or Config.OUTPUT_DIR
+    try:
+        batches = shards.load_batches(output_dir)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    if not batches:
+        logger.error(f"No shard batches found in {os.path.join(output_dir, shards.SHARDS_DIR)}")
+        return 1
+    
+    logger.info(f"Merging {len(batches)} shard(s) of {batches[0].count} into {output_dir}")
+    output = OutputWriter(output_dir)
+    metrics = Metrics()
+    for batch in batches:
+        metrics.merge(batch.metrics)
+    archive = ArchiveStore(
+        output_dir,
+        duplicate_distance=Config.NEAR_DUPLICATE_MAX_DISTANCE,
+        duplicate_window_days=Config.NEAR_DUPLICATE_WINDOW_DAYS
+    )
+    scraper = RSSFeedScraper(
+        feed_urls=Config.FEEDS,
+        output_dir=output_dir,
+        cache_dir=Config.CACHE_DIR,
+        output=output,
+        metrics=metrics,
+        duplicates=archive.duplicates,
+        scheduler=create_poll_scheduler(output_dir, output),
+        page_cache=create_page_cache(output_dir, output)
+    )
+    
+    try:
+        with metrics.span('merge'):
+            shards.merge_state(scraper, batches)
+            all_articles = shards.merge_articles(batches, Config.FEEDS)
+        
+        # Articles already in the index (from an earlier merge of the same batches) keep their canonical
+        with metrics.span('dedup'):
+            scraper.mark_duplicates(all_articles)
+        scraper.write_feeds(all_articles)
+        
+        articles = flatten_articles(all_articles)
+        publish_archive(output_dir, archive, articles, articles, output, metrics)
+        finish_run(output, metrics, args.precompress)
+        
+        if not args.keep_shards:
+            shards.remove_batches(output_dir)
+        logger.info("Merge completed successfully")
+    except Exception as e:
+        logger.error(f"Error merging shards: {e}", exc_info=True)
+        return 1
+    finally:
+        archive.close()
+        scraper.close()
+    
+    return 0
+
+def render(args):
+    """Regenerate archive.html, the search index and index.html without fetching anything"""
+    output_dir = args.output_dir or Config.OUTPUT_DIR
+    if not os.path.exists(os.path.join(output_dir, ArchiveStore.DB_FILENAME)) and \
+            not os.path.exists(os.path.join(output_dir, ArchiveStore.JSON_FILENAME)):
+        logger.error(f"No archive found in {output_dir}")
+        return 1
+    
+    output = OutputWriter(output_dir)
+    metrics = Metrics()
+    archive = ArchiveStore(output_dir, duplicate_distance=None)
+    try:
+        with metrics.span('archive_html'):
+            generate_archive_html(output_dir, archive, output)
+        with metrics.span('search_index'):
+            generate_search_index(output_dir, archive, output)
+        updated = datetime.fromisoformat(archive.updated) if archive.updated else None
+        with metrics.span('index_html'):
+            generate_index_html(output_dir, load_feed_articles(output_dir, archive), updated, output)
+        if args.precompress:
+            with metrics.span('precompress'):
+                output.precompress(max_workers=Config.PRECOMPRESS_WORKERS)
+    finally:
+        archive.close()
+    
+    output.save_manifest()
+    summary = output.summary()
+    logger.info(
+        f"Rendered in {metrics.duration:.2f}s. Outputs: {len(summary['changed'])} changed, "
+        f"{summary['unchanged']} unchanged"
+    )
+    return 0
+
+def export_archive(args):
+    """Re-export archive.json from the archive database"""
+    output_dir = args.output_dir or Config.OUTPUT_DIR
+    if not os.path.exists(os.path.join(output_dir, ArchiveStore.DB_FILENAME)) and \
+            not os.path.exists(os.path.join(output_dir, ArchiveStore.JSON_FILENAME)):
+        logger.error(f"No archive found in {output_dir}")
+        return 1
+    
+    archive = ArchiveStore(output_dir, duplicate_distance=None)
+    try:
+        archive.export_json()
+        logger.info(f"Exported {len(archive)} articles to {archive.json_path}")
+    finally:
+        archive.close()
+    return 0
+
+def search(args):
+    """Print the archived articles matching a query"""
+    return search_archive(args.output_dir or Config.OUTPUT_DIR, args.query, args.limit)
+
+def serve(args):
+    """Keep polling feeds and publishing new articles until interrupted"""
+    import asyncio
+    from src.daemon import Daemon
+    daemon = Daemon(
+        args.output_dir or Config.OUTPUT_DIR,
+        ai_only=args.ai_only,
+        workers=args.workers,
+        parse_workers=args.parse_workers,
+        precompress=args.precompress
+    )
+    asyncio.run(daemon.run())
+    return 0
+
+COMMANDS = {
+    'scrape': scrape,
+    'merge': merge,
+    'render': render,
+    'archive': export_archive,
+    'search': search,
+    'serve': serve,
+}
+
+def build_parser():
+    """Command line parser with one subcommand per operation"""
+    parser = argparse.ArgumentParser(
+        description='RSS Feed Scraper for AI topics',
+        epilog='Without a command, the options are passed to "scrape".'
+    )
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--output-dir', type=str, help='Output directory for feed files')
+    fetching = argparse.ArgumentParser(add_help=False)
+    fetching.add_argument('--ai-only', action='store_true', help='Only include AI-related articles')
+    fetching.add_argument('--workers', type=int, default=Config.FETCH_WORKERS, help='Number of feeds to download in parallel')
+    fetching.add_argument('--parse-workers', type=int, default=Config.PARSE_WORKERS,
+                          help='Number of processes parsing large feeds (below 2, feeds are parsed inline)')
+    precompress = argparse.ArgumentParser(add_help=False)
+    precompress.add_argument('--precompress', action='store_true', default=Config.PRECOMPRESS,
+                             help='Write precompressed .gz / .br copies of the generated files')
+    
+    scrape_parser = commands.add_parser('scrape', parents=[common, fetching, precompress],
+                                        help='Fetch the feeds and regenerate every output (default)')
+    scrape_parser.add_argument('--force-refresh', action='store_true',
+                               help='Ignore last scrape times and fetch all feeds again')
+    scrape_parser.add_argument('--shard', type=shards.parse_shard, metavar='I/N',
+                               help='Only fetch shard I of N of the feeds, for the merge command to publish')
+    merge_parser = commands.add_parser('merge', parents=[common, precompress],
+                                       help='Publish the feeds, archive and pages from the scraped shards')
+    merge_parser.add_argument('--keep-shards', action='store_true',
+                              help='Keep the shard directories after merging them')
+    commands.add_parser('render', parents=[common, precompress],
+                        help='Regenerate archive.html, the search index and index.html without fetching')
+    commands.add_parser('archive', parents=[common], help='Re-export archive.json from the archive database')
+    search_parser = commands.add_parser('search', parents=[common], help='Search the archive')
+    search_parser.add_argument('query', help='Words to look for in titles, summaries and sources')
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum number of results')
+    commands.add_parser('serve', parents=[common, fetching, precompress],
+                        help='Keep polling feeds and publish new articles as they arrive')
+    return parser
+
+def main(argv=None):
+    """Main function to run the RSS Feed Scraper"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Options without a command go to scrape, so existing invocations keep working
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ('-h', '--help'):
+        argv = ['scrape', *argv]
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
+
 if __name__ == "__main__":
     exit(main())
\ No newline at end of file
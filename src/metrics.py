@@ -0,0 +1,231 @@
+import time
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import pytz
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Prefix of every metric in the Prometheus textfile
+METRIC_PREFIX = 'daily_digest'
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    parts = [f'{key}="{_escape_label(value)}"' for key, value in labels.items() if value is not None]
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Metrics:
+    """
+    Thread-safe collector of per-run timings and counters.
+
+    span() times a block of work for a pipeline stage, optionally keyed by
+    source and category; repeated spans with the same key accumulate.
+    add() increments a counter (bytes, entries, errors, ...) the same way.
+    At the end of a run the summary is written as metrics.json, as a
+    Prometheus textfile (metrics.prom) and appended to a rolling history.
+    """
+    JSON_FILENAME = 'metrics.json'
+    PROM_FILENAME = 'metrics.prom'
+    HISTORY_FILENAME = 'metrics_history.jsonl'
+
+    def __init__(self):
+        self.started = datetime.now(pytz.UTC)
+        self._start = time.perf_counter()
+        self.spans = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage, source=None, category=None):
+        """Time the enclosed block and add it to the stage's total"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, source, category)
+
+    def record(self, stage, seconds, source=None, category=None):
+        key = (stage, source, category)
+        with self._lock:
+            total, count = self.spans.get(key, (0.0, 0))
+            self.spans[key] = (total + seconds, count + 1)
+
+    def add(self, name, value=1, source=None, category=None):
+        """Increment a counter"""
+        key = (name, source, category)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def merge(self, other):
+        """Add the spans and counters recorded by another collector (e.g. one sent back by a worker process)"""
+        with other._lock:
+            spans = dict(other.spans)
+            counters = dict(other.counters)
+        with self._lock:
+            for key, (seconds, count) in spans.items():
+                total, total_count = self.spans.get(key, (0.0, 0))
+                self.spans[key] = (total + seconds, total_count + count)
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def export(self):
+        """Spans and counters as JSON-serializable rows, for runs that hand their metrics to another (shards)"""
+        with self._lock:
+            return {
+                'spans': [[*key, seconds, count] for key, (seconds, count) in self.spans.items()],
+                'counters': [[*key, value] for key, value in self.counters.items()],
+            }
+
+    @classmethod
+    def load(cls, data):
+        """A collector holding the spans and counters written by export()"""
+        metrics = cls()
+        for stage, source, category, seconds, count in data.get('spans', []):
+            metrics.spans[(stage, source, category)] = (seconds, count)
+        for name, source, category, value in data.get('counters', []):
+            metrics.counters[(name, source, category)] = value
+        return metrics
+
+    def __getstate__(self):
+        # Locks can't be pickled; the copy gets a fresh one
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self._start
+
+    def summary(self):
+        """Run summary: totals per stage plus per-source and per-category breakdowns"""
+        with self._lock:
+            spans = dict(self.spans)
+            counters = dict(self.counters)
+
+        stages, sources, categories, totals = {}, {}, {}, {}
+        for (stage, source, category), (seconds, count) in sorted(spans.items(), key=lambda item: str(item[0])):
+            stage_total = stages.setdefault(stage, {'seconds': 0.0, 'count': 0})
+            stage_total['seconds'] += seconds
+            stage_total['count'] += count
+            if source is not None:
+                entry = sources.setdefault(source, {'category': category, 'stages': {}, 'counters': {}})
+                entry['stages'][stage] = round(entry['stages'].get(stage, 0.0) + seconds, 4)
+            elif category is not None:
+                entry = categories.setdefault(category, {'stages': {}, 'counters': {}})
+                entry['stages'][stage] = round(entry['stages'].get(stage, 0.0) + seconds, 4)
+
+        for (name, source, category), value in sorted(counters.items(), key=lambda item: str(item[0])):
+            totals[name] = totals.get(name, 0) + value
+            if source is not None:
+                entry = sources.setdefault(source, {'category': category, 'stages': {}, 'counters': {}})
+                entry['counters'][name] = value
+            elif category is not None:
+                entry = categories.setdefault(category, {'stages': {}, 'counters': {}})
+                entry['counters'][name] = value
+
+        for source in sources.values():
+            source['seconds'] = round(sum(source['stages'].values()), 4)
+        for stage in stages.values():
+            stage['seconds'] = round(stage['seconds'], 4)
+
+        return {
+            'started': self.started.isoformat(),
+            'duration_seconds': round(self.duration, 4),
+            'stages': stages,
+            'counters': totals,
+            'sources': sources,
+            'categories': categories,
+        }
+
+    def prometheus(self, summary=None):
+        """Render the run in the Prometheus text exposition format"""
+        summary = summary or self.summary()
+        with self._lock:
+            spans = sorted(self.spans.items(), key=lambda item: str(item[0]))
+            counters = sorted(self.counters.items(), key=lambda item: str(item[0]))
+
+        lines = [
+            f'# HELP {METRIC_PREFIX}_run_duration_seconds Wall-clock duration of the last run',
+            f'# TYPE {METRIC_PREFIX}_run_duration_seconds gauge',
+            f'{METRIC_PREFIX}_run_duration_seconds {summary["duration_seconds"]}',
+            f'# HELP {METRIC_PREFIX}_last_run_timestamp_seconds Start time of the last run',
+            f'# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge',
+            f'{METRIC_PREFIX}_last_run_timestamp_seconds {self.started.timestamp():.0f}',
+            f'# HELP {METRIC_PREFIX}_stage_seconds Time spent in each pipeline stage during the last run',
+            f'# TYPE {METRIC_PREFIX}_stage_seconds gauge',
+        ]
+        for (stage, source, category), (seconds, _) in spans:
+            lines.append(f'{METRIC_PREFIX}_stage_seconds{_labels(stage=stage, source=source, category=category)} {seconds:.6f}')
+
+        names = sorted({name for (name, _, _), _ in counters})
+        for name in names:
+            lines.append(f'# HELP {METRIC_PREFIX}_{name} Count of {name.replace("_", " ")} in the last run')
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name} gauge')
+            for (counter, source, category), value in counters:
+                if counter == name:
+                    lines.append(f'{METRIC_PREFIX}_{name}{_labels(source=source, category=category)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def _history_record(self, summary):
+        """Compact per-run record kept in the rolling history"""
+        return {
+            'started': summary['started'],
+            'duration_seconds': summary['duration_seconds'],
+            'stages': {stage: values['seconds'] for stage, values in summary['stages'].items()},
+            'counters': summary['counters'],
+            'sources': {
+                source: {'seconds': values['seconds'], **values['counters']}
+                for source, values in summary['sources'].items()
+            },
+        }
+
+    def write(self, output, history_size=500):
+        """
+        Write metrics.json, metrics.prom and append this run to
+        metrics_history.jsonl (keeping the last history_size runs).
+        """
+        summary = self.summary()
+        output.write_json(self.JSON_FILENAME, summary, publish=False, indent=2)
+        output.write_text(self.PROM_FILENAME, self.prometheus(summary), publish=False)
+
+        history = []
+        history_path = output.path(self.HISTORY_FILENAME)
+        try:
+            with open(history_path, 'r', encoding='utf-8') as f:
+                history = [line for line in f.read().splitlines() if line.strip()]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error loading metrics history: {e}")
+        history.append(json.dumps(self._history_record(summary), separators=(',', ':')))
+        output.write_text(self.HISTORY_FILENAME, '\n'.join(history[-history_size:]) + '\n', publish=False)
+        return summary
+
+    def log_summary(self, summary=None, slowest=5):
+        """Log the run duration, the top-level stages and the slowest sources"""
+        summary = summary or self.summary()
+        with self._lock:
+            # Per-source spans overlap across fetch threads, so only whole-run stages are listed
+            stages = ', '.join(
+                f"{stage} {seconds:.2f}s"
+                for (stage, source, category), (seconds, _) in self.spans.items()
+                if source is None and category is None
+            )
+        logger.info(f"Run took {summary['duration_seconds']:.2f}s ({stages})")
+        sources = sorted(summary['sources'].items(), key=lambda item: item[1]['seconds'], reverse=True)
+        if sources:
+            logger.info("Slowest sources: " + ', '.join(
+                f"{source} {values['seconds']:.2f}s" for source, values in sources[:slowest]
+            ))
@@ -0,0 +1,116 @@
+from datetime import datetime
+from src.scrapers.dates import item_datetime
+
+
+class Article:
+    """
+    A scraped article, as it goes from extraction through filtering and
+    deduplication to the feeds, the archive and the HTML pages.
+
+    Fields live in __slots__ instead of a per-article dict, and the parsed
+    publication time travels with the article, so no stage rebuilds it or
+    re-parses dates. The archive's JSON item is only built (to_item) when the
+    article is stored, and read back with from_item; archived articles carry
+    their summary but not their content. The summary of a scraped article is
+    derived from its description or content the first time it is needed.
+    """
+    __slots__ = (
+        'id', 'url', 'title', 'source', 'category', 'author', 'published',
+        'description', 'content', 'keywords', 'duplicate_of', 'related', '_summary',
+    )
+
+    def __init__(self, url, title, source, published, category=None, author='', description='',
+                 content='', keywords=(), summary=None, related=None, article_id=None):
+        self.id = article_id or url
+        self.url = url
+        self.title = title
+        self.source = source
+        self.category = category
+        self.author = author
+        # Timezone-aware datetime
+        self.published = published
+        self.description = description
+        self.content = content
+        self.keywords = keywords
+        # Id of the earlier report of the same story, for near-duplicates
+        self.duplicate_of = None
+        # Other reports of the same story: dicts with url, source (and title once archived)
+        self.related = related
+        self._summary = summary
+
+    def __repr__(self):
+        return f'Article({self.url!r}, {self.published.isoformat()})'
+
+    @property
+    def summary(self):
+        """The description, or else the start of the content"""
+        if self._summary is None:
+            self._summary = self.description or self.content[:150] + '...'
+        return self._summary
+
+    @property
+    def timestamp(self):
+        return self.published.timestamp()
+
+    def to_item(self):
+        """The JSON Feed style item stored in the archive (its 'related' links are kept by the archive)"""
+        item = {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'summary': self.summary,
+            'date_published': self.published.isoformat(),
+            'timestamp': self.timestamp,
+            'author': {'name': self.author} if self.author else None,
+            'source': self.source,
+        }
+        if self.category:
+            item['category'] = self.category
+        return item
+
+    def to_record(self):
+        """Every field as JSON-serializable values, for handing scraped articles between processes (shards)"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'source': self.source,
+            'category': self.category,
+            'author': self.author,
+            'published': self.published.isoformat(),
+            'description': self.description,
+            'content': self.content,
+            'keywords': list(self.keywords),
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """An article written by to_record"""
+        return cls(
+            url=record['url'],
+            title=record['title'],
+            source=record['source'],
+            published=datetime.fromisoformat(record['published']),
+            category=record['category'],
+            author=record['author'],
+            description=record['description'],
+            content=record['content'],
+            keywords=record['keywords'],
+            article_id=record['id'],
+        )
+
+    @classmethod
+    def from_item(cls, item):
+        """An article from an archive or JSON Feed item"""
+        author = item.get('author') or {}
+        return cls(
+            url=item.get('url', ''),
+            title=item.get('title', ''),
+            source=item.get('source', ''),
+            published=item_datetime(item),
+            category=item.get('category'),
+            author=author.get('name', ''),
+            summary=item.get('summary', ''),
+            related=item.get('related'),
+            article_id=item['id'],
+        )
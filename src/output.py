@@ -0,0 +1,254 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import importlib.util
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Outputs that get precompressed .gz / .br siblings
+COMPRESSIBLE_EXTENSIONS = ('.html', '.json', '.xml', '.atom')
+
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical for identical input
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Quality 11 is ~25x slower than 9 for ~15% smaller files; feeds change every
+# run, so the faster setting is the better trade-off
+BROTLI_QUALITY = 9
+
+
+def _brotli(data):
+    import brotli
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+COMPRESSORS = {'.gz': _gzip}
+# .br variants are only written when brotli is installed; it is looked up
+# without importing it so that only runs that precompress pay for loading it
+if importlib.util.find_spec('brotli') is not None:
+    COMPRESSORS['.br'] = _brotli
+
+
+class _HashingWriter:
+    """Text stream that encodes, hashes and writes to a binary file in one go"""
+    def __init__(self, raw, encoding='utf-8'):
+        self.raw = raw
+        self.encoding = encoding
+        self.digest = hashlib.sha256()
+
+    def write(self, text):
+        data = text.encode(self.encoding)
+        self.digest.update(data)
+        self.raw.write(data)
+        return len(text)
+
+
+class OutputWriter:
+    """
+    Content-addressed, atomic writer for everything published in the output dir.
+
+    Rendered bytes are hashed while they are written to a temporary file next
+    to the target. If the hash matches the one recorded in the manifest from
+    the previous run, the temp file is discarded and the existing file is left
+    untouched (mtime included); otherwise it replaces the target with an
+    atomic rename, so a crash mid-write never leaves a truncated file behind.
+
+    Published outputs can also get precompressed .gz / .br siblings for
+    static hosts that serve them directly; see precompress().
+    """
+    MANIFEST_FILENAME = 'output_manifest.json'
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_FILENAME)
+        self.hashes = self._load_manifest()
+        self.changed = []
+        self.unchanged = []
+        self.removed = []
+        self.compressed = []
+
+    def _load_manifest(self):
+        """Load the content hashes recorded by the previous run"""
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading output manifest: {e}")
+        return {}
+
+    def _previous_hash(self, name, path):
+        """
+        Hash of the current target. The manifest entry is trusted as long as
+        the file's size and mtime still match it; otherwise the file is re-hashed.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        entry = self.hashes.get(name)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _record(self, name, path, content_hash, publish):
+        stat = os.stat(path)
+        entry = {'sha256': content_hash, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        if not publish:
+            entry['internal'] = True
+        # Hash of the content the .gz / .br siblings were made from
+        compressed = (self.hashes.get(name) or {}).get('compressed')
+        if compressed == content_hash:
+            entry['compressed'] = compressed
+        self.hashes[name] = entry
+
+    def path(self, name):
+        return os.path.join(self.output_dir, name)
+
+    @contextmanager
+    def open(self, name, encoding='utf-8', publish=True):
+        """
+        Open an output file (relative to the output dir) for writing text.
+        The target only changes on disk if the written content differs.
+        publish=False marks internal state files that are never precompressed.
+        """
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+
+        try:
+            with open(tmp_path, 'wb', buffering=1024 * 1024) as raw:
+                stream = _HashingWriter(raw, encoding)
+                yield stream
+                raw.flush()
+                content_hash = stream.digest.hexdigest()
+                unchanged = self._previous_hash(name, path) == content_hash
+                # Only a file that replaces the target has to be on disk before the rename
+                if not unchanged:
+                    os.fsync(raw.fileno())
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if unchanged:
+            os.remove(tmp_path)
+            self.unchanged.append(name)
+        else:
+            os.replace(tmp_path, path)
+            self._remove_siblings(path)
+            self.changed.append(name)
+        self._record(name, path, content_hash, publish)
+
+    def write_chunks(self, name, chunks, publish=True):
+        """Write an iterable of string chunks"""
+        with self.open(name, publish=publish) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return self.path(name)
+
+    def write_text(self, name, text, publish=True):
+        return self.write_chunks(name, [text], publish=publish)
+
+    def write_json(self, name, data, publish=True, **kwargs):
+        with self.open(name, publish=publish) as f:
+            json.dump(data, f, **kwargs)
+        return self.path(name)
+
+    def remove(self, name):
+        """Delete an output that is no longer produced, along with its compressed siblings"""
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+            self.removed.append(name)
+        self._remove_siblings(path)
+        self.hashes.pop(name, None)
+
+    @staticmethod
+    def _remove_siblings(path):
+        """Drop compressed variants that no longer match their source"""
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def _compress(self, name, suffix):
+        """Write one compressed sibling atomically"""
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = COMPRESSORS[suffix](f.read())
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}{suffix}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path + suffix)
+        return name + suffix
+
+    def precompress(self, max_workers=4):
+        """
+        Write .gz (and .br when brotli is installed) siblings for the published
+        outputs whose content changed since their siblings were made, or whose
+        siblings are missing. Files are compressed in parallel; zlib and brotli
+        release the GIL while they work, so threads are enough.
+        """
+        jobs = []
+        for name, entry in sorted(self.hashes.items()):
+            if entry.get('internal') or not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            if not os.path.exists(self.path(name)):
+                continue
+            stale = entry.get('compressed') != entry['sha256']
+            for suffix in COMPRESSORS:
+                if stale or not os.path.exists(self.path(name) + suffix):
+                    jobs.append((name, suffix))
+            if stale:
+                self._remove_siblings(self.path(name))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                self.compressed = list(executor.map(lambda job: self._compress(*job), jobs))
+            for name, _ in jobs:
+                self.hashes[name]['compressed'] = self.hashes[name]['sha256']
+        return self.compressed
+
+    def save_manifest(self):
+        """
+        Record the hashes of this run's outputs.
+        Entries written by other writers since this one was created are kept.
+        """
+        manifest = self._load_manifest()
+        manifest.update(self.hashes)
+        for name in self.removed:
+            manifest.pop(name, None)
+        try:
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            logger.error(f"Error saving output manifest: {e}")
+
+    def reset(self):
+        """Forget which outputs changed, so a long-lived process can report each run separately"""
+        self.changed = []
+        self.unchanged = []
+        self.removed = []
+        self.compressed = []
+
+    def summary(self):
+        return {
+            'changed': sorted(self.changed),
+            'unchanged': len(self.unchanged),
+            'removed': sorted(self.removed),
+            'compressed': sorted(self.compressed),
+        }
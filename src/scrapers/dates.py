@@ -0,0 +1,60 @@
+import calendar
+from datetime import datetime
+from functools import lru_cache
+from dateutil import parser
+import pytz
+
+# Define timezone information to resolve ambiguous timezone abbreviations
+TZINFOS = {
+    'EST': -18000,  # UTC-5:00 (Eastern Standard Time)
+    'EDT': -14400,  # UTC-4:00 (Eastern Daylight Time)
+    'CST': -21600,  # UTC-6:00 (Central Standard Time)
+    'CDT': -18000,  # UTC-5:00 (Central Daylight Time)
+    'MST': -25200,  # UTC-7:00 (Mountain Standard Time)
+    'MDT': -21600,  # UTC-6:00 (Mountain Daylight Time)
+    'PST': -28800,  # UTC-8:00 (Pacific Standard Time)
+    'PDT': -25200,  # UTC-7:00 (Pacific Daylight Time)
+}
+
+EPOCH = datetime.fromtimestamp(0, pytz.UTC)
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime(value):
+    """
+    Parse a date string with dateutil, treating naive values as UTC.
+    Results are memoized since the same strings recur across feeds and runs.
+    Raises ValueError if the string can't be parsed.
+    """
+    parsed = parser.parse(value, tzinfos=TZINFOS)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=pytz.UTC)
+    return parsed
+
+
+def entry_datetime(entry):
+    """
+    Get the publication time of a feed entry.
+    Uses feedparser's pre-parsed published/updated values when available
+    and only falls back to parsing the raw string otherwise.
+    Returns None if the entry has no date at all.
+    """
+    for key in ('published', 'updated'):
+        parsed = entry.get(f'{key}_parsed')
+        if parsed:
+            return datetime.fromtimestamp(calendar.timegm(parsed), pytz.UTC)
+        value = entry.get(key)
+        if value:
+            return parse_datetime(value)
+    return None
+
+
+def item_datetime(item):
+    """Get the publication time of an archive / JSON Feed item"""
+    timestamp = item.get('timestamp')
+    if timestamp is not None:
+        return datetime.fromtimestamp(timestamp, pytz.UTC)
+    try:
+        return parse_datetime(item.get('date_published') or '')
+    except (ValueError, OverflowError):
+        return EPOCH
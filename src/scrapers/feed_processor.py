@@ -0,0 +1,264 @@
+import logging
+import feedparser
+from .keyword_matcher import KeywordMatcher
+from .dates import entry_datetime
+from .text import html_to_text, split_sentences
+from ..models import Article
+from ..metrics import Metrics
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RawFeed:
+    """A downloaded feed document, waiting to be parsed"""
+    __slots__ = ('content', 'headers', 'validators')
+
+    def __init__(self, content, headers, validators=None):
+        self.content = content
+        self.headers = headers
+        # ETag / Last-Modified of the response, for the conditional GET cache
+        self.validators = validators or {}
+
+    def __len__(self):
+        return len(self.content)
+
+
+class FeedResult:
+    """What processing a feed found: its new articles and the dates the scrape state needs"""
+    __slots__ = ('articles', 'published_times', 'latest', 'new_entries', 'metrics')
+
+    def __init__(self, metrics):
+        self.articles = []
+        # Publication times of the feed's entries, for the poll scheduler
+        self.published_times = []
+        # Latest publication time of any entry, for last_scrape_times
+        self.latest = None
+        self.new_entries = 0
+        self.metrics = metrics
+
+
+class FeedProcessor:
+    """
+    The CPU-bound half of scraping a feed: parsing the downloaded document,
+    extracting the content of each new entry and filtering it by keywords.
+
+    It holds no connections, files or locks, so a copy can be sent to
+    worker processes (see process_in_worker); the scraper runs the same
+    code inline for small feeds.
+    """
+    def __init__(self, ai_keywords=(), keyword_word_boundary=True):
+        self.ai_keywords = [keyword.lower() for keyword in ai_keywords]
+        self.keyword_matcher = KeywordMatcher(self.ai_keywords, word_boundary=keyword_word_boundary)
+
+    def _keyword_text(self, title, description, content):
+        # Markup (link targets, class names) is not part of what an article is about
+        return f"{title}\n{html_to_text(description, separator=' ')}\n{html_to_text(content, separator=' ')}"
+
+    def matched_keywords(self, title, description, content):
+        """Return the AI keywords found in an entry"""
+        return self.keyword_matcher.search(self._keyword_text(title, description, content))
+
+    def is_ai_related(self, title, description, content):
+        """Check if the content is AI-related based on keywords"""
+        return self.keyword_matcher.matches(self._keyword_text(title, description, content))
+
+    def process(self, source, feed_info, feed, last_scrape_time, current_time, metrics=None, page_text=None):
+        """
+        Turn a feed (a RawFeed, or an already parsed feed) into its new
+        articles. Entries published up to last_scrape_time are skipped and
+        undated entries count as published at current_time. page_text(url)
+        fills in entries without content from their pages (OpenAI only).
+        """
+        category = feed_info.get('category', 'default')
+        metrics = metrics or Metrics()
+        result = FeedResult(metrics)
+        if isinstance(feed, RawFeed):
+            with metrics.span('parse', source, category):
+                feed = feedparser.parse(feed.content, response_headers=feed.headers)
+
+        metrics.add('entries', len(feed.entries), source, category)
+        for entry in feed.entries:
+            try:
+                published_at = entry_datetime(entry)
+                if published_at is not None:
+                    result.published_times.append(published_at)
+                else:
+                    published_at = current_time
+
+                # Keep track of latest publication time for this source
+                if result.latest is None or published_at > result.latest:
+                    result.latest = published_at
+
+                # Skip if already processed
+                if last_scrape_time and published_at <= last_scrape_time:
+                    continue
+
+                title = entry.get('title', '')
+                description = entry.get('description', '')
+                content = ''
+                result.new_entries += 1
+                metrics.add('new_entries', 1, source, category)
+
+                with metrics.span('extract', source, category):
+                    # Check if it's a Reddit source
+                    if 'reddit.com' in feed_info['url']:
+                        content = self.extract_reddit_content(entry)
+                    elif 'huggingface.co' in feed_info['url']:
+                        content = self.extract_huggingface_content(entry)
+                    elif 'blog.google' in feed_info['url']:
+                        content = self.extract_google_content(entry)
+                    elif source == 'OpenAI':
+                        content = self.extract_openai_content(entry, page_text)
+                    else:
+                        content = self.extract_default_content(entry)
+
+                # Skip if not AI-related when we have keywords set
+                keywords = []
+                if self.ai_keywords:
+                    with metrics.span('filter', source, category):
+                        keywords = self.matched_keywords(title, description, content)
+                    if not keywords:
+                        continue
+                    logger.debug(f"{source}: '{title}' matched {keywords}")
+
+                # Create article structure
+                article = Article(
+                    url=entry.link,
+                    title=title,
+                    source=source,
+                    published=published_at,
+                    category=category,
+                    author=entry.get('author', ''),
+                    description=description,
+                    content=content,
+                    keywords=keywords
+                )
+
+                result.articles.append(article)
+                metrics.add('articles', 1, source, category)
+            except Exception as e:
+                logger.error(f"Error processing entry from {source}: {str(e)}")
+                metrics.add('errors', 1, source, category)
+                continue
+        return result
+
+    def extract_openai_content(self, entry, page_text=None):
+        """Extract content from OpenAI blog entries"""
+        content = ''
+
+        # Use description if available
+        if hasattr(entry, 'description') and entry.description:
+            content = entry.description
+
+        # Try to get summary or content
+        elif hasattr(entry, 'summary') and entry.summary:
+            content = entry.summary
+        elif hasattr(entry, 'content') and entry.content:
+            if isinstance(entry.content, list):
+                for content_item in entry.content:
+                    if 'value' in content_item:
+                        content += content_item['value'] + ' '
+            else:
+                content = str(entry.content)
+
+        # If we have a link but no content, use the text of the page
+        # (usually already in the page cache, see RSSFeedScraper.prefetch_pages)
+        if not content and page_text is not None and hasattr(entry, 'link') and entry.link:
+            try:
+                content = page_text(entry.link)
+            except Exception as e:
+                logger.warning(f"Error scraping OpenAI content: {str(e)}")
+
+        return content
+
+    def extract_huggingface_content(self, entry):
+        """Extract content from Hugging Face blog entries"""
+        content = ''
+
+        # Check for content in the entry
+        if hasattr(entry, 'content') and entry.content:
+            if isinstance(entry.content, list):
+                for content_item in entry.content:
+                    if 'value' in content_item:
+                        content += content_item['value'] + ' '
+            else:
+                content = str(entry.content)
+        elif hasattr(entry, 'summary') and entry.summary:
+            content = entry.summary
+        elif hasattr(entry, 'description') and entry.description:
+            content = entry.description
+
+        return content
+
+    def extract_google_content(self, entry):
+        """Extract content from Google blog entries"""
+        content = ''
+
+        if hasattr(entry, 'content') and entry.content:
+            if isinstance(entry.content, list):
+                for content_item in entry.content:
+                    if 'value' in content_item:
+                        content += content_item['value'] + ' '
+            else:
+                content = str(entry.content)
+        elif hasattr(entry, 'summary') and entry.summary:
+            content = entry.summary
+        elif hasattr(entry, 'description') and entry.description:
+            content = entry.description
+
+        return content
+
+    def extract_default_content(self, entry):
+        """Default content extraction for generic RSS feeds"""
+        content = ''
+
+        # Try to get content
+        if hasattr(entry, 'content') and entry.content:
+            if isinstance(entry.content, list):
+                for content_item in entry.content:
+                    if 'value' in content_item:
+                        content += content_item['value'] + ' '
+            else:
+                content = str(entry.content)
+        # Try to get summary
+        elif hasattr(entry, 'summary') and entry.summary:
+            content = entry.summary
+        # Fall back to description
+        elif hasattr(entry, 'description') and entry.description:
+            content = entry.description
+
+        return content
+
+    def extract_reddit_content(self, entry):
+        """Extract only the first 2-3 sentences from Reddit content"""
+        # Get full content first
+        content = self.extract_default_content(entry)
+
+        # Remove HTML tags if present, stopping once the sentences we keep are parsed
+        if content:
+            content = html_to_text(content, max_sentences=3)
+
+        # Split into sentences (simple approach: split on ., ! or ?)
+        # and take the first 2-3 (or fewer if there aren't that many)
+        sentences = split_sentences(content, limit=3)
+        if sentences:
+            truncated_content = ' '.join(sentences)
+            return f"{truncated_content}... [See full post on Reddit]"
+
+        return content
+
+
+# The processor of a worker process, installed once by init_worker
+_worker_processor = None
+
+
+def init_worker(processor):
+    """ProcessPoolExecutor initializer: keep the processor for every task the worker runs"""
+    global _worker_processor
+    _worker_processor = processor
+
+
+def process_in_worker(source, feed_info, feed, last_scrape_time, current_time):
+    """Process a feed in a worker process; the result (with its metrics) is sent back"""
+    return _worker_processor.process(source, feed_info, feed, last_scrape_time, current_time)
@@ -0,0 +1,163 @@
+import logging
+import xml.parsers.expat
+from datetime import timedelta
+from .dates import parse_datetime
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Entry elements of RSS / RDF and Atom feeds
+ENTRY_TAGS = frozenset(('item', 'entry'))
+# Date elements of an entry, by local name, in the order feedparser prefers them
+# (publication dates first, then modification dates such as dc:date)
+PUBLISHED_TAGS = ('pubDate', 'published', 'issued')
+UPDATED_TAGS = ('updated', 'modified', 'date')
+
+
+class _EntryScanner:
+    """
+    Tracks the entries of a feed document as expat streams through it,
+    recording where each one ends and when it was published
+    """
+    def __init__(self, watermark, confirm, tolerance, end_offset):
+        self.watermark = watermark
+        self.cutoff = watermark - timedelta(seconds=tolerance)
+        # Called at the end of an entry for the offset just past its end tag
+        self.end_offset = end_offset
+        self.confirm = confirm
+        self.stack = []
+        # Byte offset just past the last entry scanned, and the elements still open there
+        self.cut = None
+        self.cut_stack = None
+        # Consecutive entries older than the cutoff, each no newer than the one before
+        self.old_entries = 0
+        # Publication time of the previous dated entry, and whether an old one was seen
+        self.previous = None
+        self.seen_old = False
+        # done: the rest of the document only holds old entries;
+        # unordered: the entries aren't newest first, so the rest can't be skipped
+        self.done = False
+        self.unordered = False
+        self._entry_depth = None
+        self._dates = {}
+        self._text = None
+
+    @property
+    def stopped(self):
+        return self.done or self.unordered
+
+    def start(self, name, attrs):
+        if self.stopped:
+            return
+        local = name.rpartition(':')[2]
+        depth = len(self.stack)
+        self.stack.append(name)
+        if self._entry_depth is None:
+            if local in ENTRY_TAGS:
+                self._entry_depth = depth
+                self._dates = {}
+        elif depth == self._entry_depth + 1 and (local in PUBLISHED_TAGS or local in UPDATED_TAGS):
+            self._text = []
+
+    def data(self, text):
+        if self._text is not None:
+            self._text.append(text)
+
+    def end(self, name):
+        if self.stopped:
+            return
+        self.stack.pop()
+        if self._entry_depth is None:
+            return
+        if self._text is not None and len(self.stack) == self._entry_depth + 1:
+            self._dates.setdefault(name.rpartition(':')[2], ''.join(self._text).strip())
+            self._text = None
+        elif len(self.stack) == self._entry_depth:
+            self._entry_depth = None
+            self._end_entry()
+
+    def _entry_date(self):
+        for tags in (PUBLISHED_TAGS, UPDATED_TAGS):
+            for tag in tags:
+                if self._dates.get(tag):
+                    return parse_datetime(self._dates[tag])
+        return None
+
+    def _end_entry(self):
+        self.cut = self.end_offset()
+        self.cut_stack = list(self.stack)
+        try:
+            published = self._entry_date()
+        except Exception:
+            published = None
+        # Undated entries say nothing about where the new entries end
+        if published is None:
+            return
+        descending = self.previous is None or published <= self.previous
+        self.previous = published
+        if published <= self.cutoff:
+            # Old entries only count towards the cut while they run newest first
+            self.old_entries = self.old_entries + 1 if descending else 1
+            self.seen_old = True
+            self.done = self.old_entries >= self.confirm
+        elif published > self.watermark and self.seen_old:
+            # A new entry after an old one: the feed isn't listed newest first
+            self.unordered = True
+        else:
+            self.old_entries = 0
+
+
+def read_new_entries(chunks, watermark, confirm=2, tolerance=86400):
+    """
+    Read a feed document from an iterable of byte chunks, stopping early
+    when the rest can only hold entries that were already scraped.
+
+    Entries are scanned as they arrive with expat (without building a tree).
+    Reading stops once `confirm` consecutive dated entries, newest first,
+    were published more than `tolerance` seconds before the watermark, so
+    a feed with nothing new is cut after its first few entries. The margin
+    (a day by default) covers feeds that stamp local times with the wrong
+    time zone. An entry newer than the watermark after an old one (a feed
+    in another order, or pinned posts on top), or a document expat can't
+    read, means the whole document is read. Feeds ranked by score should
+    not be streamed at all (see RANKED_FEED_HOSTS in rss_scraper). Undated
+    entries are kept when they come before the cut and dropped after it.
+
+    Returns (data, complete): data is either the whole document or the part
+    up to the last scanned entry with the open elements closed again, so a
+    full parser sees a well-formed feed holding only the entries that
+    matter.
+    """
+    buffer = bytearray()
+    iterator = iter(chunks)
+    parser = xml.parsers.expat.ParserCreate()
+    scanner = _EntryScanner(watermark, confirm, tolerance, lambda: _end_of_tag(buffer, parser.CurrentByteIndex))
+    # Treat HTML entities such as &nbsp; as declared by an unknown DTD instead of errors
+    parser.UseForeignDTD(True)
+    parser.SkippedEntityHandler = lambda name, is_parameter_entity: None
+    parser.StartElementHandler = scanner.start
+    parser.CharacterDataHandler = scanner.data
+    parser.EndElementHandler = scanner.end
+
+    try:
+        for chunk in iterator:
+            buffer += chunk
+            parser.Parse(chunk, False)
+            if scanner.stopped:
+                break
+    except xml.parsers.expat.ExpatError as e:
+        logger.debug(f"Streaming scan stopped ({e}), reading the whole feed")
+        scanner.unordered = True
+
+    if not scanner.done or scanner.unordered:
+        for chunk in iterator:
+            buffer += chunk
+        return bytes(buffer), True
+
+    closing = ''.join(f'</{name}>' for name in reversed(scanner.cut_stack)).encode('utf-8')
+    return bytes(buffer[:scanner.cut]) + closing, False
+
+
+def _end_of_tag(buffer, offset):
+    """Offset just past the tag starting at `offset` (an end tag or an empty element)"""
+    return buffer.index(b'>', offset) + 1
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import html
+import hashlib
+import logging
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+from ..output import OutputWriter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Characters that are not allowed anywhere in an XML 1.0 document
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _xml_text(value):
+    return escape(INVALID_XML_CHARS.sub('', value or ''))
+
+
+def _xml_attr(value):
+    return quoteattr(INVALID_XML_CHARS.sub('', value or ''))
+
+
+class FeedWriter:
+    """
+    Writes RSS, Atom and JSON Feed files from a single normalized
+    representation of each article.
+
+    Every article is serialized once into an RSS item, an Atom entry and a
+    JSON Feed item. The fragments are cached by a hash of the article's
+    content, both within a run (an article appears in its category feed
+    and in 'all') and across runs, so unchanged articles are never
+    re-serialized; each feed file is just its header plus the fragments.
+    """
+    CACHE_FILENAME = 'feed_fragments.json'
+    # Bump when the fragment markup changes to invalidate cached fragments
+    FRAGMENT_VERSION = 1
+
+    def __init__(self, output_dir, cache_dir=None, base_url='https://your-github-pages-url', output=None):
+        self.output_dir = output_dir
+        self.output = output or OutputWriter(output_dir)
+        self.base_url = base_url
+        self.cache_path = os.path.join(cache_dir or output_dir, self.CACHE_FILENAME)
+        self.cache = self._load_cache()
+        self.used = {}
+        self.stats = {'serialized': 0, 'cached': 0}
+        self._by_article = {}
+
+    def _load_cache(self):
+        """Load the fragments serialized by previous runs"""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get('version') == self.FRAGMENT_VERSION:
+                    return cache.get('fragments', {})
+        except Exception as e:
+            logger.error(f"Error loading feed fragment cache: {str(e)}")
+        return {}
+
+    def reset(self):
+        """
+        Start a new run in a long-lived process: the fragments used so far
+        become the cache and the per-run bookkeeping is cleared
+        """
+        if self.used:
+            self.cache = self.used
+        self.used = {}
+        self._by_article = {}
+        self.stats = {'serialized': 0, 'cached': 0}
+
+    def save(self):
+        """Persist the fragments used in this run, dropping everything else"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.FRAGMENT_VERSION, 'fragments': self.used}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error saving feed fragment cache: {str(e)}")
+
+    @staticmethod
+    def normalize(article):
+        """Reduce an article to the fields every feed format needs"""
+        published = article.published
+        content = article.content
+        if article.related:
+            # Link the other sources that reported the same story
+            links = ', '.join(
+                f'<a href="{html.escape(link["url"])}">{html.escape(link["source"])}</a>'
+                for link in article.related
+            )
+            content = f'{content}<p>Also covered by: {links}</p>'
+        return {
+            'id': article.url,
+            'url': article.url,
+            'title': article.title,
+            'summary': article.summary,
+            'content': content,
+            'author': article.author,
+            'published': published.isoformat(),
+            'published_rfc822': format_datetime(published),
+        }
+
+    def fragments(self, article):
+        """Get the serialized RSS / Atom / JSON fragments of an article"""
+        cached = self._by_article.get(id(article))
+        if cached is not None:
+            return cached
+
+        item = self.normalize(article)
+        key = hashlib.sha1(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
+        fragments = self.cache.get(key)
+        if fragments is None:
+            fragments = self._serialize(item)
+            self.stats['serialized'] += 1
+        else:
+            self.stats['cached'] += 1
+
+        self.used[key] = fragments
+        self._by_article[id(article)] = fragments
+        return fragments
+
+    @staticmethod
+    def _serialize(item):
+        """Render one normalized article in all three formats"""
+        author_xml = f"<author><name>{_xml_text(item['author'])}</name></author>" if item['author'] else ''
+        rss = (
+            f"<item><title>{_xml_text(item['title'])}</title>"
+            f"<link>{_xml_text(item['url'])}</link>"
+            f"<description>{_xml_text(item['summary'])}</description>"
+            f"<content:encoded>{_xml_text(item['content'])}</content:encoded>"
+            f"<guid>{_xml_text(item['id'])}</guid>"
+            f"<pubDate>{item['published_rfc822']}</pubDate></item>"
+        )
+        atom = (
+            f"<entry><id>{_xml_text(item['id'])}</id>"
+            f"<title>{_xml_text(item['title'])}</title>"
+            f"<updated>{item['published']}</updated>"
+            f"{author_xml}"
+            f"<content type=\"html\">{_xml_text(item['content'])}</content>"
+            f"<link href={_xml_attr(item['url'])} rel=\"alternate\"/>"
+            f"<summary>{_xml_text(item['summary'])}</summary>"
+            f"<published>{item['published']}</published></entry>"
+        )
+        json_item = json.dumps({
+            "id": item['id'],
+            "url": item['url'],
+            "title": item['title'],
+            "content_html": item['content'],
+            "summary": item['summary'],
+            "date_published": item['published'],
+            "author": {"name": item['author']} if item['author'] else None
+        }, ensure_ascii=False, indent=2)
+        return {'rss': rss, 'atom': atom, 'json': json_item}
+
+    def write(self, category, articles):
+        """Write {category}.xml, .atom and .json from articles sorted newest first"""
+        fragments = [self.fragments(article) for article in articles]
+        title = f'AI Daily Digest - {category.replace("_", " ").title()}'
+        description = f'Latest AI news and updates from {category.replace("_", " ")} sources'
+        # Use the newest article as the feed's timestamp so unchanged feeds render identically
+        newest = articles[0].published if articles else None
+
+        self._write(f'{category}.xml', self._rss_document(category, title, description, newest, fragments))
+        self._write(f'{category}.atom', self._atom_document(category, title, description, newest, fragments))
+        self._write(f'{category}.json', self._json_document(category, title, description, fragments))
+
+    def _rss_document(self, category, title, description, newest, fragments):
+        feed_url = f'{self.base_url}/{category}.xml'
+        yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+        yield (
+            '<rss xmlns:atom="http://www.w3.org/2005/Atom" '
+            'xmlns:content="http://purl.org/rss/1.0/modules/content/" version="2.0"><channel>'
+            f'<title>{_xml_text(title)}</title><link>{_xml_text(feed_url)}</link>'
+            f'<description>{_xml_text(description)}</description>'
+            f'<atom:link href={_xml_attr(feed_url)} rel="self"/>'
+            '<docs>http://www.rssboard.org/rss-specification</docs><language>en</language>'
+        )
+        if newest:
+            yield f'<lastBuildDate>{format_datetime(newest)}</lastBuildDate>'
+        for fragment in fragments:
+            yield fragment['rss']
+        yield '</channel></rss>\n'
+
+    def _atom_document(self, category, title, description, newest, fragments):
+        yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+        yield (
+            '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en">'
+            f'<id>{_xml_text(f"{self.base_url}/{category}")}</id><title>{_xml_text(title)}</title>'
+        )
+        if newest:
+            yield f'<updated>{newest.isoformat()}</updated>'
+        yield (
+            f'<link href={_xml_attr(f"{self.base_url}/{category}.atom")} rel="self"/>'
+            f'<subtitle>{_xml_text(description)}</subtitle>'
+        )
+        for fragment in fragments:
+            yield fragment['atom']
+        yield '</feed>\n'
+
+    def _json_document(self, category, title, description, fragments):
+        """JSON Feed laid out exactly as json.dump(..., indent=2) would write it"""
+        header = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": title,
+            "home_page_url": f"{self.base_url}/",
+            "feed_url": f"{self.base_url}/{category}.json",
+            "description": description,
+        }
+        yield '{\n'
+        for key, value in header.items():
+            yield f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n'
+        if not fragments:
+            yield '  "items": []\n}'
+            return
+        yield '  "items": ['
+        for index, fragment in enumerate(fragments):
+            item = fragment['json'].replace('\n', '\n    ')
+            yield f'{"," if index else ""}\n    {item}'
+        yield '\n  ]\n}'
+
+    def _write(self, filename, chunks):
+        self.output.write_chunks(filename, chunks)
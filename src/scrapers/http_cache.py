@@ -0,0 +1,81 @@
+import os
+import json
+import logging
+import threading
+from ..output import OutputWriter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ConditionalGetCache:
+    """
+    Stores ETag / Last-Modified validators for each feed URL so unchanged
+    feeds can be requested conditionally and answered with a 304.
+    """
+    FILENAME = 'http_cache.json'
+
+    def __init__(self, output_dir, output=None):
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.output = output or OutputWriter(output_dir)
+        self.entries = self._load()
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the stored validators from a JSON file"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading HTTP cache: {str(e)}")
+        return {}
+
+    def save(self):
+        """Save the validators to a JSON file"""
+        try:
+            self.output.write_json(self.FILENAME, self.entries, publish=False, indent=2, sort_keys=True)
+        except Exception as e:
+            logger.error(f"Error saving HTTP cache: {str(e)}")
+
+    def reset_stats(self):
+        """Start counting hits and misses for a new run"""
+        with self._lock:
+            self.stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+
+    def clear(self):
+        """Forget all validators so the next fetch downloads every feed in full"""
+        with self._lock:
+            self.entries = {}
+
+    def request_headers(self, url):
+        """Build the conditional request headers for a URL"""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self, url):
+        """Count a 304 response, crediting the size of the body we didn't download"""
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += self.entries.get(url, {}).get('size', 0)
+
+    def record_response(self, url, headers, size):
+        """Remember the validators of a full response"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self.stats['misses'] += 1
+            if etag or last_modified:
+                self.entries[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'size': size,
+                }
+            else:
+                self.entries.pop(url, None)
@@ -0,0 +1,146 @@
+import time
+import logging
+import threading
+import importlib.util
+import urllib.parse
+from contextlib import contextmanager
+import httpx
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'AI-Daily-Digest/0.1 (+https://github.com/YiranH/daily_digest)'
+
+
+class HostLimiter:
+    """Caps concurrent connections and spaces out request starts for a single host"""
+    def __init__(self, max_connections, rate_limit=None):
+        self.semaphore = threading.BoundedSemaphore(max_connections)
+        self.interval = 1.0 / rate_limit if rate_limit else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Hold back further requests to this host, e.g. after a 429"""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.next_slot - now)
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+
+class HttpClient:
+    """
+    Shared keep-alive HTTP client used for every scraper fetch.
+    Connections are pooled across feeds, and each host gets its own
+    connection cap and request rate so feeds on the same site
+    (e.g. several Reddit feeds) don't trip its rate limiting.
+    """
+    def __init__(self, timeout=30, connect_timeout=10, max_connections=20,
+                 per_host_connections=4, default_rate_limit=None, host_rate_limits=None,
+                 http2=False, user_agent=DEFAULT_USER_AGENT, max_retry_wait=10):
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+            http2 = False
+
+        self.per_host_connections = max(1, per_host_connections)
+        self.default_rate_limit = default_rate_limit
+        self.host_rate_limits = host_rate_limits or {}
+        self.max_retry_wait = max_retry_wait
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        self._client = httpx.Client(
+            http2=http2,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            headers={'User-Agent': user_agent},
+            follow_redirects=True,
+        )
+
+    def _limiter(self, url):
+        """Get or create the limiter for the host of a URL"""
+        host = urllib.parse.urlsplit(url).hostname or ''
+        with self._hosts_lock:
+            if host not in self._hosts:
+                rate_limit = self.host_rate_limits.get(host, self.default_rate_limit)
+                self._hosts[host] = HostLimiter(self.per_host_connections, rate_limit)
+            return self._hosts[host]
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        GET a URL through the shared pool.
+        A 429/503 carrying a short Retry-After pauses the host and retries once.
+        """
+        limiter = self._limiter(url)
+        kwargs = {'headers': headers}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        for attempt in range(2):
+            with limiter:
+                response = self._client.get(url, **kwargs)
+
+            if response.status_code not in (429, 503) or attempt:
+                return response
+
+            retry_after = self._retry_after(response)
+            if retry_after is None or retry_after > self.max_retry_wait:
+                return response
+            logger.warning(f"{response.status_code} from {url}, retrying in {retry_after}s")
+            limiter.pause(retry_after)
+
+        return response
+
+    @contextmanager
+    def stream(self, url, headers=None, timeout=None):
+        """
+        Like get(), but the body is left to the caller to read from
+        response.iter_bytes(), and may be abandoned part way through
+        """
+        limiter = self._limiter(url)
+        kwargs = {'headers': headers}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        for attempt in range(2):
+            with limiter:
+                with self._client.stream('GET', url, **kwargs) as response:
+                    retry_after = None
+                    if response.status_code in (429, 503) and not attempt:
+                        retry_after = self._retry_after(response)
+                    if retry_after is None or retry_after > self.max_retry_wait:
+                        yield response
+                        return
+            logger.warning(f"{response.status_code} from {url}, retrying in {retry_after}s")
+            limiter.pause(retry_after)
+
+    @staticmethod
+    def _retry_after(response):
+        """Parse a Retry-After header given in seconds"""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', '')))
+        except ValueError:
+            return None
+
+    def close(self):
+        """Close all pooled connections"""
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,94 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher backed by an Aho-Corasick automaton.
+    The automaton is compiled once from the keyword list and finds every
+    keyword in a single pass over the text, however many keywords there are.
+
+    With word_boundary enabled a keyword only counts when it stands as a
+    whole word (a trailing plural "s" is allowed), so 'ai' matches "AI" and
+    "AI-powered" but not "said" or "maintain".
+    """
+    def __init__(self, keywords, word_boundary=True):
+        self.keywords = list(dict.fromkeys(k.strip().lower() for k in keywords if k and k.strip()))
+        self.word_boundary = word_boundary
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, keyword in enumerate(self.keywords):
+            self._add(keyword, index)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _add(self, keyword, index):
+        """Insert a keyword into the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state] += (index,)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit the matches of the suffix state
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def _is_whole_word(self, text, start, end):
+        """Check that text[start:end] is not embedded in a longer word"""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if end < len(text) and text[end].isalnum():
+            # Allow a simple plural, e.g. 'llm' in "LLMs"
+            if text[end] != 's' or (end + 1 < len(text) and text[end + 1].isalnum()):
+                return False
+        return True
+
+    def _iter_matches(self, text):
+        """Yield the index of every keyword occurrence in the text"""
+        if not self.keywords or not text:
+            return
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        keywords = self.keywords
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = position + 1
+            for index in out[state]:
+                if self.word_boundary and not self._is_whole_word(text, end - len(keywords[index]), end):
+                    continue
+                yield index
+
+    def matches(self, text):
+        """Return True as soon as any keyword is found"""
+        for _ in self._iter_matches(text):
+            return True
+        return False
+
+    def search(self, text):
+        """Return every keyword found in the text, in keyword list order"""
+        found = set(self._iter_matches(text))
+        return [keyword for index, keyword in enumerate(self.keywords) if index in found]
@@ -0,0 +1,115 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+import pytz
+from .dates import parse_datetime
+from ..output import OutputWriter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    Text extracted from article pages, keyed by URL, with the page's
+    ETag / Last-Modified validators.
+
+    A page checked within `max_age` seconds is served from the cache without
+    a request; an older one is revalidated with a conditional GET, and a 304
+    keeps the cached text. Only the extracted text is stored, not the page.
+    Entries that no run has asked for in `ttl` seconds are dropped on save.
+    """
+    FILENAME = 'page_cache.json'
+
+    def __init__(self, output_dir, output=None, max_age=7 * 86400, ttl=90 * 86400):
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.output = output or OutputWriter(output_dir)
+        self.max_age = max_age
+        self.ttl = ttl
+        self.entries = self._load()
+        self.stats = {'hits': 0, 'revalidated': 0, 'downloaded': 0}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the cached pages from a JSON file"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading page cache: {str(e)}")
+        return {}
+
+    def save(self, now=None):
+        """Save the cached pages to a JSON file, evicting the ones unused for longer than the TTL"""
+        now = now or datetime.now(pytz.UTC)
+        cutoff = (now - timedelta(seconds=self.ttl)).isoformat()
+        with self._lock:
+            # Timestamps are all ISO strings in UTC, so they compare as strings
+            self.entries = {url: entry for url, entry in self.entries.items() if entry.get('used', '') >= cutoff}
+        try:
+            self.output.write_json(self.FILENAME, self.entries, publish=False, indent=2, sort_keys=True)
+        except Exception as e:
+            logger.error(f"Error saving page cache: {str(e)}")
+
+    def reset_stats(self):
+        """Start counting for a new run"""
+        with self._lock:
+            self.stats = {'hits': 0, 'revalidated': 0, 'downloaded': 0}
+
+    def get(self, url, now=None):
+        """The cached text of a page checked within max_age, or None"""
+        now = now or datetime.now(pytz.UTC)
+        with self._lock:
+            if not self.is_fresh(url, now):
+                return None
+            entry = self.entries[url]
+            entry['used'] = now.isoformat()
+            self.stats['hits'] += 1
+            return entry['text']
+
+    def is_fresh(self, url, now=None):
+        """Whether the page was checked within max_age (without counting it as used)"""
+        entry = self.entries.get(url)
+        if entry is None:
+            return False
+        try:
+            return ((now or datetime.now(pytz.UTC)) - parse_datetime(entry['checked'])).total_seconds() <= self.max_age
+        except Exception:
+            return False
+
+    def request_headers(self, url):
+        """Build the conditional request headers for revalidating a page"""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self, url, now=None):
+        """The page is unchanged: keep its text for another max_age and return it (None if not cached)"""
+        now = (now or datetime.now(pytz.UTC)).isoformat()
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            entry['checked'] = entry['used'] = now
+            self.stats['revalidated'] += 1
+            return entry['text']
+
+    def store(self, url, headers, text, now=None):
+        """Remember the text extracted from a downloaded page"""
+        now = (now or datetime.now(pytz.UTC)).isoformat()
+        with self._lock:
+            self.entries[url] = {
+                'text': text,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'checked': now,
+                'used': now,
+            }
+            self.stats['downloaded'] += 1
@@ -3,29 +3,35 @@
 import logging
 import feedparser
 from datetime import datetime, timedelta
-from dateutil import parser
 import pytz
-import requests
 from bs4 import BeautifulSoup
 import urllib.parse
 import re
-from feedgen.feed import FeedGenerator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from .base_scraper import BaseScraper
+from .http_cache import ConditionalGetCache
+from .page_cache import PageCache
+from .feed_stream import read_new_entries
+from .http_client import HttpClient
+from .feed_processor import FeedProcessor, RawFeed, init_worker, process_in_worker
+from .dates import parse_datetime, entry_datetime
+from .feed_writer import FeedWriter
+from .text import extract_page_text, PAGE_PARSER
+from ..output import OutputWriter
+from ..dedup import fingerprint_text
+from ..metrics import Metrics
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Define timezone information to resolve ambiguous timezone abbreviations
-TZINFOS = {
-    'EST': -18000,  # UTC-5:00 (Eastern Standard Time)
-    'EDT': -14400,  # UTC-4:00 (Eastern Daylight Time)
-    'CST': -21600,  # UTC-6:00 (Central Standard Time)
-    'CDT': -18000,  # UTC-5:00 (Central Daylight Time)
-    'MST': -25200,  # UTC-7:00 (Mountain Standard Time)
-    'MDT': -21600,  # UTC-6:00 (Mountain Daylight Time)
-    'PST': -28800,  # UTC-8:00 (Pacific Standard Time)
-    'PDT': -25200,  # UTC-7:00 (Pacific Daylight Time)
-}
+# Returned by fetch_feed when the server answered 304 Not Modified
+NOT_MODIFIED = object()
+# Stands in for feeds the poll scheduler decided not to fetch on this run
+NOT_DUE = object()
+# Bytes read at a time from a feed response
+STREAM_CHUNK_SIZE = 64 * 1024
+# Feeds ordered by rank rather than date, which are always read in full
+RANKED_FEED_HOSTS = ('reddit.com', 'news.ycombinator.com')
 
 class FeedParserDict:
     """A helper class to mimic feedparser's attribute/dictionary access pattern"""
@@ -42,24 +48,58 @@ def get(self, key, default=None):
         return self.data.get(key, default)
 
 class RSSFeedScraper(BaseScraper):
-    def __init__(self, db_session=None, feed_urls=None, output_dir='feeds', ai_keywords=[]):
+    def __init__(self, db_session=None, feed_urls=None, output_dir='feeds', ai_keywords=[], max_workers=8,
+                 http_client=None, keyword_word_boundary=True, cache_dir=None, output=None, metrics=None,
+                 duplicates=None, scheduler=None, page_cache=None, parse_workers=0, inline_max_bytes=32 * 1024,
+                 force_refresh=False):
         super().__init__(db_session or None)
         self.feed_urls = feed_urls or {}
         self.output_dir = output_dir
-        self.ai_keywords = ai_keywords
+        self.keyword_word_boundary = keyword_word_boundary
+        self.set_ai_keywords(ai_keywords)
+        self.max_workers = max(1, max_workers)
+        # Feeds larger than inline_max_bytes are parsed in a pool of parse_workers
+        # processes; with fewer than two workers everything is parsed inline
+        self.parse_workers = parse_workers
+        self.inline_max_bytes = inline_max_bytes
+        # Ignore every watermark (stored scrape times and the poll schedule's history)
+        self.force_refresh = force_refresh
         self.timezone = pytz.UTC
         self.last_scrape_times = self._load_last_scrape_times()
+        # Every published file goes through one writer so unchanged outputs are left alone
+        self.output = output or OutputWriter(self.output_dir)
+        self.http_cache = ConditionalGetCache(self.output_dir, output=self.output)
+        # Text of article pages fetched for entries that carry no content (OpenAI)
+        self.page_cache = page_cache or PageCache(self.output_dir, output=self.output)
+        self._owns_http_client = http_client is None
+        self.http = http_client or HttpClient()
+        self.metrics = metrics or Metrics()
+        # Optional NearDuplicateIndex used to collapse the same story from several sources
+        self.duplicates = duplicates
+        # Optional PollScheduler; without one every feed is fetched on every run
+        self.scheduler = scheduler
+        self.feed_writer = FeedWriter(self.output_dir, cache_dir=cache_dir, output=self.output)
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
+    def close(self):
+        """Release the HTTP connection pool if this scraper created it"""
+        if self._owns_http_client:
+            self.http.close()
+        
     def set_ai_keywords(self, keywords):
-        self.ai_keywords = [keyword.lower() for keyword in keywords]
+        # Parsing, extraction and keyword filtering live in the processor so they can run in other processes
+        self.processor = FeedProcessor(keywords, keyword_word_boundary=self.keyword_word_boundary)
+        self.ai_keywords = self.processor.ai_keywords
+
+    def matched_keywords(self, title, description, content):
+        """Return the AI keywords found in an entry"""
+        return self.processor.matched_keywords(title, description, content)
 
     def is_ai_related(self, title, description, content):
         """Check if the content is AI-related based on keywords"""
-        text = f"{title} {description} {content}".lower()
-        return any(keyword in text for keyword in self.ai_keywords)
+        return self.processor.is_ai_related(title, description, content)
         
     def _load_last_scrape_times(self):
         """Load the last scrape times from a JSON file"""
@@ -74,23 +114,52 @@ def _load_last_scrape_times(self):
     def _save_last_scrape_times(self):
         """Save the last scrape times to a JSON file"""
         try:
-            with open(os.path.join(self.output_dir, 'last_scrape_times.json'), 'w') as f:
-                json.dump(self.last_scrape_times, f)
+            self.output.write_json('last_scrape_times.json', self.last_scrape_times, publish=False)
         except Exception as e:
             logger.error(f"Error saving last scrape times: {str(e)}")
             
+    def save_state(self):
+        """Save last scrape times, HTTP validators, cached article pages and the poll schedule"""
+        self._save_last_scrape_times()
+        self.http_cache.save()
+        self.page_cache.save()
+        if self.scheduler is not None:
+            self.scheduler.save()
+            
     def get_last_scrape_time(self, source):
         """Get the timestamp of the most recent article for a given source"""
+        if self.force_refresh:
+            return self._default_scrape_time()
+        
         if source in self.last_scrape_times:
             try:
-                return parser.parse(self.last_scrape_times[source], tzinfos=TZINFOS)
+                return parse_datetime(self.last_scrape_times[source])
             except:
                 pass
+        
+        # The schedule can skip a feed for longer than the default lookback,
+        # so fall back to the newest entry seen on its last successful poll
+        if self.scheduler is not None:
+            latest = self.scheduler.latest_published(source)
+            if latest is not None:
+                return latest
                 
-        default_time = datetime.now(self.timezone).replace(
+        return self._default_scrape_time()
+    
+    def _default_scrape_time(self):
+        """How far back to look for a source without a watermark: two days before midnight"""
+        return datetime.now(self.timezone).replace(
             hour=0, minute=0, second=0, microsecond=0
         ) - timedelta(days=2)
-        return default_time
+
+    def _known_publication_times(self, source):
+        """The source's latest article time from last_scrape_times, if it has one"""
+        if source in self.last_scrape_times:
+            try:
+                return [parse_datetime(self.last_scrape_times[source])]
+            except Exception:
+                pass
+        return []
 
     def fetch_openai_feed(self, url):
         """
@@ -100,7 +169,7 @@ def fetch_openai_feed(self, url):
         """
         try:
             # First try: direct access
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 return feedparser.parse(response.content)
         except Exception as e:
@@ -113,12 +182,12 @@ def fetch_openai_feed(self, url):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self.http.get(search_url, headers=headers, timeout=15)
             if response.status_code != 200:
                 return None
                 
-            # Parse the search results using html5lib
-            soup = BeautifulSoup(response.text, 'html5lib')
+            # Parse the search results with the fastest available parser
+            soup = BeautifulSoup(response.text, PAGE_PARSER)
             
             # Create the feed structure
             feed = FeedParserDict({
@@ -149,10 +218,12 @@ def fetch_openai_feed(self, url):
                         
                     processed_links.add(href)
                     
-                    # Get text or try to find a heading nearby
+                    # Get text or try to find a heading inside the link, then nearby
                     text = link.get_text().strip()
-                    parent = link.parent
-                    heading = parent.find_previous(['h2', 'h3']) or parent.find_next(['h2', 'h3'])
+                    heading = link.find(['h2', 'h3'])
+                    if heading is None:
+                        parent = link.parent
+                        heading = parent.find_previous(['h2', 'h3']) or parent.find_next(['h2', 'h3'])
                     title = heading.get_text().strip() if heading else text or "OpenAI Blog Post"
                     
                     entry = FeedParserDict({
@@ -172,128 +243,241 @@ def fetch_openai_feed(self, url):
             logger.error(f"OpenAI feed fallback failed: {str(e)}")
             return None
 
-    def extract_openai_content(self, entry):
-        """Extract content from OpenAI blog entries"""
-        content = ''
+    def fetch_page_text(self, url):
+        """Main text of an article page, downloaded and parsed only when the page cache can't answer"""
+        text = self.page_cache.get(url)
+        if text is not None:
+            return text
         
-        # Use description if available
-        if hasattr(entry, 'description') and entry.description:
-            content = entry.description
-            
-        # Try to get summary or content
-        elif hasattr(entry, 'summary') and entry.summary:
-            content = entry.summary
-        elif hasattr(entry, 'content') and entry.content:
-            if isinstance(entry.content, list):
-                for content_item in entry.content:
-                    if 'value' in content_item:
-                        content += content_item['value'] + ' '
-            else:
-                content = str(entry.content)
-                
-        # If we have a link but no content, try to scrape the page
-        if not content and hasattr(entry, 'link') and entry.link:
-            try:
-                response = requests.get(entry.link, timeout=10)
-                if response.status_code == 200:
-                    # Use html5lib instead of lxml
-                    soup = BeautifulSoup(response.text, 'html5lib')
-                    article = soup.find('article') or soup.find('main') or soup.find('div', class_='content')
-                    if article:
-                        content = article.get_text(strip=True)
-                    else:
-                        # Try to get the first few paragraphs
-                        paragraphs = soup.find_all('p', limit=5)
-                        content = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            except Exception as e:
-                logger.warning(f"Error scraping OpenAI content: {str(e)}")
-                
-        return content
+        response = self.http.get(url, headers=self.page_cache.request_headers(url), timeout=10)
+        if response.status_code == 304:
+            text = self.page_cache.record_not_modified(url)
+            if text is not None:
+                return text
+            response = self.http.get(url, timeout=10)
+        if response.status_code != 200:
+            return ''
+        text = extract_page_text(response.text)
+        self.page_cache.store(url, response.headers, text)
+        return text
 
-    def extract_huggingface_content(self, entry):
-        """Extract content from Hugging Face blog entries"""
-        content = ''
-        
-        # Check for content in the entry
-        if hasattr(entry, 'content') and entry.content:
-            if isinstance(entry.content, list):
-                for content_item in entry.content:
-                    if 'value' in content_item:
-                        content += content_item['value'] + ' '
-            else:
-                content = str(entry.content)
-        elif hasattr(entry, 'summary') and entry.summary:
-            content = entry.summary
-        elif hasattr(entry, 'description') and entry.description:
-            content = entry.description
-            
-        return content
+    def prefetch_pages(self, urls):
+        """Download and extract the article pages the page cache doesn't have, concurrently"""
+        urls = [url for url in dict.fromkeys(urls) if not self.page_cache.is_fresh(url)]
+        if not urls:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix='page') as executor:
+            for url, future in [(url, executor.submit(self.fetch_page_text, url)) for url in urls]:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Error fetching page {url}: {str(e)}")
 
-    def extract_google_content(self, entry):
-        """Extract content from Google blog entries"""
-        content = ''
-        
-        if hasattr(entry, 'content') and entry.content:
-            if isinstance(entry.content, list):
-                for content_item in entry.content:
-                    if 'value' in content_item:
-                        content += content_item['value'] + ' '
-            else:
-                content = str(entry.content)
-        elif hasattr(entry, 'summary') and entry.summary:
-            content = entry.summary
-        elif hasattr(entry, 'description') and entry.description:
-            content = entry.description
-            
-        return content
+    def _pages_to_fetch(self, source, feed):
+        """Links of the new entries that carry no content of their own"""
+        last_scrape_time = self.get_last_scrape_time(source)
+        urls = []
+        for entry in feed.entries:
+            if not entry.get('link') or any(entry.get(key) for key in ('description', 'summary', 'content')):
+                continue
+            published_at = entry_datetime(entry)
+            if last_scrape_time and published_at is not None and published_at <= last_scrape_time:
+                continue
+            urls.append(entry.get('link'))
+        return urls
 
-    def extract_default_content(self, entry):
-        """Default content extraction for generic RSS feeds"""
-        content = ''
+    def mark_duplicates(self, all_articles):
+        """
+        Look up every new article in the near-duplicate index, oldest first, so
+        the earliest report of a story is the canonical one. Duplicates get a
+        'duplicate_of' id, and a canonical article from this run gets 'related'
+        links to its duplicates.
+        """
+        articles = sorted(
+            (article for articles in all_articles.values() for article in articles),
+            key=lambda x: x.published
+        )
+        by_url = {}
+        for article in articles:
+            canonical = self.duplicates.add(
+                article.url, article.title, fingerprint_text(article), article.timestamp
+            )
+            if canonical != article.url:
+                article.duplicate_of = canonical
+                self.metrics.add('duplicates', 1, article.source)
+                original = by_url.get(canonical)
+                if original is not None:
+                    if original.related is None:
+                        original.related = []
+                    original.related.append({'url': article.url, 'source': article.source})
+            by_url.setdefault(article.url, article)
         
-        # Try to get content
-        if hasattr(entry, 'content') and entry.content:
-            if isinstance(entry.content, list):
-                for content_item in entry.content:
-                    if 'value' in content_item:
-                        content += content_item['value'] + ' '
-            else:
-                content = str(entry.content)
-        # Try to get summary
-        elif hasattr(entry, 'summary') and entry.summary:
-            content = entry.summary
-        # Fall back to description
-        elif hasattr(entry, 'description') and entry.description:
-            content = entry.description
-            
-        return content
-
-    def extract_reddit_content(self, entry):
-        """Extract only the first 2-3 sentences from Reddit content"""
-        # Get full content first
-        content = self.extract_default_content(entry)
+    def fetch_feed(self, source, feed_info):
+        """
+        Download a single feed. Returns a RawFeed with the document, left for
+        process_feeds to parse, or the OpenAI feed already built.
+        """
+        logger.info(f"Fetching RSS feed: {source}")
+        
+        category = feed_info.get('category', 'default')
         
-        # Remove HTML tags if present
-        if content:
-            soup = BeautifulSoup(content, 'html.parser')
-            content = soup.get_text()
+        # Special handling for OpenAI feed
+        if source == 'OpenAI':
+            with self.metrics.span('fetch', source, category):
+                feed = self.fetch_openai_feed(feed_info['url'])
+                # Entries without content are filled in from their pages, fetched here in parallel
+                if feed is not None:
+                    self.prefetch_pages(self._pages_to_fetch(source, feed))
+            return feed
         
-        # Split into sentences (simple approach: split on ., ! or ?)
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        url = feed_info['url']
+        with self.metrics.span('fetch', source, category):
+            with self.http.stream(url, headers=self.http_cache.request_headers(url)) as response:
+                if response.status_code == 304:
+                    self.http_cache.record_not_modified(url)
+                    self.metrics.add('not_modified', 1, source, category)
+                    return NOT_MODIFIED
+                response.raise_for_status()
+                
+                # Stop downloading once the feed is past the entries scraped before
+                if any(host in url for host in RANKED_FEED_HOSTS):
+                    content, complete = b''.join(response.iter_bytes(STREAM_CHUNK_SIZE)), True
+                else:
+                    content, complete = read_new_entries(
+                        response.iter_bytes(STREAM_CHUNK_SIZE), self.get_last_scrape_time(source)
+                    )
         
-        # Take first 2-3 sentences (or fewer if there aren't that many)
-        num_sentences = min(3, len(sentences))
-        if num_sentences > 0:
-            truncated_content = ' '.join(sentences[:num_sentences])
-            return f"{truncated_content}... [See full post on Reddit]"
+        self.metrics.add('bytes', len(content), source, category)
+        if not complete:
+            self.metrics.add('partial', 1, source, category)
+        # The validators are only stored once the feed was processed (see collect),
+        # so a feed that fails to parse isn't answered with a 304 next time
+        validators = {name: response.headers.get(name) for name in ('ETag', 'Last-Modified')}
+        return RawFeed(content, dict(response.headers), validators)
+
+    def fetch_feeds(self):
+        """
+        Fetch all feeds concurrently.
+        Results are keyed by source in the same order as feed_urls, so
+        processing them afterwards is independent of download timing.
+        """
+        feeds = {}
+        if not self.feed_urls:
+            return feeds
         
-        return content
+        due = self.feed_urls
+        if self.scheduler is not None:
+            due = {source: info for source, info in self.feed_urls.items() if self.scheduler.is_due(source)}
+            logger.info(f"Polling {len(due)} of {len(self.feed_urls)} feeds that are due")
+            if not due:
+                return {source: NOT_DUE for source in self.feed_urls}
+            
+        workers = min(self.max_workers, len(due))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as executor:
+            futures = {
+                source: executor.submit(self.fetch_feed, source, feed_info)
+                if source in due else None
+                for source, feed_info in self.feed_urls.items()
+            }
+            for source, future in futures.items():
+                if future is None:
+                    feeds[source] = NOT_DUE
+                    continue
+                try:
+                    feeds[source] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {source}: {str(e)}")
+                    self.metrics.add('errors', 1, source, self.feed_urls[source].get('category', 'default'))
+                    feeds[source] = None
+                    
+        return feeds
 
     def scrape(self):
         """Scrape RSS feeds and generate feed files"""
+        all_articles = self.collect()
+        self.write_feeds(all_articles)
+        return all_articles
+
+    def process_feeds(self, feeds, current_time):
+        """
+        Parse the downloaded feeds, then extract and filter their new entries.
+
+        Feeds larger than inline_max_bytes are handed to a pool of
+        parse_workers processes, so the pure-Python parsing isn't serialized
+        by the GIL; smaller feeds (and the OpenAI feed, whose pages come
+        through the page cache) are processed here while the pool works, so
+        runs that only download a few short feeds never start the pool. Returns a
+        FeedResult, or the exception that stopped the feed, per fetched
+        source in feed_urls order.
+        """
+        fetched = {
+            source: feed for source, feed in feeds.items()
+            if feed is not None and feed is not NOT_DUE and feed is not NOT_MODIFIED
+        }
+        offloaded = []
+        if self.parse_workers > 1:
+            offloaded = [
+                source for source, feed in fetched.items()
+                if isinstance(feed, RawFeed) and len(feed) > self.inline_max_bytes
+            ]
+        
+        def process_inline(source):
+            try:
+                return self.processor.process(
+                    source, self.feed_urls[source], fetched[source], self.get_last_scrape_time(source),
+                    current_time, self.metrics, page_text=self.fetch_page_text
+                )
+            except Exception as e:
+                return e
+        
+        results = {}
+        executor = None
+        try:
+            futures = {}
+            if offloaded:
+                executor = ProcessPoolExecutor(
+                    max_workers=min(self.parse_workers, len(offloaded)),
+                    initializer=init_worker, initargs=(self.processor,)
+                )
+                futures = {
+                    source: executor.submit(
+                        process_in_worker, source, self.feed_urls[source], fetched[source],
+                        self.get_last_scrape_time(source), current_time
+                    )
+                    for source in offloaded
+                }
+            for source in fetched:
+                if source not in futures:
+                    results[source] = process_inline(source)
+            for source, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # A worker that died (or a result that couldn't be sent back) shouldn't lose the feed
+                    logger.warning(f"Processing {source} in a worker failed ({e}), retrying inline")
+                    results[source] = process_inline(source)
+                    continue
+                self.metrics.merge(result.metrics)
+                results[source] = result
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return {source: results[source] for source in fetched}
+
+    def collect(self):
+        """
+        Fetch the feeds and return their new articles grouped by category,
+        saving the scrape state (last scrape times, HTTP validators, poll
+        schedule) and marking near-duplicates along the way
+        """
         all_articles = {}
         current_time = datetime.now(self.timezone)
         
+        # Download every feed up front (I/O), then parse and filter them (CPU)
+        feeds = self.fetch_feeds()
+        results = self.process_feeds(feeds, current_time)
+        
+        # Merge the results in config order, whichever process produced them
         for source, feed_info in self.feed_urls.items():
             category = feed_info.get('category', 'default')
             if category not in all_articles:
@@ -301,176 +485,92 @@ def scrape(self):
                 
             try:
                 logger.info(f"Scraping RSS feed: {source}")
-                last_scrape_time = self.get_last_scrape_time(source)
-                
-                # Special handling for OpenAI feed
-                if source == 'OpenAI':
-                    feed = self.fetch_openai_feed(feed_info['url'])
-                    if feed is None:
-                        logger.error(f"Skipping OpenAI feed due to fetch error")
-                        continue
-                else:
-                    feed = feedparser.parse(feed_info['url'])
                 
-                latest_pub_time = None
+                feed = feeds.get(source)
+                if feed is NOT_DUE:
+                    due = self.scheduler.next_due(source)
+                    logger.info(f"{source} not due until {due:%Y-%m-%d %H:%M} UTC, skipping")
+                    self.metrics.add('not_due', 1, source, category)
+                    continue
+                if feed is None:
+                    logger.error(f"Skipping {source} feed due to fetch error")
+                    if self.scheduler is not None:
+                        self.scheduler.record_error(source)
+                    continue
+                if feed is NOT_MODIFIED:
+                    logger.info(f"{source} not modified since last fetch, skipping")
+                    if self.scheduler is not None:
+                        self.scheduler.record_not_modified(source, self._known_publication_times(source))
+                    continue
                 
-                for entry in feed.entries:
-                    try:
-                        if hasattr(entry, 'published'):
-                            published_at = parser.parse(entry.published, tzinfos=TZINFOS)
-                        elif hasattr(entry, 'updated'):
-                            published_at = parser.parse(entry.updated, tzinfos=TZINFOS)
-                        else:
-                            published_at = current_time
-                        
-                        # Keep track of latest publication time for this source
-                        if latest_pub_time is None or published_at > latest_pub_time:
-                            latest_pub_time = published_at
-                        
-                        # Skip if already processed
-                        if last_scrape_time and published_at <= last_scrape_time:
-                            continue
-
-                        title = entry.get('title', '')
-                        description = entry.get('description', '')
-                        content = ''
-
-                        # Check if it's a Reddit source
-                        if 'reddit.com' in feed_info['url']:
-                            content = self.extract_reddit_content(entry)
-                        elif 'huggingface.co' in feed_info['url']:
-                            content = self.extract_huggingface_content(entry)
-                        elif 'blog.google' in feed_info['url']:
-                            content = self.extract_google_content(entry)
-                        elif source == 'OpenAI':
-                            content = self.extract_openai_content(entry)
-                        else:
-                            content = self.extract_default_content(entry)
-
-                        # Skip if not AI-related when we have keywords set
-                        if self.ai_keywords and not self.is_ai_related(title, description, content):
-                            continue
-                            
-                        # Create article structure
-                        article = {
-                            'title': title,
-                            'content': content,
-                            'url': entry.link,
-                            'source': source,
-                            'author': entry.get('author', ''),
-                            'published_at': published_at.isoformat(),
-                            'description': description
-                        }
-                        
-                        all_articles[category].append(article)
-                    except Exception as e:
-                        logger.error(f"Error processing entry from {source}: {str(e)}")
-                        continue
+                result = results[source]
+                if isinstance(result, Exception):
+                    raise result
+                all_articles[category].extend(result.articles)
+                if isinstance(feed, RawFeed):
+                    self.http_cache.record_response(feed_info['url'], feed.validators, len(feed))
                 
                 # Update last scrape time for this source if we have new entries
-                if latest_pub_time:
-                    self.last_scrape_times[source] = latest_pub_time.isoformat()
+                if result.latest:
+                    self.last_scrape_times[source] = result.latest.isoformat()
+                
+                if self.scheduler is not None:
+                    published_times = result.published_times + self._known_publication_times(source)
+                    self.scheduler.record_fetch(source, published_times, result.new_entries)
                     
             except Exception as e:
                 logger.error(f"Error scraping {source}: {str(e)}")
+                self.metrics.add('errors', 1, source, category)
+                if self.scheduler is not None:
+                    self.scheduler.record_error(source)
                 continue
         
-        # Save last scrape times
-        self._save_last_scrape_times()
+        self.save_state()
+        
+        stats = self.http_cache.stats
+        logger.info(
+            f"HTTP cache: {stats['hits']} not modified, {stats['misses']} downloaded, "
+            f"{stats['bytes_saved']} bytes saved"
+        )
+        stats = self.page_cache.stats
+        if any(stats.values()):
+            logger.info(
+                f"Article pages: {stats['downloaded']} downloaded, {stats['revalidated']} not modified, "
+                f"{stats['hits']} read from the page cache"
+            )
+        
+        # Find stories that several sources reported
+        if self.duplicates is not None:
+            with self.metrics.span('dedup'):
+                self.mark_duplicates(all_articles)
         
+        return all_articles
+
+    def write_feeds(self, all_articles):
+        """Write the feeds of every category with articles, plus the combined 'all' feed"""
         # Generate individual feeds for each category
         for category, articles in all_articles.items():
             if not articles:
                 continue
                 
             # Sort articles by published date, most recent first
-            sorted_articles = sorted(articles, key=lambda x: parser.parse(x['published_at'], tzinfos=TZINFOS), reverse=True)
-            
-            # Generate RSS feed
-            self._generate_rss_feed(category, sorted_articles)
+            sorted_articles = sorted(articles, key=lambda x: x.published, reverse=True)
             
-            # Generate Atom feed
-            self._generate_atom_feed(category, sorted_articles)
-            
-            # Generate JSON feed
-            self._generate_json_feed(category, sorted_articles)
+            # Generate RSS, Atom and JSON feeds in one pass
+            with self.metrics.span('write', category=category):
+                self.feed_writer.write(category, sorted_articles)
         
-        # Generate a combined feed with all articles
+        # Generate a combined feed with all articles, listing each story once
         all_entries = []
         for articles in all_articles.values():
-            all_entries.extend(articles)
+            all_entries.extend(article for article in articles if article.duplicate_of is None)
             
         if all_entries:
-            self._generate_rss_feed('all', all_entries)
-            self._generate_atom_feed('all', all_entries)
-            self._generate_json_feed('all', all_entries)
-            
-        return all_articles
-            
-    def _generate_rss_feed(self, category, articles):
-        """Generate RSS feed for a category"""
-        fg = FeedGenerator()
-        fg.title(f'AI Daily Digest - {category.replace("_", " ").title()}')
-        fg.link(href=f'https://your-github-pages-url/{category}.xml', rel='self')
-        fg.description(f'Latest AI news and updates from {category.replace("_", " ")} sources')
-        fg.language('en')
-        
-        for article in sorted(articles, key=lambda x: parser.parse(x['published_at'], tzinfos=TZINFOS), reverse=True):
-            fe = fg.add_entry()
-            fe.title(article['title'])
-            fe.link(href=article['url'])
-            fe.description(article['description'] or article['content'][:150] + '...')
-            fe.content(content=article['content'], type='html')
-            if article['author']:
-                fe.author(name=article['author'])
-            fe.pubDate(parser.parse(article['published_at'], tzinfos=TZINFOS))
-            fe.source(article['source'])
-            
-        fg.rss_file(os.path.join(self.output_dir, f'{category}.xml'))
-        
-    def _generate_atom_feed(self, category, articles):
-        """Generate Atom feed for a category"""
-        fg = FeedGenerator()
-        fg.title(f'AI Daily Digest - {category.replace("_", " ").title()}')
-        fg.link(href=f'https://your-github-pages-url/{category}.atom', rel='self')
-        fg.subtitle(f'Latest AI news and updates from {category.replace("_", " ")} sources')
-        fg.language('en')
-        fg.id(f'https://your-github-pages-url/{category}')
+            all_entries.sort(key=lambda x: x.published, reverse=True)
+            with self.metrics.span('write', category='all'):
+                self.feed_writer.write('all', all_entries)
         
-        for article in sorted(articles, key=lambda x: parser.parse(x['published_at'], tzinfos=TZINFOS), reverse=True):
-            fe = fg.add_entry()
-            fe.title(article['title'])
-            fe.link(href=article['url'])
-            fe.summary(article['description'] or article['content'][:150] + '...')
-            fe.content(content=article['content'], type='html')
-            if article['author']:
-                fe.author(name=article['author'])
-            fe.published(parser.parse(article['published_at'], tzinfos=TZINFOS))
-            fe.id(article['url'])
-            
-        fg.atom_file(os.path.join(self.output_dir, f'{category}.atom'))
-        
-    def _generate_json_feed(self, category, articles):
-        """Generate JSON feed for a category"""
-        json_feed = {
-            "version": "https://jsonfeed.org/version/1.1",
-            "title": f"AI Daily Digest - {category.replace('_', ' ').title()}",
-            "home_page_url": "https://your-github-pages-url/",
-            "feed_url": f"https://your-github-pages-url/{category}.json",
-            "description": f"Latest AI news and updates from {category.replace('_', ' ')} sources",
-            "items": []
-        }
-        
-        for article in sorted(articles, key=lambda x: parser.parse(x['published_at'], tzinfos=TZINFOS), reverse=True):
-            json_feed["items"].append({
-                "id": article['url'],
-                "url": article['url'],
-                "title": article['title'],
-                "content_html": article['content'],
-                "summary": article['description'] or article['content'][:150] + '...',
-                "date_published": parser.parse(article['published_at'], tzinfos=TZINFOS).isoformat(),
-                "author": {"name": article['author']} if article['author'] else None
-            })
-            
-        with open(os.path.join(self.output_dir, f'{category}.json'), 'w', encoding='utf-8') as f:
-            json.dump(json_feed, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+        self.feed_writer.save()
+        self.output.save_manifest()
+        stats = self.feed_writer.stats
+        logger.info(f"Feed fragments: {stats['serialized']} serialized, {stats['cached']} reused from cache")
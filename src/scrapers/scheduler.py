@@ -0,0 +1,157 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+import pytz
+from .dates import parse_datetime
+from ..output import OutputWriter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Decides which feeds are worth fetching on a run.
+
+    Each feed's publication rate is learned from the dates of the entries it
+    served (and the latest article time kept in last_scrape_times.json, so
+    even a feed answering 304 has a rough rate), and the feed is polled again
+    after `interval_factor` times its average gap between posts, within
+    [min_interval, max_interval]. Polls that find nothing new (304 or no new
+    entries) stretch the interval by `backoff`; failed polls back off
+    exponentially without forgetting the learned rate. Feeds that were never
+    polled are always due.
+    """
+    FILENAME = 'poll_schedule.json'
+
+    def __init__(self, output_dir, output=None, min_interval=3600, max_interval=7 * 86400,
+                 interval_factor=0.5, backoff=1.5, error_backoff_max=86400, history_size=20, slack=0.1):
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.output = output or OutputWriter(output_dir)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval_factor = interval_factor
+        self.backoff = backoff
+        self.error_backoff_max = error_backoff_max
+        self.history_size = history_size
+        # Runs happen on a timer, so a feed that falls due a little after this
+        # run is polled now rather than a whole run period late
+        self.slack = slack
+        self.entries = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the stored schedule from a JSON file"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading poll schedule: {str(e)}")
+        return {}
+
+    def save(self):
+        """Save the schedule to a JSON file"""
+        try:
+            self.output.write_json(self.FILENAME, self.entries, publish=False, indent=2, sort_keys=True)
+        except Exception as e:
+            logger.error(f"Error saving poll schedule: {str(e)}")
+
+    def reset_due(self):
+        """Make every feed due on this run, keeping what was learned about them"""
+        with self._lock:
+            for entry in self.entries.values():
+                entry.pop('next_due', None)
+
+    def next_due(self, source):
+        """When a feed should be polled next, or None if it is due now"""
+        entry = self.entries.get(source) or {}
+        if not entry.get('next_due'):
+            return None
+        try:
+            return parse_datetime(entry['next_due'])
+        except Exception:
+            return None
+
+    def latest_published(self, source):
+        """The newest publication time recorded for a feed, or None"""
+        entry = self.entries.get(source) or {}
+        try:
+            return max((parse_datetime(value) for value in entry.get('published', [])), default=None)
+        except Exception:
+            return None
+
+    def seconds_until_due(self, source, now=None):
+        """Seconds until a feed becomes due (zero or less if it is due now)"""
+        now = now or datetime.now(pytz.UTC)
+        due = self.next_due(source)
+        if due is None:
+            return 0
+        interval = self.entries[source].get('interval', self.min_interval)
+        return (due - timedelta(seconds=interval * self.slack) - now).total_seconds()
+
+    def is_due(self, source, now=None):
+        return self.seconds_until_due(source, now) <= 0
+
+    def _estimate_interval(self, published, now):
+        """Poll interval for a feed that published at the given times"""
+        if not published:
+            return self.min_interval
+        # The window runs up to now, so a feed that went quiet slows down too
+        span = (now - min(published)).total_seconds()
+        return span / len(published) * self.interval_factor
+
+    def _merge_history(self, entry, published, now):
+        """Add publication times to a feed's history, keeping the newest history_size"""
+        history = {parse_datetime(value) for value in entry.get('published', [])}
+        history.update(time for time in published if time <= now)
+        history = sorted(history, reverse=True)[:self.history_size]
+        entry['published'] = [time.isoformat() for time in history]
+        return history
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def record_fetch(self, source, published, new_entries, now=None):
+        """
+        Record a successful poll: `published` are the publication times seen
+        in the feed and `new_entries` how many of them hadn't been seen before
+        """
+        now = now or datetime.now(pytz.UTC)
+        with self._lock:
+            entry = self.entries.setdefault(source, {})
+            history = self._merge_history(entry, published, now)
+            interval = self._estimate_interval(history, now)
+            if not new_entries:
+                interval = max(interval, entry.get('interval', self.min_interval) * self.backoff)
+            self._schedule(entry, self._clamp(interval), now)
+            entry['failures'] = 0
+            entry['unchanged'] = 0 if new_entries else entry.get('unchanged', 0) + 1
+
+    def record_not_modified(self, source, published=(), now=None):
+        """Record a poll the server answered with 304 Not Modified"""
+        now = now or datetime.now(pytz.UTC)
+        with self._lock:
+            entry = self.entries.setdefault(source, {})
+            history = self._merge_history(entry, published, now)
+            interval = max(self._estimate_interval(history, now), entry.get('interval', self.min_interval) * self.backoff)
+            self._schedule(entry, self._clamp(interval), now)
+            entry['failures'] = 0
+            entry['unchanged'] = entry.get('unchanged', 0) + 1
+
+    def record_error(self, source, now=None):
+        """Record a failed poll; retries back off exponentially"""
+        now = now or datetime.now(pytz.UTC)
+        with self._lock:
+            entry = self.entries.setdefault(source, {})
+            entry['failures'] = entry.get('failures', 0) + 1
+            delay = min(self.min_interval * 2 ** (entry['failures'] - 1), self.error_backoff_max)
+            entry['last_poll'] = now.isoformat()
+            entry['next_due'] = (now + timedelta(seconds=delay)).isoformat()
+
+    def _schedule(self, entry, interval, now):
+        entry['interval'] = round(interval)
+        entry['last_poll'] = now.isoformat()
+        entry['next_due'] = (now + timedelta(seconds=interval)).isoformat()
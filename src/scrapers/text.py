@@ -0,0 +1,117 @@
+import re
+import importlib.util
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+# Sentence boundaries: whitespace after a full stop, exclamation or question mark
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+# Elements whose content is never text
+SKIPPED_TAGS = frozenset(('script', 'style', 'template'))
+# Characters fed to the parser at a time when stopping early is possible
+CHUNK_SIZE = 2048
+# BeautifulSoup tree builder for whole pages: lxml's C parser when it is
+# installed, otherwise the standard library's
+PAGE_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+
+class _TextParser(HTMLParser):
+    """Collects the text nodes of an HTML fragment as it is fed"""
+    def __init__(self, separator=''):
+        super().__init__(convert_charrefs=True)
+        self.separator = separator
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skipping += 1
+        elif self.separator:
+            self.parts.append(self.separator)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.separator:
+            self.parts.append(self.separator)
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif self.separator:
+            self.parts.append(self.separator)
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> sections are text
+        if data.startswith('CDATA['):
+            self.handle_data(data[6:])
+
+    def text(self):
+        return ''.join(self.parts)
+
+
+def html_to_text(content, max_sentences=None, separator=''):
+    """
+    Text of an HTML fragment, with entities decoded and script / style
+    contents, comments and markup dropped; like BeautifulSoup's get_text(),
+    without building a tree.
+
+    The fragment is parsed in chunks; with max_sentences set, parsing stops
+    as soon as that many sentences are complete, so the returned text may
+    be cut short after them. separator is inserted at every tag (e.g. ' ' to
+    keep words in adjacent elements apart).
+    """
+    if not content:
+        return ''
+    if '<' not in content and '&' not in content:
+        return content
+
+    parser = _TextParser(separator)
+    if max_sentences is None:
+        parser.feed(content)
+    else:
+        for start in range(0, len(content), CHUNK_SIZE):
+            parser.feed(content[start:start + CHUNK_SIZE])
+            if _has_sentences(parser.text(), max_sentences):
+                return parser.text()
+    parser.close()
+    return parser.text()
+
+
+def _has_sentences(text, count):
+    """Whether the first `count` sentences of the text are complete"""
+    for found, _ in enumerate(SENTENCE_BREAK.finditer(text), 1):
+        if found >= count:
+            return True
+    return False
+
+
+def split_sentences(text, limit=None):
+    """
+    Split text into sentences, like re.split(SENTENCE_BREAK, text)[:limit]
+    but without scanning past the last sentence needed
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_BREAK.finditer(text):
+        if limit is not None and len(sentences) >= limit:
+            return sentences
+        sentences.append(text[start:match.start()])
+        start = match.end()
+    if limit is None or len(sentences) < limit:
+        sentences.append(text[start:])
+    return sentences
+
+
+def extract_page_text(page):
+    """
+    Main text of an article page: its <article>, <main> or div.content
+    element, or else its first five paragraphs
+    """
+    soup = BeautifulSoup(page, PAGE_PARSER)
+    article = soup.find('article') or soup.find('main') or soup.find('div', class_='content')
+    if article:
+        return article.get_text(strip=True)
+    paragraphs = soup.find_all('p', limit=5)
+    return ' '.join(p.get_text(strip=True) for p in paragraphs)
@@ -0,0 +1,154 @@
+import re
+import html
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_postings (
+    term TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (term, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS search_dirty (
+    name TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS search_files (
+    name TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Words that match nearly every article; they are neither indexed nor searched.
+# The list is published in the search manifest so the archive page tokenizes
+# queries exactly like this module does.
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were will with'.split()
+)
+TAGS = re.compile(r'<[^>]+>')
+WORDS = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)*')
+# Number of article rows per published document chunk
+DOC_CHUNK_SIZE = 1000
+# Postings are published in shards keyed by the first characters of each term,
+# so all completions of a query prefix at least this long live in one shard
+SHARD_PREFIX = 2
+
+
+def _normalize_word(word):
+    # Fold simple plurals so "model" finds "models" and the other way round
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lowercased, plural-folded search terms of a text (HTML tags and stopwords removed)"""
+    text = html.unescape(TAGS.sub(' ', text or '')).lower()
+    return [
+        _normalize_word(word) for word in WORDS.findall(text)
+        if word not in STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def shard_name(term):
+    """Published file holding a term's postings, e.g. terms/ai"""
+    return 'terms/' + term[:SHARD_PREFIX].replace('.', '_')
+
+
+def doc_chunk_name(seq):
+    """Published file holding an article's display row, e.g. docs/3"""
+    return f'docs/{seq // DOC_CHUNK_SIZE}'
+
+
+class SearchIndex:
+    """
+    Inverted index over the archive's titles, summaries and sources.
+
+    Postings (term -> archive seq) live in the archive database and are
+    added as articles are archived, so updating the index costs O(new
+    articles). Every posting shard and document chunk an update touches is
+    marked dirty until it has been republished as static JSON, which lets
+    the archive page search without a server and without downloading
+    files that didn't change.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.executescript(SCHEMA)
+
+    def empty(self):
+        return self.conn.execute("SELECT 1 FROM search_postings LIMIT 1").fetchone() is None
+
+    def add(self, seq, article):
+        """Index an archived article under its archive sequence number"""
+        terms = set(tokenize(article.get('title', '')))
+        terms.update(tokenize(article.get('summary', '')))
+        terms.update(tokenize(article.get('source', '')))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO search_postings (term, seq) VALUES (?, ?)",
+            [(term, seq) for term in terms]
+        )
+        dirty = {shard_name(term) for term in terms}
+        dirty.add(doc_chunk_name(seq))
+        self.conn.executemany("INSERT OR IGNORE INTO search_dirty (name) VALUES (?)", [(name,) for name in dirty])
+
+    def match(self, query):
+        """
+        Archive seqs of the articles containing every term of the query.
+        The last term also matches as a prefix, so results show up while
+        the reader is still typing.
+        """
+        terms = tokenize(query)
+        result = None
+        for index, term in enumerate(terms):
+            if index == len(terms) - 1 and len(term) >= SHARD_PREFIX:
+                rows = self.conn.execute(
+                    "SELECT seq FROM search_postings WHERE term >= ? AND term < ?", (term, term + '\uffff')
+                )
+            else:
+                rows = self.conn.execute("SELECT seq FROM search_postings WHERE term = ?", (term,))
+            seqs = {seq for (seq,) in rows}
+            result = seqs if result is None else result & seqs
+            if not result:
+                break
+        return result or set()
+
+    def postings(self, shard):
+        """{term: [seq, ...]} for every term published in a shard ("terms/xx")"""
+        prefix = shard.split('/', 1)[1].replace('_', '.')
+        result = {}
+        rows = self.conn.execute(
+            "SELECT term, seq FROM search_postings WHERE term >= ? AND term < ? ORDER BY term, seq",
+            (prefix, prefix + '\uffff')
+        )
+        for term, seq in rows:
+            if len(term) == len(prefix) or len(prefix) == SHARD_PREFIX:
+                result.setdefault(term, []).append(seq)
+        return result
+
+    def dirty(self):
+        """Names of the shards and chunks that changed since they were last published"""
+        return [name for (name,) in self.conn.execute("SELECT name FROM search_dirty ORDER BY name")]
+
+    def mark_all_dirty(self):
+        """Flag every shard and chunk for republishing (e.g. when the published files are missing)"""
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO search_dirty (name) VALUES (?)",
+            [(shard_name(term),) for (term,) in self.conn.execute("SELECT DISTINCT term FROM search_postings")]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO search_dirty (name) VALUES (?)",
+            [(doc_chunk_name(seq),) for (seq,) in self.conn.execute("SELECT DISTINCT seq FROM search_postings")]
+        )
+
+    def published(self, name, content_hash):
+        """Record that a shard or chunk was written with the given content hash"""
+        self.conn.execute("INSERT OR REPLACE INTO search_files (name, hash) VALUES (?, ?)", (name, content_hash))
+        self.conn.execute("DELETE FROM search_dirty WHERE name = ?", (name,))
+
+    def files(self):
+        """{name: content hash} of every published shard and chunk"""
+        return dict(self.conn.execute("SELECT name, hash FROM search_files ORDER BY name"))
+
+    def commit(self):
+        self.conn.commit()
@@ -0,0 +1,198 @@
+import os
+import json
+import shutil
+import logging
+import argparse
+import hashlib
+from src.models import Article
+from src.metrics import Metrics
+from src.scrapers.http_cache import ConditionalGetCache
+from src.scrapers.page_cache import PageCache
+from src.scrapers.scheduler import PollScheduler
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Each shard scrapes into feeds/shards/I-of-N, next to the published outputs
+SHARDS_DIR = 'shards'
+# The articles a shard found, with the feeds it owned and its run metrics
+BATCH_FILENAME = 'shard.json'
+LAST_SCRAPE_TIMES_FILENAME = 'last_scrape_times.json'
+# Scrape state a shard starts from (a copy of the main output directory's)
+STATE_FILENAMES = (
+    LAST_SCRAPE_TIMES_FILENAME,
+    ConditionalGetCache.FILENAME,
+    PageCache.FILENAME,
+    PollScheduler.FILENAME,
+)
+
+
+def parse_shard(value):
+    """argparse type for --shard: 'I/N' with 0 <= I < N, as (I, N)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N (e.g. 0/4), got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 0 and N-1, got {value!r}")
+    return index, count
+
+
+def shard_of(source, count):
+    """
+    The shard that scrapes a source. The hash of its name doesn't depend on
+    the Python process (unlike hash()), so every node agrees, and adding a
+    feed moves no other feed to another shard.
+    """
+    digest = hashlib.sha1(source.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+def shard_feeds(feeds, index, count):
+    """The feeds (in config order) that shard index of count scrapes"""
+    return {source: info for source, info in feeds.items() if shard_of(source, count) == index}
+
+
+def shard_dir(output_dir, index, count):
+    return os.path.join(output_dir, SHARDS_DIR, f'{index}-of-{count}')
+
+
+def seed_state(output_dir, directory):
+    """Start a shard from the main output directory's scrape state"""
+    os.makedirs(directory, exist_ok=True)
+    for filename in STATE_FILENAMES:
+        source = os.path.join(output_dir, filename)
+        target = os.path.join(directory, filename)
+        if os.path.exists(source):
+            shutil.copyfile(source, target)
+        elif os.path.exists(target):
+            os.remove(target)
+
+
+def write_batch(output, index, count, feeds, all_articles, metrics):
+    """Write a shard's articles (every field, grouped by category) for the merge"""
+    batch = {
+        'shard': [index, count],
+        'feeds': {source: info['url'] for source, info in feeds.items()},
+        'articles': {
+            category: [article.to_record() for article in articles]
+            for category, articles in all_articles.items()
+        },
+        'metrics': metrics.export(),
+    }
+    output.write_json(BATCH_FILENAME, batch, publish=False)
+
+
+def _read_json(directory, filename, default=None):
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ShardBatch:
+    """A shard's output as read back by the merge: its batch file and the scrape state it saved"""
+    def __init__(self, directory):
+        self.directory = directory
+        data = _read_json(directory, BATCH_FILENAME)
+        self.index, self.count = data['shard']
+        self.feeds = data['feeds']
+        self.articles = {
+            category: [Article.from_record(record) for record in records]
+            for category, records in data['articles'].items()
+        }
+        self.metrics = Metrics.load(data.get('metrics', {}))
+        self._state = {}
+
+    def state(self, filename):
+        if filename not in self._state:
+            self._state[filename] = _read_json(self.directory, filename, default={})
+        return self._state[filename]
+
+
+def load_batches(output_dir):
+    """
+    The batches of every shard that finished, ordered by shard index.
+    Batches from different shard counts can't be merged (they split the
+    feeds differently), so that raises ValueError; missing shards are
+    logged, and their feeds keep the state they had.
+    """
+    root = os.path.join(output_dir, SHARDS_DIR)
+    if not os.path.isdir(root):
+        return []
+    batches = [
+        ShardBatch(os.path.join(root, name))
+        for name in sorted(os.listdir(root))
+        if os.path.exists(os.path.join(root, name, BATCH_FILENAME))
+    ]
+    counts = {batch.count for batch in batches}
+    if len(counts) > 1:
+        raise ValueError(f"Shard batches from different shard counts: {sorted(counts)}")
+    batches.sort(key=lambda batch: batch.index)
+    if batches:
+        found = {batch.index for batch in batches}
+        missing = [index for index in range(batches[0].count) if index not in found]
+        if missing:
+            logger.warning(f"No batch from shard(s) {missing} of {batches[0].count}; their feeds are left as they were")
+    return batches
+
+
+def merge_articles(batches, feeds):
+    """
+    Every shard's articles grouped by category, in config order of their
+    sources (the order an unsharded run collects them in), so the merge
+    gives the same result whichever shard finished first
+    """
+    by_source = {}
+    for batch in batches:
+        for articles in batch.articles.values():
+            for article in articles:
+                by_source.setdefault(article.source, []).append(article)
+
+    all_articles = {}
+    sources = list(feeds) + sorted(source for source in by_source if source not in feeds)
+    for source in sources:
+        for article in by_source.get(source, []):
+            all_articles.setdefault(article.category or 'default', []).append(article)
+    return all_articles
+
+
+def merge_state(scraper, batches):
+    """
+    Fold the scrape state the shards saved into the scraper's: each shard
+    owns the per-source state (last scrape time, poll schedule) and HTTP
+    validators of its feeds, and cached article pages are combined,
+    keeping the most recently checked copy of a page
+    """
+    owners = {source: batch for batch in batches for source in batch.feeds}
+    # Sources new to the state are added in config order, as an unsharded run adds them
+    sources = [source for source in scraper.feed_urls if source in owners]
+    sources += sorted(source for source in owners if source not in scraper.feed_urls)
+    for source in sources:
+        batch = owners[source]
+        _take(scraper.last_scrape_times, batch.state(LAST_SCRAPE_TIMES_FILENAME), source)
+        _take(scraper.http_cache.entries, batch.state(ConditionalGetCache.FILENAME), batch.feeds[source])
+        if scraper.scheduler is not None:
+            _take(scraper.scheduler.entries, batch.state(PollScheduler.FILENAME), source)
+
+    for batch in batches:
+        pages = scraper.page_cache.entries
+        for url, entry in batch.state(PageCache.FILENAME).items():
+            if url not in pages or entry.get('checked', '') > pages[url].get('checked', ''):
+                pages[url] = entry
+
+    scraper.save_state()
+
+
+def _take(entries, shard_entries, key):
+    """Use the shard's entry for key, or drop it if the shard has none"""
+    if key in shard_entries:
+        entries[key] = shard_entries[key]
+    else:
+        entries.pop(key, None)
+
+
+def remove_batches(output_dir):
+    """Delete the shard directories once their batches are merged"""
+    shutil.rmtree(os.path.join(output_dir, SHARDS_DIR), ignore_errors=True)
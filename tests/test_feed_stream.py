@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import feedparser
+import pytz
+from src.scrapers.feed_stream import read_new_entries
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=pytz.UTC)
+WATERMARK = NOW - timedelta(days=1)
+
+
+def atom(entries):
+    body = ''.join(
+        f'<entry><id>{entry_id}</id><title>{entry_id}</title>'
+        f'<updated>{published.isoformat()}</updated></entry>'
+        for entry_id, published in entries
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>{body}</feed>'.encode()
+
+
+def rss(entries):
+    items = ''.join(
+        f'<item><guid>{entry_id}</guid><title>{entry_id}</title>'
+        f'<pubDate>{published.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate></item>'
+        for entry_id, published in entries
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+def chunks(data, size=64):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def titles(data):
+    return [entry.title for entry in feedparser.parse(data).entries]
+
+
+def test_newest_first_feed_stops_after_old_entries():
+    entries = [(f'new{i}', NOW - timedelta(hours=i)) for i in range(3)]
+    entries += [(f'old{i}', NOW - timedelta(days=5 + i)) for i in range(20)]
+    data, complete = read_new_entries(chunks(rss(entries)), WATERMARK)
+    assert not complete
+    assert titles(data) == ['new0', 'new1', 'new2', 'old0', 'old1']
+
+
+def test_pinned_posts_before_new_entries_read_whole_feed():
+    entries = [('sticky1', NOW - timedelta(days=20)), ('sticky2', NOW - timedelta(days=12))]
+    entries += [(f'new{i}', NOW - timedelta(hours=i + 1)) for i in range(5)]
+    data, complete = read_new_entries(chunks(atom(entries)), WATERMARK)
+    assert complete
+    assert titles(data) == ['sticky1', 'sticky2', 'new0', 'new1', 'new2', 'new3', 'new4']
+
+
+def test_unordered_feed_reads_whole_feed():
+    entries = [
+        ('new0', NOW - timedelta(hours=2)),
+        ('old0', NOW - timedelta(days=9)),
+        ('old1', NOW - timedelta(days=8)),
+        ('new1', NOW - timedelta(hours=1)),
+    ]
+    entries += [(f'old{i}', NOW - timedelta(days=30 + i)) for i in range(2, 10)]
+    data, complete = read_new_entries(chunks(rss(entries)), WATERMARK)
+    assert complete
+    assert titles(data) == [title for title, _ in entries]
+
+
+def test_newest_first_feed_without_new_entries_is_cut_early():
+    entries = [(f'old{i}', NOW - timedelta(days=5 + i)) for i in range(10)]
+    data, complete = read_new_entries(chunks(rss(entries)), WATERMARK)
+    assert not complete
+    assert titles(data) == ['old0', 'old1']
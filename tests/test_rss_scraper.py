@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+import pytz
+from src.scrapers.feed_processor import RawFeed
+from src.scrapers.rss_scraper import RSSFeedScraper
+from src.scrapers.scheduler import PollScheduler
+
+NOW = datetime.now(pytz.UTC)
+FEEDS = {'Blog': {'url': 'http://example.com/feed.xml', 'category': 'news'}}
+
+
+def rss(entries):
+    items = ''.join(
+        f'<item><guid>{title}</guid><link>http://example.com/{title}</link><title>{title}</title>'
+        f'<description>{title}</description>'
+        f'<pubDate>{published.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate></item>'
+        for title, published in entries
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+def scraped_titles(output_dir, force_refresh):
+    scheduler = PollScheduler(output_dir)
+    # The newest entry seen on the last poll, an hour ago
+    scheduler.record_fetch('Blog', [NOW - timedelta(hours=1)], 1)
+    scraper = RSSFeedScraper(feed_urls=FEEDS, output_dir=output_dir, scheduler=scheduler, force_refresh=force_refresh)
+    try:
+        feed = RawFeed(rss([('recent', NOW - timedelta(minutes=30)), ('older', NOW - timedelta(hours=3))]), {})
+        result = scraper.process_feeds({'Blog': feed}, NOW)['Blog']
+    finally:
+        scraper.close()
+    return [article.title for article in result.articles]
+
+
+def test_scheduler_history_is_the_fallback_watermark(tmp_path):
+    assert scraped_titles(str(tmp_path), force_refresh=False) == ['recent']
+
+
+def test_force_refresh_ignores_scheduler_history(tmp_path):
+    assert scraped_titles(str(tmp_path), force_refresh=True) == ['recent', 'older']